@@ -102,6 +102,62 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# LocMemCache is local to each process. The cached offer responses and order analytics are invalidated by bumping a version
+# stored in this cache, so with several worker processes a bump only reaches the worker that made the change.
+# Deployments with more than one worker should configure a shared backend here (e.g. RedisCache or PyMemcacheCache)
+# to invalidate across all workers; otherwise the cache timeouts below bound how long the other workers serve stale data.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'coderr-default',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+        },
+    }
+}
+
+# Seconds a cached offer list/retrieve response is kept. Changes to offers, offer details and creator names invalidate it
+# right away in the process that made them (in every process with a shared cache backend, see CACHES); with the
+# process-local default cache the timeout bounds how long other workers can serve the old response.
+OFFER_RESPONSE_CACHE_TIMEOUT = 60
+
+# Size and lifetime (seconds) of the process-local token -> user/profile cache of CachedTokenAuthentication.
+# Deleting a token or saving a user/profile bumps the user's token revocation version in the default cache, which is checked
+# on every cache hit, so with a shared cache backend (see CACHES) a revoked token is rejected by every worker right away.
+# With the process-local default cache other workers do not see the bump: they can accept a revoked token, or serve an
+# outdated user/profile, for up to TOKEN_CACHE_TTL seconds.
+TOKEN_CACHE_MAX_SIZE = 1024
+TOKEN_CACHE_TTL = 30
+
+# Seconds the response of an order created with an Idempotency-Key header is replayed for retries of the same key.
+# The keys are stored in the database (OrderIdempotencyKey) with a unique (user, key) constraint, so retries are
+# deduplicated across all worker processes whatever the cache backend.
+ORDER_IDEMPOTENCY_TIMEOUT = 60 * 60
+
+# Days after their last update that completed and cancelled orders are moved into the archive table by `manage.py archive_orders`,
+# and number of orders moved per transaction.
+ORDER_ARCHIVE_AFTER_DAYS = 180
+ORDER_ARCHIVE_BATCH_SIZE = 500
+
+# Seconds the order analytics of a business user are cached. Order changes invalidate them right away in the process
+# that made them (in every process with a shared cache backend, see CACHES); the timeout bounds how long other workers
+# and changes that bypass the order signals can lag behind.
+ORDER_ANALYTICS_CACHE_TIMEOUT = 60 * 15
+
+# Seconds the public platform statistics (base-info) are served from the cache before one request reloads them.
+PLATFORM_STATISTICS_CACHE_TIMEOUT = 30
+
+# Business leaderboard score: Bayesian average rating with a fixed prior rating and weight (number of virtual reviews),
+# plus the weight times the natural logarithm of one plus the completed orders.
+BUSINESS_RANKING_PRIOR_RATING = 3.0
+BUSINESS_RANKING_PRIOR_WEIGHT = 5
+BUSINESS_RANKING_ORDER_WEIGHT = 0.5
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -147,7 +203,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': None,   
      
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'CoderrBackend_app.api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',             
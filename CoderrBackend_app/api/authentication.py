@@ -0,0 +1,106 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from ..cache import get_token_revocation_version
+
+
+class TokenCache:
+    """Process-local, bounded LRU cache of token key -> (user, token) with a time to live.
+    The least recently used entry is evicted once `TOKEN_CACHE_MAX_SIZE` entries are stored, and an entry older than `TOKEN_CACHE_TTL` seconds is treated as missing.
+    A second index user ID -> token keys allows dropping all entries of a user when the user or the profile changes.
+    Every entry also keeps the token revocation version of its user and is treated as missing once that version has changed,
+    so tokens revoked by another process sharing the cache (see `revoke_user_tokens`) are not accepted any longer."""
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.user_keys = {}
+        self.lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return settings.TOKEN_CACHE_MAX_SIZE
+
+    @property
+    def ttl(self):
+        return settings.TOKEN_CACHE_TTL
+
+    def get(self, key):
+        """Returns the cached (user, token) of the key or None. Entries are handed out as copies, so changes made while handling one request never leak into the next one."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, version, user, token = entry
+            if expires_at <= time.monotonic():
+                self.remove(key)
+                return None
+            self.entries.move_to_end(key)
+        if version != get_token_revocation_version(user.pk):
+            self.invalidate_key(key)
+            return None
+        return copy.deepcopy((user, token))
+
+    def set(self, key, user, token):
+        version = get_token_revocation_version(user.pk)
+        with self.lock:
+            self.remove(key)
+            user, token = copy.deepcopy((user, token))
+            self.entries[key] = (time.monotonic() + self.ttl, version, user, token)
+            self.user_keys.setdefault(user.pk, set()).add(key)
+            while len(self.entries) > self.max_size:
+                self.remove(next(iter(self.entries)))
+
+    def remove(self, key):
+        """Drops one entry. Has to be called with the lock held."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            keys = self.user_keys.get(entry[2].pk)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.user_keys[entry[2].pk]
+
+    def invalidate_key(self, key):
+        with self.lock:
+            self.remove(key)
+
+    def invalidate_user(self, user_id):
+        with self.lock:
+            for key in list(self.user_keys.get(user_id, ())):
+                self.remove(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.user_keys.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Drop-in replacement for DRF's `TokenAuthentication` that keeps the token -> (user, profile) mapping in `token_cache`.
+    A token is loaded with `select_related('user__profile')`, so neither the authentication nor a later `request.user.profile` needs a query once the token is cached.
+    The entries are invalidated by the signals in `CoderrBackend_app/signals.py`."""
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user__profile').get(key=key)
+        except model.DoesNotExist:
+            raise AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise AuthenticationFailed(_('User inactive or deleted.'))
+        token_cache.set(key, token.user, token)
+        return (token.user, token)
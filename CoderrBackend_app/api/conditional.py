@@ -0,0 +1,30 @@
+import hashlib
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    """Builds a strong ETag from the given validator parts (timestamps, counts). Equal parts always give the same ETag."""
+    return hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def last_modified_timestamp(*datetimes):
+    """Returns the latest of the given datetimes as a Unix timestamp in seconds, or None if all of them are None."""
+    datetimes = [value for value in datetimes if value is not None]
+    return int(max(datetimes).timestamp()) if datetimes else None
+
+
+def set_validator_headers(response, etag, last_modified):
+    response['ETag'] = quote_etag(etag)
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def not_modified_response(request, etag, last_modified):
+    """Evaluates `If-None-Match` and `If-Modified-Since` of a GET request against the given validators.
+    Returns a 304 NOT MODIFIED response carrying the validators if the client copy is still current, otherwise None."""
+    response = get_conditional_response(getattr(request, '_request', request), etag=quote_etag(etag), last_modified=last_modified)
+    if response is None:
+        return None
+    return set_validator_headers(response, etag, last_modified)
@@ -0,0 +1,170 @@
+import base64
+import binascii
+import datetime
+import json
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator as DjangoPaginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class OfferPagination(PageNumberPagination):
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 10
+    known_count = None
+
+    def django_paginator_class(self, object_list, per_page, *args, **kwargs):
+        """Creates the Django paginator. If the view already knows the number of rows (`known_count`), it is handed to the paginator, so no extra `COUNT(*)` query is run."""
+        paginator = DjangoPaginator(object_list, per_page, *args, **kwargs)
+        if self.known_count is not None:
+            paginator.count = self.known_count
+        return paginator
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (cursor) pagination over one of the allowed `ordering_fields` with an `id` tie-break.
+    Each page is fetched with a single `WHERE (field, id) > (value, pk) ... LIMIT page_size + 1` query, so deep pages cost the same as the first one and no `COUNT(*)` is run.
+    NULL values are always sorted last, in both directions, so the cursor comparison is the same on every database."""
+    page_size = 6
+    page_size_query_param = 'page_size'
+    max_page_size = 10
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    ordering_fields = ()
+    default_ordering = None
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Returns the rows of the page addressed by the `cursor` query parameter, or the first page if no cursor is given.
+        **Raises**:  - NotFound: If the cursor cannot be decoded or was issued for another ordering."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+        self.ordering_model_field = queryset.model._meta.get_field(self.ordering_field)
+        self.ordering_nullable = self.ordering_model_field.null
+        queryset = queryset.order_by(*self.get_order_by())
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(*position))
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_position = self.get_position(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request):
+        """Returns the requested ordering if it is one of the allowed fields, otherwise the default ordering."""
+        ordering = request.query_params.get(self.ordering_query_param, '')
+        if ordering.lstrip('-') in self.ordering_fields:
+            return ordering
+        return self.default_ordering
+
+    @property
+    def ordering_field(self):
+        return self.ordering.lstrip('-')
+
+    @property
+    def descending(self):
+        return self.ordering.startswith('-')
+
+    def get_order_by(self):
+        if self.descending:
+            return F(self.ordering_field).desc(nulls_last=True), '-id'
+        return F(self.ordering_field).asc(nulls_last=True), 'id'
+
+    def get_position_filter(self, value, pk):
+        """Builds the condition selecting every row that sorts after the position `(value, pk)`.
+        For a field that cannot be NULL the redundant bound `field <= value` (or `>=`) is added on top, so the database can read the rows after the cursor as an index range."""
+        direction = 'lt' if self.descending else 'gt'
+        after_pk = Q(**{f'id__{direction}': pk})
+        if value is None:
+            return Q(**{f'{self.ordering_field}__isnull': True}) & after_pk
+        after = Q(**{f'{self.ordering_field}__{direction}': value}) | (Q(**{self.ordering_field: value}) & after_pk)
+        if not self.ordering_nullable:
+            return Q(**{f'{self.ordering_field}__{direction}e': value}) & after
+        return after | Q(**{f'{self.ordering_field}__isnull': True})
+
+    def get_position(self, row):
+        if isinstance(row, dict):
+            return row[self.ordering_field], row['id']
+        return getattr(row, self.ordering_field), row.id
+
+    def encode_cursor(self, position):
+        """Encodes the position as URL-safe base64 JSON. Datetimes keep their full microsecond precision, which `DjangoJSONEncoder` would truncate."""
+        value, pk = position
+        if isinstance(value, datetime.datetime):
+            value = value.isoformat()
+        payload = json.dumps({'o': self.ordering, 'v': value, 'id': pk}, cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, request):
+        """Decodes the cursor into the position `(value, pk)`. The value is converted with `to_python()` of the ordering field, so a tampered value
+        (e.g. text for a datetime or an object) is rejected here instead of failing in the query.
+        **Raises**:  - NotFound: If the cursor cannot be decoded, was issued for another ordering or holds a value of the wrong type."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if payload['o'] != self.ordering:
+                raise NotFound(self.invalid_cursor_message)
+            value = payload['v']
+            if isinstance(value, (dict, list)):
+                raise NotFound(self.invalid_cursor_message)
+            return self.ordering_model_field.to_python(value), int(payload['id'])
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+
+class OfferCursorPagination(KeysetPagination):
+    ordering_fields = ('min_price', 'updated_at')
+    default_ordering = '-updated_at'
+
+
+class OrderCursorPagination(KeysetPagination):
+    ordering_fields = ('created_at',)
+    default_ordering = '-created_at'
+
+
+class ReviewCursorPagination(KeysetPagination):
+    ordering_fields = ('updated_at', 'rating')
+    default_ordering = '-updated_at'
+
+
+class CursorPaginationMixin:
+    """Lets clients opt into the view's `cursor_pagination_class` with `?pagination=cursor` (or by following a `cursor` link).
+    Requests without it keep using the regular `pagination_class`, so existing clients see no change."""
+    cursor_pagination_class = None
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return params.get('pagination') == 'cursor' or KeysetPagination.cursor_query_param in params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.cursor_pagination_class is not None and self.use_cursor_pagination():
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
@@ -1,7 +1,5 @@
 from rest_framework import permissions
 from rest_framework.exceptions import PermissionDenied
-from CoderrBackend_app.models import Review
-from rest_framework.exceptions import ValidationError
 
 
 class IsOwnerProfile(permissions.BasePermission):
@@ -20,13 +18,7 @@ class CanCreateReview(permissions.BasePermission):
             return request.user and request.user.is_authenticated       
         if request.user.is_authenticated:
             user_type = getattr(request.user.profile, "type", None)
-            business_id = request.data.get("business_user")           
-            if user_type != "customer":
-                return False            
-            existing_review =  Review.objects.filter(reviewer=request.user, business_user=business_id).first()
-            if existing_review:                
-                raise ValidationError({"error":"Du hast bereit eine Bewertung für den Profil abgegeben."})
-            return True
+            return user_type == "customer"
         return False 
 
     def has_object_permission(self, request, view, obj):       
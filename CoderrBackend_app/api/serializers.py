@@ -1,10 +1,13 @@
 from django.forms import ValidationError
 from rest_framework import serializers, status
 from CoderrBackend_app import models
-from CoderrBackend_app.models import UserProfile, Offer, OfferDetail, Order, Review
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail, Order, ArchivedOrder, Review, BusinessRating, BusinessRanking
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
-from django.db.models import Min
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from CoderrBackend_app.cache import invalidate_offer_catalogue
 from rest_framework.response import Response
 
 class UserSerializer(serializers.ModelSerializer):    
@@ -34,6 +37,37 @@ class UserProfileSerializer(serializers.ModelSerializer):
         
         return super().update(instance, validated_data)
 
+class BusinessProfileSerializer(UserProfileSerializer):
+    review_count = serializers.SerializerMethodField()
+    average_rating = serializers.SerializerMethodField()
+    rating_histogram = serializers.SerializerMethodField()
+    class Meta(UserProfileSerializer.Meta):
+        fields = UserProfileSerializer.Meta.fields + ['review_count', 'average_rating', 'rating_histogram']
+
+    def get_business_rating(self, obj):
+        """Siehe Dokumentation in docs/serializers.md"""
+        try:
+            return obj.rating
+        except BusinessRating.DoesNotExist:
+            return BusinessRating(business_user=obj)
+
+    def get_review_count(self, obj):
+        return self.get_business_rating(obj).review_count
+
+    def get_average_rating(self, obj):
+        return self.get_business_rating(obj).average_rating
+
+    def get_rating_histogram(self, obj):
+        return self.get_business_rating(obj).histogram
+
+class BusinessRankingSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source="business_user.user.username", read_only=True)
+    first_name = serializers.CharField(source="business_user.user.first_name", read_only=True)
+    last_name = serializers.CharField(source="business_user.user.last_name", read_only=True)
+    class Meta:
+        model = BusinessRanking
+        fields = ['business_user', 'username', 'first_name', 'last_name', 'score', 'bayesian_rating', 'review_count', 'completed_orders']
+
 class UserAuthTokenSerializer(serializers.Serializer):
   username = serializers.CharField(write_only=True)
   password = serializers.CharField(write_only=True)
@@ -107,26 +141,21 @@ class OfferSerializer(serializers.ModelSerializer):
             "username": obj.user.username
         }          
       
-    def get_min_price(self, obj):
-        """Siehe Dokumentation in docs/serializers.md"""           
-        return obj.details.aggregate(Min('price'))['price__min'] or 0
-
-    def get_min_delivery_time(self, obj):
-        """Siehe Dokumentation in docs/serializers.md"""         
-        return obj.details.aggregate(Min('delivery_time_in_days'))['delivery_time_in_days__min'] or 0
-       
-    
     def create(self, validated_data):
         """Siehe Dokumentation in docs/serializers.md"""        
         try: 
             details_data = validated_data.pop("details", [])             
-            offer = Offer.objects.create(**validated_data)      
-            for detail in details_data:
-                revisions = detail.get('revisions')
-                if revisions == 0 or revisions is None:
-                    detail['revisions'] = 1  
-                if not OfferDetail.objects.filter(offer=offer, title=detail['title']).exists():
-                    OfferDetail.objects.create(offer=offer, **detail)     
+            with transaction.atomic():
+                offer = Offer.objects.create(**validated_data)
+                details = {}
+                for detail in details_data:
+                    revisions = detail.get('revisions')
+                    if revisions == 0 or revisions is None:
+                        detail['revisions'] = 1  
+                    details.setdefault(detail['title'], OfferDetail(offer=offer, **detail))
+                OfferDetail.objects.bulk_create(details.values())
+                offer.refresh_min_values()
+            invalidate_offer_catalogue()
             return offer
         except Exception as e:
             print(f"Error al crear oferta: {e}")  
@@ -135,30 +164,26 @@ class OfferSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         """Siehe Dokumentation in docs/serializers.md"""           
         details_data = validated_data.pop("details", [])           
-        min_price = self.get_min_price(instance)
-        min_delivery_time = self.get_min_delivery_time(instance)        
-        self.update_offer(instance, validated_data, min_price, min_delivery_time)       
-        self.update_offer_details(instance, details_data)
-        min_price = self.get_min_price(instance)
-        min_delivery_time = self.get_min_delivery_time(instance)
-        if instance.min_price != min_price or instance.min_delivery_time != min_delivery_time:
-            instance.min_price = min_price
-            instance.min_delivery_time = min_delivery_time
-            instance.save()
+        with transaction.atomic():
+            self.update_offer(instance, validated_data)
+            self.update_offer_details(instance, details_data)
+            instance.refresh_min_values()
+        invalidate_offer_catalogue()
         return instance
   
-    def update_offer(self, instance, validated_data, min_price, min_delivery_time):        
+    def update_offer(self, instance, validated_data):        
         """Siehe Dokumentation in docs/serializers.md"""        
         for attr, value in validated_data.items():            
                 setattr(instance, attr, value)
-        instance.min_price = min_price
-        instance.min_delivery_time = min_delivery_time       
         instance.save()  
        
         
     def update_offer_details(self, instance, details_data):          
         """Siehe Dokumentation in docs/serializers.md"""
-        existing_details = {detail.offer_type: detail for detail in OfferDetail.objects.filter(offer=instance)}       
+        existing_details = {detail.offer_type: detail for detail in instance.details.all()}
+        updated_details = {}
+        updated_fields = set()
+        new_details = []
         for detail_data in details_data:       
             offerType = detail_data.get('offer_type')   
             revisions = detail_data.get('revisions')  
@@ -166,22 +191,70 @@ class OfferSerializer(serializers.ModelSerializer):
             if offerType in existing_details:
                 detail_instance = existing_details[offerType]
                 for attr, value in detail_data.items():
-                    setattr(detail_instance, attr, value)                                        
-                detail_instance.save()
+                    if attr != 'id':
+                        setattr(detail_instance, attr, value)
+                        updated_fields.add(attr)
+                updated_details[detail_instance.pk] = detail_instance
             else:                
-                OfferDetail.objects.create(offer=instance, **detail_data)      
+                new_details.append(OfferDetail(offer=instance, **detail_data))
+        if updated_details:
+            now = timezone.now()
+            for detail_instance in updated_details.values():
+                detail_instance.updated_at = now
+            OfferDetail.objects.bulk_update(updated_details.values(), sorted(updated_fields | {'updated_at'}))
+        if new_details:
+            OfferDetail.objects.bulk_create(new_details)
      
 
+class OfferListSerializer(serializers.BaseSerializer):
+    values_fields = ('id', 'title', 'image', 'description', 'created_at', 'updated_at', 'min_price', 'min_delivery_time', 'user',
+                     'user__first_name', 'user__last_name', 'user__username')
+    datetime_field = serializers.DateTimeField()
+    price_field = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+    @classmethod
+    def get_rows(cls, queryset):
+        """Siehe Dokumentation in docs/serializers.md"""
+        return queryset.select_related(None).prefetch_related(None).values(*cls.values_fields)
+
+    @staticmethod
+    def attach_details(rows):
+        """Siehe Dokumentation in docs/serializers.md"""
+        details = {row['id']: [] for row in rows}
+        detail_ids = OfferDetail.objects.filter(offer_id__in=details).order_by('id').values_list('offer_id', 'id')
+        for offer_id, detail_id in detail_ids:
+            details[offer_id].append({"id": detail_id, "url": f"/offerdetails/{detail_id}/"})
+        for row in rows:
+            row['details'] = details[row['id']]
+        return rows
+
+    def to_representation(self, row):
+        """Siehe Dokumentation in docs/serializers.md"""
+        return {
+            "id": row['id'],
+            "user_details": {
+                "first_name": row['user__first_name'],
+                "last_name": row['user__last_name'],
+                "username": row['user__username'],
+            },
+            "details": row['details'],
+            "title": row['title'],
+            "image": default_storage.url(row['image']) if row['image'] else None,
+            "description": row['description'],
+            "created_at": self.datetime_field.to_representation(row['created_at']),
+            "updated_at": self.datetime_field.to_representation(row['updated_at']),
+            "min_price": self.price_field.to_representation(row['min_price']) if row['min_price'] is not None else None,
+            "min_delivery_time": row['min_delivery_time'],
+            "user": row['user'],
+        }
+
+
 class OrderSerializer(serializers.ModelSerializer):
-    title = serializers.CharField(source="offer_detail.title", read_only=True)
-    revisions = serializers.IntegerField(source="offer_detail.revisions", read_only=True)
-    delivery_time_in_days = serializers.IntegerField(source="offer_detail.delivery_time_in_days", read_only=True)
     price = serializers.SerializerMethodField() 
-    features = serializers.ListField(source="offer_detail.features", read_only=True)
-    offer_type = serializers.CharField(source="offer_detail.offer_type", read_only=True)
     class Meta:
         model = Order        
         fields = '__all__'   
+        read_only_fields = Order.SNAPSHOT_FIELDS
         
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -190,13 +263,37 @@ class OrderSerializer(serializers.ModelSerializer):
     
     def get_price(self, obj):  # Asegurar que el método esté aquí
         """Devuelve el precio como número en lugar de string"""
-        return float(obj.offer_detail.price) if obj.offer_detail else None
+        return float(obj.price) if obj.price is not None else None
     
+class ArchivedOrderSerializer(OrderSerializer):
+    class Meta:
+        model = ArchivedOrder
+        exclude = ['offer_detail_id']
+
 class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = '__all__'
         read_only_fields = ["reviewer"]
+
+class ExpandedReviewSerializer(ReviewSerializer):
+    reviewer_details = serializers.SerializerMethodField()
+    business_user_details = serializers.SerializerMethodField()
+
+    def get_reviewer_details(self, obj):
+        """Siehe Dokumentation in docs/serializers.md"""
+        return self.get_name_details(obj.reviewer)
+
+    def get_business_user_details(self, obj):
+        """Siehe Dokumentation in docs/serializers.md"""
+        return self.get_name_details(obj.business_user.user)
+
+    def get_name_details(self, user):
+        return {
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "username": user.username
+        }
         
         
    
\ No newline at end of file
@@ -0,0 +1,49 @@
+import json
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class StreamingListMixin:
+    """Lets clients opt into a streamed list response with `?stream=1` (JSON array) or `?stream=ndjson` (one JSON object per line).
+    The queryset is read with `.iterator(chunk_size=stream_chunk_size)` and serialized row by row, so the memory needed does not grow with the number of rows.
+    Requests without the parameter keep the regular list response. Pagination is not applied to a streamed response."""
+    stream_query_param = 'stream'
+    stream_chunk_size = 500
+
+    def get_stream_format(self):
+        """Returns 'ndjson', 'json' or None (no streaming) from the `stream` query parameter."""
+        value = self.request.query_params.get(self.stream_query_param, '').lower()
+        if value == 'ndjson':
+            return 'ndjson'
+        if value in ('1', 'true', 'json'):
+            return 'json'
+        return None
+
+    def list(self, request, *args, **kwargs):
+        if self.get_stream_format():
+            return self.get_streaming_response(self.filter_queryset(self.get_queryset()))
+        return super().list(request, *args, **kwargs)
+
+    def get_streaming_response(self, queryset):
+        """Returns a StreamingHttpResponse with the serialized rows of the queryset in the requested stream format."""
+        if self.get_stream_format() == 'ndjson':
+            return StreamingHttpResponse(self.stream_ndjson(queryset), content_type='application/x-ndjson')
+        return StreamingHttpResponse(self.stream_json_array(queryset), content_type='application/json')
+
+    def stream_rows(self, queryset):
+        """Yields every row of the queryset as a JSON string. One serializer instance is reused for all rows instead of building a `many=True` list."""
+        serializer = self.get_serializer()
+        for instance in queryset.iterator(chunk_size=self.stream_chunk_size):
+            yield json.dumps(serializer.to_representation(instance), cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
+
+    def stream_json_array(self, queryset):
+        yield '['
+        separator = ''
+        for row in self.stream_rows(queryset):
+            yield separator + row
+            separator = ','
+        yield ']'
+
+    def stream_ndjson(self, queryset):
+        for row in self.stream_rows(queryset):
+            yield row + '\n'
@@ -1,10 +1,12 @@
 
+from collections import Counter
 from rest_framework import viewsets, generics
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError, PermissionDenied, NotFound
-from CoderrBackend_app.api.serializers import UserProfileSerializer, UserAuthTokenSerializer, RegistrationSerializer, OfferSerializer, OfferDetailSerializer, OrderSerializer, ReviewSerializer
+from CoderrBackend_app.api.serializers import UserProfileSerializer, BusinessProfileSerializer, BusinessRankingSerializer, UserAuthTokenSerializer, RegistrationSerializer, OfferSerializer, OfferListSerializer, OfferDetailSerializer, OrderSerializer, ArchivedOrderSerializer, ReviewSerializer, ExpandedReviewSerializer
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
-from CoderrBackend_app.models import UserProfile, Offer, OfferDetail, Order, Review
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail, Order, OrderIdempotencyKey, ArchivedOrder, Review, BusinessOrderCounter, BusinessRanking, PlatformStatistics
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
@@ -13,25 +15,57 @@ from django_filters.rest_framework import DjangoFilterBackend
 from .permissions import IsOwnerProfile, CanCreateReview, CanCreateOrder, CanCreateOffer, CanViewOffer
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework import status
-from django.db.models import Avg, Q
-from rest_framework.pagination import PageNumberPagination
-from CoderrBackend_app.filters import OfferFilter, ReviewFilter
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from .pagination import OfferPagination, OfferCursorPagination, OrderCursorPagination, ReviewCursorPagination, CursorPaginationMixin
+from .streaming import StreamingListMixin
+from .conditional import make_etag, last_modified_timestamp, not_modified_response, set_validator_headers
+from CoderrBackend_app.filters import OfferFilter, OrderFilter, ArchivedOrderFilter, ReviewFilter
 from rest_framework.parsers import JSONParser
+from django.conf import settings
+from django.core.cache import cache
+from CoderrBackend_app.cache import offer_response_cache_key, order_analytics_cache_key, invalidate_order_analytics, get_or_refresh, PLATFORM_STATISTICS_CACHE_KEY
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 
 class UserProfileViewSet(viewsets.ModelViewSet):
-    queryset = UserProfile.objects.all()
+    queryset = UserProfile.objects.select_related('user', 'rating')
     serializer_class = UserProfileSerializer  
     permission_classes = [IsAuthenticated, IsOwnerProfile]          
+
+    def get_serializer(self, instance=None, *args, **kwargs):
+        """Siehe Dokumentation in docs/views.md"""
+        if isinstance(instance, UserProfile) and instance.type == 'business':
+            kwargs.setdefault('context', self.get_serializer_context())
+            return BusinessProfileSerializer(instance, *args, **kwargs)
+        return super().get_serializer(instance, *args, **kwargs)
  
     
-class CustomerListView(generics.ListAPIView):
+class CustomerListView(StreamingListMixin, generics.ListAPIView):
     queryset = UserProfile.objects.filter(type='customer').select_related('user')
     serializer_class = UserProfileSerializer
   
   
-class BusinessListView(generics.ListAPIView):
-    queryset = UserProfile.objects.filter(type='business').select_related('user')
-    serializer_class = UserProfileSerializer
+class BusinessListView(StreamingListMixin, generics.ListAPIView):
+    queryset = UserProfile.objects.filter(type='business').select_related('user', 'rating')
+    serializer_class = BusinessProfileSerializer
+       
+    
+class BusinessLeaderboardView(generics.ListAPIView):
+    serializer_class = BusinessRankingSerializer
+    permission_classes = [AllowAny]
+    default_limit = 10
+    max_limit = 50
+
+    def get_queryset(self):
+        """Siehe Dokumentation in docs/views.md"""
+        limit = self.request.query_params.get('limit', self.default_limit)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValidationError({"limit": "Muss eine ganze Zahl sein."})
+        limit = min(max(limit, 1), self.max_limit)
+        return BusinessRanking.objects.select_related('business_user__user').order_by('-score', 'business_user_id')[:limit]
        
     
 class LoginView(ObtainAuthToken):
@@ -133,62 +167,96 @@ class RegistrationView(APIView):
             return Response(data, status=status.HTTP_400_BAD_REQUEST)
     
 
-class OfferPagination(PageNumberPagination):
-    page_size = 6  
-    page_size_query_param = 'page_size'
-    max_page_size = 10
-
-
-class OfferViewSet(viewsets.ModelViewSet):
+class OfferViewSet(CursorPaginationMixin, viewsets.ModelViewSet):
     queryset = Offer.objects.all()
     serializer_class = OfferSerializer
     permission_classes = [CanCreateOffer, CanViewOffer]
     pagination_class = OfferPagination
+    cursor_pagination_class = OfferCursorPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = OfferFilter    
     
     def list(self, request, *args, **kwargs):
         """Siehe Dokumentation in docs/views.md"""
-        offers = self.get_queryset()
-        page = self.paginate_queryset(offers)
-        data = []        
-        for offer in page:                  
-            details = [ {
-            "id": detail.id, "url": f"/offerdetails/{detail.id}/"}for detail in offer.details.all() ]             
-            offer_data = OfferSerializer(offer).data
-            offer_data['details'] = details
-            data.append(offer_data)
-        return self.get_paginated_response(data)
+        cache_key = offer_response_cache_key(request)
+        cached = cache.get(cache_key)
+        if cached is None:
+            etag = make_etag(cache_key)
+            not_modified = not_modified_response(request, etag, None)
+            if not_modified is not None:
+                return not_modified
+            queryset = self.get_queryset()
+            if isinstance(self.paginator, OfferPagination):
+                self.paginator.known_count = self.get_known_count(queryset)
+            offers = OfferListSerializer.get_rows(queryset)
+            page = OfferListSerializer.attach_details(self.paginate_queryset(offers))
+            data = OfferListSerializer(page, many=True).data
+            cached = {'data': self.get_paginated_response(data).data, 'etag': etag, 'last_modified': None}
+            cache.set(cache_key, cached, settings.OFFER_RESPONSE_CACHE_TIMEOUT)
+        return self.cached_response(request, cached)
+
+    def get_known_count(self, queryset):
+        """Siehe Dokumentation in docs/views.md"""
+        if queryset.query.where:
+            return None
+        return PlatformStatistics.load().offer_count
+
+    def get_offer_validators(self):
+        """Siehe Dokumentation in docs/views.md"""
+        validators = Offer.objects.filter(pk=self.kwargs['pk']).aggregate(
+            updated_at=Max('updated_at'), details_updated_at=Max('details__updated_at'), detail_count=Count('details'))
+        if validators['updated_at'] is None:
+            raise NotFound("Offer not found.")
+        etag = make_etag(self.kwargs['pk'], validators['updated_at'], validators['details_updated_at'], validators['detail_count'])
+        return etag, last_modified_timestamp(validators['updated_at'], validators['details_updated_at'])
+
+    def cached_response(self, request, cached):
+        """Siehe Dokumentation in docs/views.md"""
+        not_modified = not_modified_response(request, cached['etag'], cached['last_modified'])
+        if not_modified is not None:
+            return not_modified
+        return set_validator_headers(Response(cached['data']), cached['etag'], cached['last_modified'])
        
     def get_queryset(self):      
         """Siehe Dokumentation in docs/views.md"""
-        queryset = self.filter_queryset(super().get_queryset())     
+        queryset = super().get_queryset().select_related('user').prefetch_related('details')
+        queryset = self.filter_queryset(queryset)
         user_id = self.request.query_params.get('creator_id')
         if user_id and self.request.user.is_authenticated:
             queryset = queryset.filter(user=user_id)             
         ordering = self.request.query_params.get('ordering')       
         if ordering:
             queryset = queryset.order_by(ordering)
+        elif not queryset.ordered:
+            queryset = queryset.order_by('-updated_at')
         return queryset
 
     def retrieve(self, request, *args, **kwargs):
         """Siehe Dokumentation in docs/views.md """
-        offer = self.get_object()                          
-        details = [ {  "id": detail.id, "url": f"/offerdetails/{detail.id}/"}for detail in offer.details.all()]
-        serializer = OfferSerializer(offer, context={"view": "retrieve"})
-        offer_data = serializer.data 
-        offer_data.pop("user_details", None) 
-        offer_data["details"] = details     
-        return Response(offer_data)
+        cache_key = offer_response_cache_key(request)
+        cached = cache.get(cache_key)
+        if cached is None:
+            etag, last_modified = self.get_offer_validators()
+            not_modified = not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+            offer = self.get_object()                          
+            details = [ {  "id": detail.id, "url": f"/offerdetails/{detail.id}/"}for detail in offer.details.all()]
+            serializer = OfferSerializer(offer, context={"view": "retrieve"})
+            offer_data = serializer.data 
+            offer_data.pop("user_details", None) 
+            offer_data["details"] = details     
+            cached = {'data': offer_data, 'etag': etag, 'last_modified': last_modified}
+            cache.set(cache_key, cached, settings.OFFER_RESPONSE_CACHE_TIMEOUT)
+        return self.cached_response(request, cached)
     
     def perform_create(self, serializer, format=None):             
         """Siehe Dokumentation in docs/views.md"""         
         user = self.request.user 
         self.validate_user_permissions(user)
-        details_data = self.get_validated_details()       
-        min_price, min_delivery_time = self.calculate_min_values(details_data)  
+        self.get_validated_details()       
         image = None        
-        serializer.save(user=user,min_price=min_price, min_delivery_time=min_delivery_time,image=image)
+        serializer.save(user=user,image=image)
 
     def perform_update(self, serializer, format=None):         
         """Siehe Dokumentation in docs/views.md"""
@@ -199,14 +267,6 @@ class OfferViewSet(viewsets.ModelViewSet):
         details_data = self.get_validated_details()            
         serializer.save(details_data=details_data)
 
-    def calculate_min_values(self, details_data):
-        """Siehe Dokumentation in docs/views.md""" 
-        prices = [float(detail.get('price')) for detail in details_data if detail.get('price') is not None]
-        delivery_times = [int(detail.get('delivery_time_in_days')) for detail in details_data if detail.get('delivery_time_in_days') is not None]           
-        min_price = min(prices) if prices else 0.00
-        min_delivery_time = min(delivery_times) if delivery_times else None       
-        return min_price, min_delivery_time 
-    
     def validate_user_permissions(self, user):             
         """#Siehe Dokumentation in docs/views.md"""        
         if not hasattr(user, 'profile') or user.profile.type != "business":
@@ -238,57 +298,140 @@ class OfferDetailViewSet(viewsets.ModelViewSet):
     serializer_class = OfferDetailSerializer 
     permission_classes = [IsAuthenticated]
     def retrieve(self, request, *args, **kwargs):
+        """Siehe Dokumentation in docs/views.md"""
         instance = self.get_object()  
+        etag = make_etag(instance.pk, instance.updated_at)
+        last_modified = last_modified_timestamp(instance.updated_at)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
         serializer = self.get_serializer(instance)
         data = serializer.data
         data.pop('offer', None)        
-        return Response(data)
+        return set_validator_headers(Response(data), etag, last_modified)
     
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(CursorPaginationMixin, StreamingListMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = [IsAuthenticated, CanCreateOrder]
+    cursor_pagination_class = OrderCursorPagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = OrderFilter
+    bulk_status_max_items = 100
     
     def get_queryset(self):       
         """Siehe Dokumentation in docs/views.md"""                 
         user = self.request.user                
         if user.is_authenticated:           
-            queryset = Order.objects.filter(customer_user=user.profile ) | Order.objects.filter(business_user=user.profile) 
-            return queryset
+            profile = user.profile
+            return Order.objects.filter(Q(customer_user=profile) | Q(business_user=profile))
         return Order.objects.none()  
     
     def list(self, request, *args, **kwargs):
         """Siehe Dokumentation in docs/views.md"""        
-        print(self.get_permissions())
-        orders = self.get_queryset().select_related('offer_detail')  
+        orders = self.filter_queryset(self.get_queryset())
+        if self.get_stream_format():
+            return self.get_streaming_response(orders)
+        page = self.paginate_queryset(orders)
+        if page is not None:
+            return self.get_paginated_response(OrderSerializer(page, many=True).data)
         serialized_orders = OrderSerializer(orders, many=True).data  
-        for order in serialized_orders:
-            order.pop('offer_detail', None)
         return Response(serialized_orders, status=200)
     
     def create(self,request, *args, **kwargs):        
         """Siehe Dokumentation in docs/views.md"""                 
+        idempotency_key = request.headers.get('Idempotency-Key')
+        if not idempotency_key:
+            return self.create_order(request)
+        fingerprint = str(request.data.get("offer_detail_id"))
+        entry = OrderIdempotencyKey.lookup(request.user, idempotency_key)
+        if entry is not None:
+            return self.replay_order(entry, fingerprint)
+        try:
+            return self.create_order(request, idempotency_key, fingerprint)
+        except IntegrityError:
+            entry = OrderIdempotencyKey.lookup(request.user, idempotency_key)
+            if entry is None:
+                raise
+            return self.replay_order(entry, fingerprint)
+
+    def replay_order(self, entry, fingerprint):
+        """Siehe Dokumentation in docs/views.md"""
+        if entry.fingerprint != fingerprint:
+            return Response({"error": "Der Idempotency-Key wurde bereits für eine andere Bestellung verwendet."}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        return Response(entry.response, status=status.HTTP_201_CREATED)
+
+    def create_order(self, request, idempotency_key=None, fingerprint=None):
+        """Siehe Dokumentation in docs/views.md"""
         offer_detail_id = request.data.get("offer_detail_id")               
         if not offer_detail_id or not str(offer_detail_id).isdigit():
             return Response({"error": "Invalid offer_detail_id."}, status=status.HTTP_400_BAD_REQUEST)
-        offer_detail = self.get_offer_detail(offer_detail_id)            
-        if not offer_detail:
-            return Response({"error": "Invalid offer_detail_id."}, status=status.HTTP_404_NOT_FOUND)
-        request_data = self.request_data(offer_detail,user=self.request.user)     
-        serializer = self.get_serializer(data=request_data)          
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)  
-        self.perform_create(serializer)              
-        headers = self.get_success_headers(serializer.data)
-        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+        with transaction.atomic():
+            offer_detail = self.get_offer_detail(offer_detail_id)            
+            business_profile = getattr(offer_detail.offer.user, 'profile', None)
+            if business_profile is None:
+                return Response({"error": "Invalid offer_detail_id."}, status=status.HTTP_400_BAD_REQUEST)
+            order = Order.objects.create(customer_user=request.user.profile, business_user=business_profile, offer_detail=offer_detail, status="in_progress")
+            data = OrderSerializer(order).data
+            if idempotency_key is not None:
+                OrderIdempotencyKey.store(request.user, idempotency_key, fingerprint, data)
+        return Response(data, status=status.HTTP_201_CREATED)
         
     def get_offer_detail(self, offer_detail_id):
         """Siehe Dokumentation in docs/views.md"""        
         try:
-            return OfferDetail.objects.get(id=offer_detail_id)           
+            return OfferDetail.objects.select_related('offer__user__profile').get(id=offer_detail_id)           
         except OfferDetail.DoesNotExist:
             raise NotFound({"error": "Invalid offer_detail ID"})
 
+    @action(detail=False, methods=['patch'], url_path='bulk-status')
+    def bulk_status(self, request, *args, **kwargs):
+        """Siehe Dokumentation in docs/views.md"""
+        items = request.data
+        if not isinstance(items, list) or not items or len(items) > self.bulk_status_max_items:
+            return Response({"error": f"Erwartet wird eine Liste mit 1 bis {self.bulk_status_max_items} Einträgen {{id, status}}."}, status=status.HTTP_400_BAD_REQUEST)
+        results, targets = self.parse_bulk_status_items(items)
+        with transaction.atomic():
+            current = dict(Order.objects.select_for_update().filter(pk__in=targets, business_user=request.user.profile).values_list('id', 'status'))
+            changes, deltas = {}, Counter()
+            for order_id, target in targets.items():
+                if order_id in current and current[order_id] != target:
+                    changes.setdefault(target, []).append(order_id)
+                    deltas[current[order_id]] -= 1
+                    deltas[target] += 1
+            now = timezone.now()
+            for target, order_ids in changes.items():
+                Order.objects.filter(pk__in=order_ids, business_user=request.user.profile).exclude(status=target).update(status=target, updated_at=now)
+            BusinessOrderCounter.apply(request.user.profile.id, deltas)
+            if changes:
+                invalidate_order_analytics(request.user.profile.id)
+        for result in results:
+            if "error" in result:
+                continue
+            if result["id"] not in current:
+                result.update({"result": "error", "error": "Order not found."})
+            else:
+                result["result"] = "unchanged" if current[result["id"]] == result["status"] else "updated"
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    def parse_bulk_status_items(self, items):
+        """Siehe Dokumentation in docs/views.md"""
+        statuses = dict(Order._meta.get_field('status').choices)
+        results, targets = [], {}
+        for item in items:
+            order_id = item.get("id") if isinstance(item, dict) else None
+            target = item.get("status") if isinstance(item, dict) else None
+            if not isinstance(order_id, int) or isinstance(order_id, bool):
+                results.append({"id": order_id, "result": "error", "error": "Invalid id."})
+            elif target not in statuses:
+                results.append({"id": order_id, "result": "error", "error": "Invalid status."})
+            elif order_id in targets:
+                results.append({"id": order_id, "result": "error", "error": "Duplicate id."})
+            else:
+                targets[order_id] = target
+                results.append({"id": order_id, "status": target})
+        return results, targets
+
     def get_object(self):                     
        try:
             obj = Order.objects.get(pk=self.kwargs["pk"])                     
@@ -305,20 +448,6 @@ class OrderViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Du hast keine Berechtigung, diese Bestellung zu bearbeiten.")        
         return super().update(request, *args, **kwargs)
                 
-    def request_data(self, offer_detail, user):    
-        """Siehe Dokumentation in docs/views.md"""          
-        return {
-            "offer_detail": offer_detail.id,
-            "customer_user" : self.request.user.id, 
-            "business_user": offer_detail.offer.user.id, 
-            "title":offer_detail.title,
-            "revisions": offer_detail.revisions,
-            "delivery_time_in_days":offer_detail.delivery_time_in_days,
-            "price":offer_detail.price,
-            "features":offer_detail.features,
-            "offer_type":offer_detail.offer_type,
-            "status":"in_progress" }
-            
     def Destroy(self, request, *args, **kwargs):
         """Siehe Dokumentation in docs/views.md"""            
         if not request.user.is_staff:
@@ -327,18 +456,30 @@ class OrderViewSet(viewsets.ModelViewSet):
         self.perform_destroy(order)
         return Response({"order": None}, status=status.HTTP_204_NO_CONTENT)
    
+class ArchivedOrderViewSet(CursorPaginationMixin, viewsets.ReadOnlyModelViewSet):
+    serializer_class = ArchivedOrderSerializer
+    permission_classes = [IsAuthenticated]
+    cursor_pagination_class = OrderCursorPagination
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = ArchivedOrderFilter
+
+    def get_queryset(self):
+        """Siehe Dokumentation in docs/views.md"""
+        profile = getattr(self.request.user, 'profile', None)
+        if profile is None:
+            return ArchivedOrder.objects.none()
+        return ArchivedOrder.objects.filter(Q(customer_user=profile) | Q(business_user=profile))
+
 class BusinessUserOrderCountView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
     def get(self, request, business_user_id, *args, **kwargs):        
         """Siehe Dokumentation in docs/views.md"""
         if not request.user.is_authenticated:
             return Response({"error": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
-        try:            
-            business_user = UserProfile.objects.get(id=business_user_id)
-        except UserProfile.DoesNotExist:
+        counts = BusinessOrderCounter.get_counts(business_user_id)
+        if counts is None:
             return Response({"error": "Business user not found"}, status=status.HTTP_404_NOT_FOUND)
-        ongoing_orders_count = Order.objects.filter(business_user=business_user, status="in_progress").count()
-        return Response({"order_count": ongoing_orders_count}, status=status.HTTP_200_OK)
+        return Response({"order_count": counts['in_progress']}, status=status.HTTP_200_OK)
 
 class BusinessUserCompletedOrderCountView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
@@ -346,60 +487,106 @@ class BusinessUserCompletedOrderCountView(APIView):
         """Siehe Dokumentation in docs/views.md"""        
         if not request.user.is_authenticated:
             return Response({"error": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
-        try:            
-            business_user = UserProfile.objects.get(id=business_user_id)
-        except UserProfile.DoesNotExist:
+        counts = BusinessOrderCounter.get_counts(business_user_id)
+        if counts is None:
+            return Response({"error": "Business user not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"completed_order_count": counts['completed']}, status=status.HTTP_200_OK)
+
+class BusinessUserOrderCountsView(APIView):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    def get(self, request, business_user_id, *args, **kwargs):        
+        """Siehe Dokumentation in docs/views.md"""        
+        if not request.user.is_authenticated:
+            return Response({"error": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
+        counts = BusinessOrderCounter.get_counts(business_user_id)
+        if counts is None:
             return Response({"error": "Business user not found"}, status=status.HTTP_404_NOT_FOUND)
-        completed_orders_count = Order.objects.filter(business_user=business_user, status="completed").count()
-        return Response({"completed_order_count": completed_orders_count}, status=status.HTTP_200_OK)
+        return Response(counts, status=status.HTTP_200_OK)
     
-class ReviewViewSet(viewsets.ModelViewSet):
+class OrderAnalyticsView(APIView):
+    permission_classes = [IsAuthenticated]
+    periods = {'month': TruncMonth, 'week': TruncWeek}
+
+    def get(self, request, *args, **kwargs):
+        """Siehe Dokumentation in docs/views.md"""
+        profile = getattr(request.user, 'profile', None)
+        if profile is None or profile.type != 'business':
+            return Response({"error": "Nur Geschäftsbenutzer können ihre Auswertungen abrufen."}, status=status.HTTP_403_FORBIDDEN)
+        period = request.query_params.get('period', 'month')
+        if period not in self.periods:
+            return Response({"error": f"Ungültiger Zeitraum. Erlaubt sind: {', '.join(self.periods)}."}, status=status.HTTP_400_BAD_REQUEST)
+        cache_key = order_analytics_cache_key(profile.id, period)
+        results = cache.get(cache_key)
+        if results is None:
+            results = self.get_results(profile.id, self.periods[period])
+            cache.set(cache_key, results, settings.ORDER_ANALYTICS_CACHE_TIMEOUT)
+        return Response({"period": period, "results": results}, status=status.HTTP_200_OK)
+
+    def get_results(self, business_user_id, trunc):
+        """Siehe Dokumentation in docs/views.md"""
+        totals = {}
+        for model in (Order, ArchivedOrder):
+            rows = (model.objects.filter(business_user_id=business_user_id).order_by().annotate(period=trunc('created_at'))
+                    .values('period', 'offer_type', 'status').annotate(order_count=Count('id'), revenue=Sum('price')))
+            for row in rows:
+                total = totals.setdefault((row['period'], row['offer_type'], row['status']), {"order_count": 0, "revenue": 0})
+                total["order_count"] += row['order_count']
+                total["revenue"] += row['revenue'] or 0
+        return [{"period": period, "offer_type": offer_type, "status": order_status, "order_count": total["order_count"], "revenue": float(total["revenue"])}
+                for (period, offer_type, order_status), total in sorted(totals.items(), key=lambda item: (item[0][0], item[0][1] or '', item[0][2]))]
+
+class ReviewViewSet(CursorPaginationMixin, StreamingListMixin, viewsets.ModelViewSet):
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = [CanCreateReview]  
+    cursor_pagination_class = ReviewCursorPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = ReviewFilter
        
     def get_queryset(self):             
         """Siehe Dokumentation in docs/views.md """        
-        return self.filter_queryset(super().get_queryset())
+        queryset = super().get_queryset()
+        if self.expand_names():
+            queryset = queryset.select_related('reviewer', 'business_user__user')
+        return self.filter_queryset(queryset)
+
+    def expand_names(self):
+        """Siehe Dokumentation in docs/views.md"""
+        return self.request.query_params.get('expand', '').lower() in ('1', 'true', 'names')
+
+    def get_serializer_class(self):
+        if self.expand_names():
+            return ExpandedReviewSerializer
+        return super().get_serializer_class()
        
     def perform_create(self, serializer):
-        """ Saves the review with the requesting user as the reviewer. """                    
+        """Siehe Dokumentation in docs/views.md"""                    
         if not serializer.is_valid():                             
             raise ValidationError("Ungültige Daten für das Angebot. Bitte überprüfen Sie Ihre Eingabe.")
-        serializer.save(reviewer=self.request.user)    
+        self.save_review(serializer, self.request.user, reviewer=self.request.user)
+
+    def perform_update(self, serializer):
+        """Siehe Dokumentation in docs/views.md"""
+        self.save_review(serializer, serializer.instance.reviewer)
+
+    def save_review(self, serializer, author, **kwargs):
+        """Siehe Dokumentation in docs/views.md"""
+        try:
+            with transaction.atomic():
+                serializer.save(**kwargs)
+        except IntegrityError:
+            business_user = serializer.validated_data.get('business_user') or serializer.instance.business_user
+            duplicates = Review.objects.filter(reviewer=author, business_user=business_user)
+            if serializer.instance is not None:
+                duplicates = duplicates.exclude(pk=serializer.instance.pk)
+            if duplicates.exists():
+                raise PermissionDenied("Du hast bereit eine Bewertung für den Profil abgegeben.")
+            raise
     
 class StatisticsView(APIView):
     permission_classes = [AllowAny]
 
-    """ def get(self, request):
-        """ """Siehe Dokumentation in docs/views.md""" """
-        review_count = Review.objects.count() 
-        average_rating = Review.objects.aggregate(Avg("rating"))["rating__avg"] or 0 
-        business_profile_count = UserProfile.objects.filter(type="business").count() 
-        offer_count = Offer.objects.count()  
-        data = {    "review_count": review_count,
-                    "average_rating": round(average_rating, 1), 
-                    "business_profile_count": business_profile_count,
-                    "offer_count": offer_count        }
-        return Response(data) """
-    
-    
     def get(self, request, *args, **kwargs):
-        try:
-            review_count = Review.objects.count()
-            average_rating = Review.objects.aggregate(Avg("rating"))["rating__avg"]
-            average_rating = round(average_rating, 1) if average_rating is not None else "--"
-            business_profile_count = UserProfile.objects.filter(type="business").count()
-            offer_count = Offer.objects.count()
-        except Exception:
-            review_count = average_rating = business_profile_count = offer_count = "--"
-
-        data = {
-            "review_count": review_count,
-            "average_rating": average_rating,
-            "business_profile_count": business_profile_count,
-            "offer_count": offer_count
-        }
-        return Response(data)
\ No newline at end of file
+        """Siehe Dokumentation in docs/views.md"""
+        data = get_or_refresh(PLATFORM_STATISTICS_CACHE_KEY, lambda: PlatformStatistics.load().as_data(), settings.PLATFORM_STATISTICS_CACHE_TIMEOUT)
+        return Response(data)
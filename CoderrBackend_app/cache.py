@@ -0,0 +1,106 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+from django.core.cache import cache
+from django.db import transaction
+
+OFFER_CATALOGUE_VERSION_KEY = 'offers:catalogue-version'
+
+
+def get_version(version_key):
+    """Returns the current version stored under `version_key`. A missing version (first use, or evicted from a bounded cache) starts at the current time in nanoseconds,
+    which is always larger than any earlier version, so responses cached under an older version can never be served again."""
+    version = cache.get(version_key)
+    if version is None:
+        version = time.time_ns()
+        cache.add(version_key, version, timeout=None)
+        version = cache.get(version_key, version)
+    return version
+
+
+def bump_version(version_key):
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.add(version_key, time.time_ns(), timeout=None)
+
+
+def get_offer_catalogue_version():
+    """Returns the current offer catalogue version (see `get_version`)."""
+    return get_version(OFFER_CATALOGUE_VERSION_KEY)
+
+
+def bump_offer_catalogue_version():
+    bump_version(OFFER_CATALOGUE_VERSION_KEY)
+
+
+def invalidate_offer_catalogue():
+    """Invalidates every cached offer response. The version is bumped right away and once more when the surrounding transaction commits,
+    so a response cached from the not yet committed state in between is not served either."""
+    bump_offer_catalogue_version()
+    transaction.on_commit(bump_offer_catalogue_version)
+
+
+def offer_response_cache_key(request):
+    """Builds the cache key of an offer list or retrieve response from the catalogue version, the host, the path and the normalized query string.
+    The query parameters are sorted and empty values are dropped, so `?page=2&search=` and `?search=&page=2` share one entry.
+    The key has to be built before the database is read, so a version bump during the request leaves the new response under the old version."""
+    params = sorted((key, value) for key, values in request.query_params.lists() for value in values if value != '')
+    url = f"{request.get_host()}{request.path}?{urlencode(params)}"
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return f"offers:response:{get_offer_catalogue_version()}:{digest}"
+
+
+def order_analytics_version_key(business_user_id):
+    return f"orders:analytics-version:{business_user_id}"
+
+
+def invalidate_order_analytics(business_user_id):
+    """Invalidates the cached order analytics of a business user, right away and once more when the surrounding transaction commits (see `invalidate_offer_catalogue`)."""
+    version_key = order_analytics_version_key(business_user_id)
+    bump_version(version_key)
+    transaction.on_commit(lambda: bump_version(version_key))
+
+
+def order_analytics_cache_key(business_user_id, period):
+    """Builds the cache key of the order analytics of a business user for the given period from the business user's analytics version."""
+    return f"orders:analytics:{business_user_id}:{get_version(order_analytics_version_key(business_user_id))}:{period}"
+
+
+def token_revocation_version_key(user_id):
+    return f"auth:token-version:{user_id}"
+
+
+def get_token_revocation_version(user_id):
+    """Returns the token revocation version of a user (see `get_version`), which every cached token of the user is checked against."""
+    return get_version(token_revocation_version_key(user_id))
+
+
+def revoke_user_tokens(user_id):
+    """Invalidates the cached tokens of a user in every process sharing the cache, right away and once more when the surrounding transaction commits
+    (see `invalidate_offer_catalogue`)."""
+    version_key = token_revocation_version_key(user_id)
+    bump_version(version_key)
+    transaction.on_commit(lambda: bump_version(version_key))
+
+
+PLATFORM_STATISTICS_CACHE_KEY = 'platform:statistics'
+
+
+def get_or_refresh(key, load, timeout, lock_timeout=10):
+    """Returns the value cached under `key`, calling `load()` at most once per expiry across all requests (stampede protection).
+    The value is stored together with its soft expiry time and kept ten times longer than `timeout`. Once it is older than `timeout`,
+    the first request that locks the key with `cache.add` reloads it, while concurrent requests keep getting the stale value.
+    Only requests that find no value at all and lose the lock call `load()` themselves, without storing the result."""
+    entry = cache.get(key)
+    if entry is not None and entry["expires_at"] > time.time():
+        return entry["value"]
+    lock_key = f"{key}:lock"
+    if not cache.add(lock_key, True, lock_timeout):
+        return entry["value"] if entry is not None else load()
+    try:
+        value = load()
+        cache.set(key, {"value": value, "expires_at": time.time() + timeout}, timeout * 10)
+    finally:
+        cache.delete(lock_key)
+    return value
@@ -1,7 +1,8 @@
 import django_filters
 from django.core.exceptions import ValidationError
 from django.db.models import Q
-from .models import Offer, Review
+from .models import ArchivedOrder, Offer, Order, Review
+from .search import build_match_query, offer_fts_available, search_offers
 
 
 class OfferFilter(django_filters.FilterSet):
@@ -22,8 +23,12 @@ class OfferFilter(django_filters.FilterSet):
     
     def filter_search(self, queryset, name, value):
         """Searches for offers with a title or description containing the given value.
+        If the database has the FTS5 offer index, the words of the value are matched as prefixes through the index and the offers are ordered by relevance.
+        Otherwise, or if the value contains no words, it falls back to a case-insensitive substring search.
         If no value is given, returns the unfiltered queryset."""
         if value:
+            if offer_fts_available(queryset.db) and build_match_query(value):
+                return search_offers(queryset, value)
             return queryset.filter(Q(title__icontains=value) | Q(description__icontains=value))
         return queryset
     
@@ -64,6 +69,25 @@ class OfferFilter(django_filters.FilterSet):
         return queryset
     
     
+class OrderFilter(django_filters.FilterSet):
+    """Filters the orders of the requesting user by `status` and by the ranges `created_at_after`/`created_at_before` and `updated_at_after`/`updated_at_before`.
+    The range bounds are inclusive ISO 8601 datetimes, e.g. `?status=in_progress&created_at_after=2025-01-01T00:00:00Z`. An unknown status or an invalid datetime returns a 400 BAD REQUEST."""
+    status = django_filters.ChoiceFilter(choices=Order._meta.get_field('status').choices, required=False)
+    created_at = django_filters.IsoDateTimeFromToRangeFilter(required=False)
+    updated_at = django_filters.IsoDateTimeFromToRangeFilter(required=False)
+
+    class Meta:
+        model = Order
+        fields = ['status', 'created_at', 'updated_at']
+
+
+class ArchivedOrderFilter(OrderFilter):
+    """Filters the archived orders of the requesting user with the same parameters as `OrderFilter`."""
+
+    class Meta(OrderFilter.Meta):
+        model = ArchivedOrder
+
+
 class ReviewFilter(django_filters.FilterSet):
     business_user_id = django_filters.NumberFilter(field_name='business_user', required=False)
     reviewer_id = django_filters.NumberFilter(field_name='reviewer', required=False)
@@ -0,0 +1,33 @@
+import datetime
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from CoderrBackend_app.models import ArchivedOrder
+
+
+class Command(BaseCommand):
+    help = ("Moves completed and cancelled orders that were last updated more than --older-than-days ago from the order table into the archive table, "
+            "--batch-size orders per transaction. With --interval the archival is repeated every given number of seconds until the command is stopped.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=settings.ORDER_ARCHIVE_AFTER_DAYS, help='Minimum age in days since the last update of the archived orders.')
+        parser.add_argument('--batch-size', type=int, default=settings.ORDER_ARCHIVE_BATCH_SIZE, help='Number of orders moved per transaction.')
+        parser.add_argument('--interval', type=int, default=0, help='Seconds between two runs. Runs once if not given.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        try:
+            while True:
+                self.archive(options['older_than_days'], options['batch_size'])
+                if not options['interval']:
+                    return
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Archiving stopped.")
+
+    def archive(self, older_than_days, batch_size):
+        cutoff = timezone.now() - datetime.timedelta(days=older_than_days)
+        count = sum(ArchivedOrder.archive(cutoff, batch_size))
+        self.stdout.write(self.style.SUCCESS(f"Archived {count} orders last updated before {cutoff.isoformat()}."))
@@ -0,0 +1,57 @@
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from CoderrBackend_app.api.serializers import OfferSerializer, OfferListSerializer
+from CoderrBackend_app.models import Offer, OfferDetail
+
+
+class Command(BaseCommand):
+    help = ("Micro-benchmark of the per-row cost of loading and serializing the offer list: the full OfferSerializer with the nested details replaced by links "
+            "(the previous list path) against OfferListSerializer on .values() rows. The benchmark data is created in a transaction that is rolled back.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Number of offers to serialize.')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of runs per path, the fastest run is reported.')
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        with transaction.atomic():
+            self.create_offers(rows)
+            queryset = Offer.objects.filter(title__startswith='Benchmark offer').order_by('id')
+            full = self.measure(repeat, lambda: self.serialize_full(list(queryset.select_related('user').prefetch_related('details'))))
+            light = self.measure(repeat, lambda: self.serialize_light(list(OfferListSerializer.get_rows(queryset))))
+            transaction.set_rollback(True)
+        self.report('OfferSerializer (before)', full, rows)
+        self.report('OfferListSerializer (after)', light, rows)
+        self.stdout.write(f"speed-up: {full / light:.1f}x")
+
+    def create_offers(self, rows):
+        user = User.objects.create(username='benchmark_offer_list', first_name='Bench', last_name='Mark')
+        offers = Offer.objects.bulk_create(
+            Offer(user=user, title=f'Benchmark offer {index}', description='Benchmark', min_price=50, min_delivery_time=2) for index in range(rows))
+        OfferDetail.objects.bulk_create(
+            OfferDetail(offer=offer, title=offer_type, revisions=1, delivery_time_in_days=2, price=50, features=['a', 'b'], offer_type=offer_type)
+            for offer in offers for offer_type in ('basic', 'standard', 'premium'))
+
+    def serialize_full(self, offers):
+        data = []
+        for offer in offers:
+            offer_data = OfferSerializer(offer).data
+            offer_data['details'] = [{"id": detail.id, "url": f"/offerdetails/{detail.id}/"} for detail in offer.details.all()]
+            data.append(offer_data)
+        return data
+
+    def serialize_light(self, rows):
+        return OfferListSerializer(OfferListSerializer.attach_details(rows), many=True).data
+
+    def measure(self, repeat, serialize):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            serialize()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def report(self, label, seconds, rows):
+        self.stdout.write(f"{label:<30} {seconds * 1000:8.1f} ms total  {seconds / rows * 1e6:8.1f} us/row")
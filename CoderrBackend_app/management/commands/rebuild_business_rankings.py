@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from CoderrBackend_app.models import BusinessRanking
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the leaderboard score of every business profile from the business ratings and order counters. rebuild_business_ratings and rebuild_order_counters run it as well. Run it on its own after changing the ranking settings."
+
+    def handle(self, *args, **options):
+        count = BusinessRanking.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the rankings of {count} business users."))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from CoderrBackend_app.models import BusinessRating
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the review count, rating sum and rating histogram of every business profile from the reviews with a single GROUP BY query, and the business rankings from them."
+
+    def handle(self, *args, **options):
+        count = BusinessRating.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the ratings of {count} business users."))
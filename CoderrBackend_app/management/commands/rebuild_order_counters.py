@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from CoderrBackend_app.models import BusinessOrderCounter
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the per-business order counters (in_progress, completed, cancelled) from the orders and archived orders with one GROUP BY query per table, and the business rankings from them."
+
+    def handle(self, *args, **options):
+        count = BusinessOrderCounter.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the order counters of {count} business users."))
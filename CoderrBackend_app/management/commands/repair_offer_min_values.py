@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from CoderrBackend_app.cache import invalidate_offer_catalogue
+from CoderrBackend_app.models import Offer
+
+
+class Command(BaseCommand):
+    help = "Recomputes min_price and min_delivery_time of every offer (or of the given offers) from their details with a single UPDATE statement."
+
+    def add_arguments(self, parser):
+        parser.add_argument('offer_ids', nargs='*', type=int, help='IDs of the offers to repair. All offers are repaired if none are given.')
+
+    def handle(self, *args, **options):
+        offers = Offer.objects.all()
+        if options['offer_ids']:
+            offers = offers.filter(pk__in=options['offer_ids'])
+        count = offers.refresh_min_values()
+        invalidate_offer_catalogue()
+        self.stdout.write(self.style.SUCCESS(f"Repaired the minimum values of {count} offers."))
@@ -0,0 +1,13 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from CoderrBackend_app.cache import PLATFORM_STATISTICS_CACHE_KEY
+from CoderrBackend_app.models import PlatformStatistics
+
+
+class Command(BaseCommand):
+    help = "Recomputes the platform statistics of the base-info endpoint (review count, rating sum, business profile count, offer count) from the reviews, profiles and offers."
+
+    def handle(self, *args, **options):
+        statistics = PlatformStatistics.recompute()
+        cache.delete(PLATFORM_STATISTICS_CACHE_KEY)
+        self.stdout.write(self.style.SUCCESS(f"Repaired the platform statistics: {statistics.as_data()}."))
@@ -0,0 +1,59 @@
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# The triggers belong to the offer table. A later migration that makes Django's SQLite
+# schema editor rebuild that table (e.g. AlterField on Offer) drops them and must create them again.
+CREATE_STATEMENTS = [
+    """CREATE VIRTUAL TABLE "CoderrBackend_app_offer_fts" USING fts5(title, description, tokenize = 'unicode61 remove_diacritics 2')""",
+    """INSERT INTO "CoderrBackend_app_offer_fts" (rowid, title, description) SELECT id, title, description FROM "CoderrBackend_app_offer\"""",
+    """CREATE TRIGGER "CoderrBackend_app_offer_fts_insert" AFTER INSERT ON "CoderrBackend_app_offer" BEGIN
+        INSERT INTO "CoderrBackend_app_offer_fts" (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER "CoderrBackend_app_offer_fts_update" AFTER UPDATE OF title, description ON "CoderrBackend_app_offer" BEGIN
+        DELETE FROM "CoderrBackend_app_offer_fts" WHERE rowid = old.id;
+        INSERT INTO "CoderrBackend_app_offer_fts" (rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER "CoderrBackend_app_offer_fts_delete" AFTER DELETE ON "CoderrBackend_app_offer" BEGIN
+        DELETE FROM "CoderrBackend_app_offer_fts" WHERE rowid = old.id;
+    END""",
+]
+
+DROP_STATEMENTS = [
+    'DROP TRIGGER IF EXISTS "CoderrBackend_app_offer_fts_insert"',
+    'DROP TRIGGER IF EXISTS "CoderrBackend_app_offer_fts_update"',
+    'DROP TRIGGER IF EXISTS "CoderrBackend_app_offer_fts_delete"',
+    'DROP TABLE IF EXISTS "CoderrBackend_app_offer_fts"',
+]
+
+
+def create_offer_fts(apps, schema_editor):
+    """Creates the FTS5 shadow table over Offer.title/description and the triggers keeping it in sync.
+    Databases other than SQLite, or SQLite builds without FTS5, are left unchanged; OfferFilter then falls back to `icontains`."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(CREATE_STATEMENTS[0])
+        except OperationalError:
+            return
+        for statement in CREATE_STATEMENTS[1:]:
+            cursor.execute(statement)
+
+
+def drop_offer_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in DROP_STATEMENTS:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0011_alter_offer_min_delivery_time'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_offer_fts, drop_offer_fts),
+    ]
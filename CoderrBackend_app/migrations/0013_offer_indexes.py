@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0012_offer_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['user', 'updated_at'], name='offer_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['user', 'min_price'], name='offer_user_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['updated_at'], name='offer_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['min_price'], name='offer_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['min_delivery_time', 'min_price'], name='offer_delivery_price_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+STATUSES = ('in_progress', 'completed', 'cancelled')
+
+
+def count_existing_orders(apps, schema_editor):
+    Order = apps.get_model('CoderrBackend_app', 'Order')
+    BusinessOrderCounter = apps.get_model('CoderrBackend_app', 'BusinessOrderCounter')
+    counts = {}
+    rows = Order.objects.filter(status__in=STATUSES).order_by().values_list('business_user_id', 'status').annotate(count=Count('id'))
+    for business_user_id, status, count in rows:
+        counts.setdefault(business_user_id, dict.fromkeys(STATUSES, 0))[status] = count
+    BusinessOrderCounter.objects.bulk_create(BusinessOrderCounter(business_user_id=business_user_id, **values) for business_user_id, values in counts.items())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0014_offerdetail_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessOrderCounter',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_counter', serialize=False, to='CoderrBackend_app.userprofile')),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(count_existing_orders, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0015_business_order_counter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['business_user', 'status'], name='order_business_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['business_user', 'created_at'], name='order_business_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['customer_user', 'created_at'], name='order_customer_created_idx'),
+        ),
+    ]
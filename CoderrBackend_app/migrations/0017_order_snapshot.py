@@ -0,0 +1,74 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SNAPSHOT_FIELDS = ('title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type')
+BATCH_SIZE = 1000
+
+
+def copy_offer_details(apps, schema_editor):
+    Order = apps.get_model('CoderrBackend_app', 'Order')
+    orders = Order.objects.filter(offer_detail__isnull=False, title__isnull=True).select_related('offer_detail').order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(orders.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            break
+        for order in batch:
+            for field in SNAPSHOT_FIELDS:
+                setattr(order, field, getattr(order.offer_detail, field))
+        Order.objects.bulk_update(batch, SNAPSHOT_FIELDS)
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0016_order_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='business_user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='business_orders', to='CoderrBackend_app.userprofile'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='customer_user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='customer_orders', to='CoderrBackend_app.userprofile'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='delivery_time_in_days',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='features',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='offer_type',
+            field=models.CharField(blank=True, choices=[('basic', 'Basic'), ('standard', 'Standard'), ('premium', 'Premium')], max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='revisions',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='title',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+        migrations.RunPython(copy_offer_details, migrations.RunPython.noop),
+    ]
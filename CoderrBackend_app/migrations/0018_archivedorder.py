@@ -0,0 +1,36 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0017_order_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('offer_detail_id', models.IntegerField(blank=True, null=True)),
+                ('title', models.CharField(blank=True, max_length=100, null=True)),
+                ('revisions', models.IntegerField(blank=True, null=True)),
+                ('delivery_time_in_days', models.IntegerField(blank=True, null=True)),
+                ('price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('features', models.JSONField(blank=True, null=True)),
+                ('offer_type', models.CharField(blank=True, choices=[('basic', 'Basic'), ('standard', 'Standard'), ('premium', 'Premium')], max_length=20, null=True)),
+                ('status', models.CharField(choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('business_user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_business_orders', to='CoderrBackend_app.userprofile')),
+                ('customer_user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_customer_orders', to='CoderrBackend_app.userprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['business_user', 'created_at'], name='archived_business_created_idx'), models.Index(fields=['customer_user', 'created_at'], name='archived_customer_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:45
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+
+def compute_statistics(apps, schema_editor):
+    PlatformStatistics = apps.get_model('CoderrBackend_app', 'PlatformStatistics')
+    Review = apps.get_model('CoderrBackend_app', 'Review')
+    UserProfile = apps.get_model('CoderrBackend_app', 'UserProfile')
+    Offer = apps.get_model('CoderrBackend_app', 'Offer')
+    reviews = Review.objects.aggregate(review_count=Count('id'), rating_sum=Coalesce(Sum('rating'), 0))
+    PlatformStatistics.objects.create(pk=1, business_profile_count=UserProfile.objects.filter(type="business").count(), offer_count=Offer.objects.count(), **reviews)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0018_archivedorder'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.BigIntegerField(default=0)),
+                ('business_profile_count', models.IntegerField(default=0)),
+                ('offer_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(compute_statistics, migrations.RunPython.noop),
+    ]
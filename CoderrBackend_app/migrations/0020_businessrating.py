@@ -0,0 +1,39 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+def count_existing_reviews(apps, schema_editor):
+    Review = apps.get_model('CoderrBackend_app', 'Review')
+    BusinessRating = apps.get_model('CoderrBackend_app', 'BusinessRating')
+    aggregates = {"review_count": Count('id'), "rating_sum": Coalesce(Sum('rating'), 0)}
+    aggregates.update({f"rating_{rating}": Count('id', filter=Q(rating=rating)) for rating in range(1, 6)})
+    rows = Review.objects.order_by().values('business_user').annotate(**aggregates)
+    BusinessRating.objects.bulk_create(BusinessRating(business_user_id=row.pop('business_user'), **row) for row in rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0019_platformstatistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRating',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating', serialize=False, to='CoderrBackend_app.userprofile')),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.BigIntegerField(default=0)),
+                ('rating_1', models.IntegerField(default=0)),
+                ('rating_2', models.IntegerField(default=0)),
+                ('rating_3', models.IntegerField(default=0)),
+                ('rating_4', models.IntegerField(default=0)),
+                ('rating_5', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(count_existing_reviews, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.6 on 2026-10-18 13:55
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+
+def remove_duplicate_reviews(apps, schema_editor):
+    """Keeps the most recently updated review of every reviewer and business user and deletes the others,
+    then recounts the BusinessRating of the affected business users and the PlatformStatistics row."""
+    Review = apps.get_model('CoderrBackend_app', 'Review')
+    BusinessRating = apps.get_model('CoderrBackend_app', 'BusinessRating')
+    PlatformStatistics = apps.get_model('CoderrBackend_app', 'PlatformStatistics')
+    duplicates = Review.objects.order_by().values('reviewer', 'business_user').annotate(count=Count('id')).filter(count__gt=1)
+    affected = set()
+    for duplicate in duplicates:
+        reviews = Review.objects.filter(reviewer=duplicate['reviewer'], business_user=duplicate['business_user']).order_by('-updated_at', '-id')
+        Review.objects.filter(pk__in=list(reviews.values_list('pk', flat=True)[1:])).delete()
+        affected.add(duplicate['business_user'])
+    if not affected:
+        return
+    aggregates = {"review_count": Count('id'), "rating_sum": Coalesce(Sum('rating'), 0)}
+    aggregates.update({f"rating_{rating}": Count('id', filter=Q(rating=rating)) for rating in range(1, 6)})
+    for row in Review.objects.filter(business_user__in=affected).order_by().values('business_user').annotate(**aggregates):
+        BusinessRating.objects.update_or_create(business_user_id=row.pop('business_user'), defaults=row)
+    PlatformStatistics.objects.filter(pk=1).update(**Review.objects.aggregate(review_count=Count('id'), rating_sum=Coalesce(Sum('rating'), 0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0020_businessrating'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('reviewer', 'business_user'), name='review_unique_reviewer_business'),
+        ),
+    ]
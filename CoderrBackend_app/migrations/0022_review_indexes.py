@@ -0,0 +1,38 @@
+# Generated by Django 5.1.6 on 2026-10-18 14:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0021_review_unique_reviewer_business'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['business_user', 'updated_at'], name='review_business_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['business_user', 'rating'], name='review_business_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['reviewer', 'updated_at'], name='review_reviewer_updated_idx'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='business_user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='CoderrBackend_app.userprofile'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='reviewer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-18 14:16
+
+import math
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def rank_existing_businesses(apps, schema_editor):
+    BusinessRating = apps.get_model('CoderrBackend_app', 'BusinessRating')
+    BusinessOrderCounter = apps.get_model('CoderrBackend_app', 'BusinessOrderCounter')
+    BusinessRanking = apps.get_model('CoderrBackend_app', 'BusinessRanking')
+    ratings = dict((row[0], row[1:]) for row in BusinessRating.objects.filter(business_user__type="business").values_list('business_user_id', 'review_count', 'rating_sum'))
+    completed = dict(BusinessOrderCounter.objects.filter(business_user__type="business").values_list('business_user_id', 'completed'))
+    prior_rating, prior_weight = settings.BUSINESS_RANKING_PRIOR_RATING, settings.BUSINESS_RANKING_PRIOR_WEIGHT
+    rankings = []
+    for business_user_id in ratings.keys() | completed.keys():
+        review_count, rating_sum = ratings.get(business_user_id, (0, 0))
+        completed_orders = completed.get(business_user_id, 0)
+        bayesian_rating = (prior_weight * prior_rating + rating_sum) / (prior_weight + review_count) if prior_weight + review_count else prior_rating
+        rankings.append(BusinessRanking(business_user_id=business_user_id, review_count=review_count, bayesian_rating=bayesian_rating, completed_orders=completed_orders,
+                                        score=bayesian_rating + settings.BUSINESS_RANKING_ORDER_WEIGHT * math.log1p(max(completed_orders, 0))))
+    BusinessRanking.objects.bulk_create(rankings)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0022_review_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRanking',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='CoderrBackend_app.userprofile')),
+                ('review_count', models.IntegerField(default=0)),
+                ('bayesian_rating', models.FloatField(default=0)),
+                ('completed_orders', models.IntegerField(default=0)),
+                ('score', models.FloatField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-score', 'business_user'], name='ranking_score_idx')],
+            },
+        ),
+        migrations.RunPython(rank_existing_businesses, migrations.RunPython.noop),
+    ]
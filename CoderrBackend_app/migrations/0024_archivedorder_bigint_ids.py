@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('CoderrBackend_app', '0023_businessranking'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedorder',
+            name='id',
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='archivedorder',
+            name='offer_detail_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
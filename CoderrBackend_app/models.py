@@ -1,7 +1,27 @@
-from django.db import models
+import datetime
+import hashlib
+import math
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.db.models import Count, F, Min, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import RegexValidator
+from django.utils import timezone
+
+
+def lock_counted_state(instance, fields, update_fields=None):
+    """Locks the row of an order or review that is about to be updated with `select_for_update()` and reloads its `counted_state` from the given fields,
+    so the signals compute their counter deltas from the row as it is at write time and not as it was read. Two concurrent updates of the same row are serialized:
+    the second one moves the row away from the state the first one wrote. Skipped for new rows, rows with an unknown state (their counters are recounted)
+    and saves whose `update_fields` contain none of the counted fields. Has to run inside the transaction of the save."""
+    if instance._state.adding or instance.counted_state is None:
+        return
+    if update_fields is not None and not {field.removesuffix('_id') for field in fields} & {field.removesuffix('_id') for field in update_fields}:
+        return
+    instance.counted_state = type(instance)._base_manager.select_for_update().filter(pk=instance.pk).values_list(*fields).first()
 
 
 class UserProfile(models.Model):
@@ -13,7 +33,17 @@ class UserProfile(models.Model):
     description = models.TextField(null=False, blank=True, default="")
     working_hours = models.CharField(max_length=50, null=False, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
+    counted_type = None
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remembers the type as read from the database, so the profile signals can update the business profile count of PlatformStatistics when it changes."""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if loaded.get('type', models.DEFERRED) is not models.DEFERRED:
+            instance.counted_type = loaded['type']
+        return instance
+
 
     def __str__(self):
         return self.user.username
@@ -31,6 +61,16 @@ class UserProfile(models.Model):
             super().save(*args, **kwargs)
 
 
+class OfferQuerySet(models.QuerySet):
+    def refresh_min_values(self):
+        """Recomputes `min_price` and `min_delivery_time` of all offers in the queryset from their details with a single UPDATE statement.
+        Offers without details get a minimum price of 0 and no minimum delivery time. Returns the number of updated offers."""
+        details = OfferDetail.objects.filter(offer=OuterRef('pk')).order_by().values('offer')
+        return self.update(
+            min_price=Coalesce(Subquery(details.annotate(value=Min('price')).values('value')), Value(0), output_field=models.DecimalField()),
+            min_delivery_time=Subquery(details.annotate(value=Min('delivery_time_in_days')).values('value')))
+
+
 class Offer(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     title = models.CharField(max_length=100)
@@ -40,9 +80,25 @@ class Offer(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=False)
     min_delivery_time = models.IntegerField(null=True, blank=True)   
+
+    objects = OfferQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'updated_at'], name='offer_user_updated_idx'),
+            models.Index(fields=['user', 'min_price'], name='offer_user_price_idx'),
+            models.Index(fields=['updated_at'], name='offer_updated_idx'),
+            models.Index(fields=['min_price'], name='offer_price_idx'),
+            models.Index(fields=['min_delivery_time', 'min_price'], name='offer_delivery_price_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.user.username}"
+
+    def refresh_min_values(self):
+        """Recomputes `min_price` and `min_delivery_time` from the offer's details in the database and reloads both fields on this instance."""
+        Offer.objects.filter(pk=self.pk).refresh_min_values()
+        self.refresh_from_db(fields=['min_price', 'min_delivery_time'])
     
 class OfferDetail(models.Model):   
     offer = models.ForeignKey(Offer, related_name='details', on_delete=models.CASCADE)
@@ -52,39 +108,441 @@ class OfferDetail(models.Model):
     price  = models.DecimalField(max_digits=10, decimal_places=2)
     features = models.JSONField() 
     offer_type = models.CharField(max_length=20, choices=[('basic', 'Basic'), ('standard', 'Standard'), ('premium', 'Premium')])
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.offer.title} - {self.title}"
     
 class Order(models.Model):
-    customer_user = models.ForeignKey(UserProfile, related_name="customer_orders", on_delete=models.CASCADE)
-    business_user = models.ForeignKey(UserProfile, related_name="business_orders", on_delete=models.CASCADE)
+    customer_user = models.ForeignKey(UserProfile, related_name="customer_orders", on_delete=models.CASCADE, db_index=False)
+    business_user = models.ForeignKey(UserProfile, related_name="business_orders", on_delete=models.CASCADE, db_index=False)
     offer_detail = models.ForeignKey(OfferDetail, related_name="orders", on_delete=models.CASCADE, null=True, blank=True) 
+    title = models.CharField(max_length=100, null=True, blank=True)
+    revisions = models.IntegerField(null=True, blank=True)
+    delivery_time_in_days = models.IntegerField(null=True, blank=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    features = models.JSONField(null=True, blank=True)
+    offer_type = models.CharField(max_length=20, choices=[('basic', 'Basic'), ('standard', 'Standard'), ('premium', 'Premium')], null=True, blank=True)
     status = models.CharField(max_length=20, choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')])
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    counted_state = None
+    SNAPSHOT_FIELDS = ('title', 'revisions', 'delivery_time_in_days', 'price', 'features', 'offer_type')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'status'], name='order_business_status_idx'),
+            models.Index(fields=['business_user', 'created_at'], name='order_business_created_idx'),
+            models.Index(fields=['customer_user', 'created_at'], name='order_customer_created_idx'),
+        ]
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remembers the business user and status as read from the database, so the order signals can move the order between the BusinessOrderCounter columns when they change.
+        `save` reloads them under a row lock before writing (see `lock_counted_state`)."""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if loaded.get('business_user_id', models.DEFERRED) is not models.DEFERRED and loaded.get('status', models.DEFERRED) is not models.DEFERRED:
+            instance.counted_state = (loaded['business_user_id'], loaded['status'])
+        return instance
     
     def save(self, *args, **kwargs):
         if not self.customer_user and hasattr(self, 'request') and self.request.user.is_authenticated:
             self.customer_user = self.request.user.profile 
         if not self.business_user and self.offer_detail:
             self.business_user = self.offer_detail.offer.user  
-        super().save(*args, **kwargs)
+        if self._state.adding and self.offer_detail_id and self.title is None:
+            self.copy_offer_detail(self.offer_detail)
+        with transaction.atomic():
+            lock_counted_state(self, ('business_user_id', 'status'), kwargs.get('update_fields'))
+            super().save(*args, **kwargs)
+
+    def copy_offer_detail(self, offer_detail):
+        """Copies the title, revisions, delivery time, price, features and offer type of the ordered offer detail onto the order. The order keeps these values
+        when the offer detail is edited later, and the order list is read from the order table alone."""
+        for field in self.SNAPSHOT_FIELDS:
+            setattr(self, field, getattr(offer_detail, field))
     
     def __str__(self):
-       return f"Order: {self.offer_detail.title} - {self.customer_user}"
+       return f"Order: {self.title} - {self.customer_user}"
+
+
+class OrderIdempotencyKey(models.Model):
+    """`Idempotency-Key` of an order creation, stored with the offer_detail_id it was used for (`fingerprint`) and the response of the created order.
+    The key is written in the transaction that creates the order and is unique per user, so of two concurrent requests with the same key only one can create an order,
+    whatever the number of worker processes. Keys older than `ORDER_IDEMPOTENCY_TIMEOUT` seconds are treated as unused and removed when the user stores the next key."""
+    user = models.ForeignKey(User, related_name="order_idempotency_keys", on_delete=models.CASCADE, db_index=False)
+    key_digest = models.CharField(max_length=32)
+    fingerprint = models.TextField()
+    response = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key_digest'], name='order_idempotency_unique_user_key'),
+        ]
+
+    @staticmethod
+    def digest(idempotency_key):
+        return hashlib.md5(idempotency_key.encode()).hexdigest()
+
+    @staticmethod
+    def expiry_cutoff():
+        return timezone.now() - datetime.timedelta(seconds=settings.ORDER_IDEMPOTENCY_TIMEOUT)
+
+    @classmethod
+    def lookup(cls, user, idempotency_key):
+        """Returns the stored key of the user that has not expired yet, or None."""
+        return cls.objects.filter(user=user, key_digest=cls.digest(idempotency_key), created_at__gte=cls.expiry_cutoff()).first()
+
+    @classmethod
+    def store(cls, user, idempotency_key, fingerprint, response):
+        """Stores the key with the response of the created order after removing the expired keys of the user. Has to run inside the transaction that creates the order:
+        if another request stored the same key first, the unique constraint raises `IntegrityError` and the order is rolled back with it."""
+        cls.objects.filter(user=user, created_at__lt=cls.expiry_cutoff()).delete()
+        return cls.objects.create(user=user, key_digest=cls.digest(idempotency_key), fingerprint=fingerprint, response=response)
   
  
     
+class ArchivedOrder(models.Model):
+    """Completed or cancelled order that was moved out of the `Order` table by `manage.py archive_orders`. It keeps the ID and the copied offer detail values of the order
+    and is still counted in the BusinessOrderCounter of its business user until it is deleted, e.g. together with its customer profile. Archived orders are read-only."""
+    ARCHIVED_STATUSES = ('completed', 'cancelled')
+    COPIED_FIELDS = ('id', 'customer_user_id', 'business_user_id', 'offer_detail_id', *Order.SNAPSHOT_FIELDS, 'status', 'created_at', 'updated_at')
+    id = models.BigIntegerField(primary_key=True)
+    customer_user = models.ForeignKey(UserProfile, related_name="archived_customer_orders", on_delete=models.CASCADE, db_index=False)
+    business_user = models.ForeignKey(UserProfile, related_name="archived_business_orders", on_delete=models.CASCADE, db_index=False)
+    offer_detail_id = models.BigIntegerField(null=True, blank=True)
+    title = models.CharField(max_length=100, null=True, blank=True)
+    revisions = models.IntegerField(null=True, blank=True)
+    delivery_time_in_days = models.IntegerField(null=True, blank=True)
+    price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    features = models.JSONField(null=True, blank=True)
+    offer_type = models.CharField(max_length=20, choices=[('basic', 'Basic'), ('standard', 'Standard'), ('premium', 'Premium')], null=True, blank=True)
+    status = models.CharField(max_length=20, choices=[('in_progress', 'In Progress'), ('completed', 'Completed'), ('cancelled', 'Cancelled')])
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_user', 'created_at'], name='archived_business_created_idx'),
+            models.Index(fields=['customer_user', 'created_at'], name='archived_customer_created_idx'),
+        ]
+
+    @classmethod
+    def archive(cls, cutoff, batch_size):
+        """Moves the completed and cancelled orders last updated before `cutoff` into the archive, walking the order table by primary key.
+        Every batch of at most `batch_size` orders is copied with one `bulk_create` and removed with one `DELETE` inside its own transaction, and the number of archived orders is yielded.
+        The orders are deleted with a plain SQL `DELETE` (see `delete_orders`) and not with `QuerySet.delete()`, so no `post_delete` signal is sent
+        and the counters of their business users keep counting them."""
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                orders = list(Order.objects.select_for_update().filter(pk__gt=last_pk, status__in=cls.ARCHIVED_STATUSES, updated_at__lt=cutoff).order_by('pk')[:batch_size])
+                if not orders:
+                    return
+                cls.objects.bulk_create(cls(**{field: getattr(order, field) for field in cls.COPIED_FIELDS}) for order in orders)
+                cls.delete_orders([order.pk for order in orders])
+            last_pk = orders[-1].pk
+            yield len(orders)
+
+    @staticmethod
+    def delete_orders(order_ids):
+        """Deletes the orders with the given IDs with one SQL `DELETE`, without collecting related objects or sending signals. No other table references orders."""
+        connection = connections[Order.objects.db]
+        table, column = connection.ops.quote_name(Order._meta.db_table), connection.ops.quote_name(Order._meta.pk.column)
+        placeholders = ', '.join(['%s'] * len(order_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders})", order_ids)
+
+    def __str__(self):
+        return f"Archived order: {self.title} - {self.customer_user_id}"
+
+
+class BusinessOrderCounter(models.Model):
+    """Number of orders per status of a business profile. The counters are updated with `F()` expressions by the order signals in `signals.py`
+    and can be rebuilt from the orders with `manage.py rebuild_order_counters`. Orders changed with `QuerySet.update()` bypass the signals and have to adjust the counters themselves.
+    Archived orders (see ArchivedOrder) are still counted. A change of the completed orders refreshes the BusinessRanking of the business user, a rebuild rebuilds all rankings."""
+    STATUSES = ('in_progress', 'completed', 'cancelled')
+    business_user = models.OneToOneField(UserProfile, primary_key=True, related_name="order_counter", on_delete=models.CASCADE)
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+
+    @classmethod
+    def apply(cls, business_user_id, deltas):
+        """Adds the given per-status deltas to the counters of a business user in a single UPDATE. If the business user has no counters yet and an order was added,
+        the counters are counted from the orders instead. A missing row is never created for a decrement only, e.g. while the business profile itself is deleted."""
+        deltas = {status: delta for status, delta in deltas.items() if status in cls.STATUSES and delta}
+        if not deltas:
+            return
+        updated = cls.objects.filter(business_user_id=business_user_id).update(**{status: F(status) + delta for status, delta in deltas.items()})
+        if not updated and any(delta > 0 for delta in deltas.values()):
+            cls.recount(business_user_id)
+        elif updated and 'completed' in deltas:
+            BusinessRanking.refresh(business_user_id, create=deltas['completed'] > 0)
+
+    @classmethod
+    def count_orders(cls, orders, counts=None):
+        """Adds the per-status counts of the given orders or archived orders to `counts` with a single GROUP BY query and returns {business_user_id: {status: count}}."""
+        counts = {} if counts is None else counts
+        rows = orders.filter(status__in=cls.STATUSES).order_by().values_list('business_user_id', 'status').annotate(count=Count('id'))
+        for business_user_id, status, count in rows:
+            counts.setdefault(business_user_id, dict.fromkeys(cls.STATUSES, 0))[status] += count
+        return counts
+
+    @classmethod
+    def recount(cls, business_user_id):
+        counts = cls.count_orders(Order.objects.filter(business_user_id=business_user_id))
+        counts = cls.count_orders(ArchivedOrder.objects.filter(business_user_id=business_user_id), counts).get(business_user_id, dict.fromkeys(cls.STATUSES, 0))
+        cls.objects.update_or_create(business_user_id=business_user_id, defaults=counts)
+        BusinessRanking.refresh(business_user_id)
+
+    @classmethod
+    def rebuild(cls):
+        """Replaces all counters with the counts of the orders and archived orders and rebuilds the rankings from them. Returns the number of business users with counters."""
+        counts = cls.count_orders(ArchivedOrder.objects.all(), cls.count_orders(Order.objects.all()))
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(cls(business_user_id=business_user_id, **values) for business_user_id, values in counts.items())
+            BusinessRanking.rebuild()
+        return len(counts)
+
+    @classmethod
+    def get_counts(cls, business_user_id):
+        """Returns the counters of a business user as a dict with one primary key lookup. A profile without counters has no orders yet and gets zeros.
+        Returns None if the profile does not exist."""
+        counts = cls.objects.filter(business_user_id=business_user_id).values(*cls.STATUSES).first()
+        if counts is None:
+            if not UserProfile.objects.filter(pk=business_user_id).exists():
+                return None
+            counts = dict.fromkeys(cls.STATUSES, 0)
+        return counts
+
+    def __str__(self):
+        return f"Order counter: {self.business_user_id}"
+
+
 class Review(models.Model):
-    business_user = models.ForeignKey(UserProfile, related_name="reviews", on_delete=models.CASCADE)
-    reviewer = models.ForeignKey(User, on_delete=models.CASCADE)
+    business_user = models.ForeignKey(UserProfile, related_name="reviews", on_delete=models.CASCADE, db_index=False)
+    reviewer = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
     rating = models.IntegerField()
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)    
     updated_at = models.DateTimeField(auto_now=True)
+    counted_state = None
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['reviewer', 'business_user'], name='review_unique_reviewer_business'),
+        ]
+        indexes = [
+            models.Index(fields=['business_user', 'updated_at'], name='review_business_updated_idx'),
+            models.Index(fields=['business_user', 'rating'], name='review_business_rating_idx'),
+            models.Index(fields=['reviewer', 'updated_at'], name='review_reviewer_updated_idx'),
+        ]
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remembers the business user and rating as read from the database, so the review signals can update PlatformStatistics and the BusinessRating
+        of the previous and the new business user when they change. `save` reloads them under a row lock before writing (see `lock_counted_state`)."""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if loaded.get('business_user_id', models.DEFERRED) is not models.DEFERRED and loaded.get('rating', models.DEFERRED) is not models.DEFERRED:
+            instance.counted_state = (loaded['business_user_id'], loaded['rating'])
+        return instance
+    
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            lock_counted_state(self, ('business_user_id', 'rating'), kwargs.get('update_fields'))
+            super().save(*args, **kwargs)
+
     def can_create(self):
         return self.user.profile.type == "customer"
     def __str__(self):
-        return f"{self.rating} - {self.business_user.user.username}"
\ No newline at end of file
+        return f"{self.rating} - {self.business_user.user.username}"
+
+
+
+class BusinessRating(models.Model):
+    """Review count, rating sum and the number of reviews per rating from 1 to 5 of a business profile. The values are updated with `F()` expressions
+    by the review signals in `signals.py` and can be rebuilt from the reviews with `manage.py rebuild_business_ratings`. Ratings outside 1 to 5 are only part of the count and sum.
+    Every change refreshes the BusinessRanking of the business user, a rebuild rebuilds all rankings."""
+    RATINGS = range(1, 6)
+    business_user = models.OneToOneField(UserProfile, primary_key=True, related_name="rating", on_delete=models.CASCADE)
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.BigIntegerField(default=0)
+    rating_1 = models.IntegerField(default=0)
+    rating_2 = models.IntegerField(default=0)
+    rating_3 = models.IntegerField(default=0)
+    rating_4 = models.IntegerField(default=0)
+    rating_5 = models.IntegerField(default=0)
+
+    @classmethod
+    def review_deltas(cls, rating, sign=1):
+        """Returns the deltas of adding (`sign=1`) or removing (`sign=-1`) one review with the given rating."""
+        deltas = {"review_count": sign, "rating_sum": sign * rating}
+        if rating in cls.RATINGS:
+            deltas[f"rating_{rating}"] = sign
+        return deltas
+
+    @classmethod
+    def apply(cls, business_user_id, deltas):
+        """Adds the given deltas to the rating of a business user in a single UPDATE. If the business user has no rating yet and a review was added,
+        the rating is counted from the reviews instead. A missing row is never created for a removal only, e.g. while the business profile itself is deleted."""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        updated = cls.objects.filter(business_user_id=business_user_id).update(**{field: F(field) + delta for field, delta in deltas.items()})
+        if not updated and deltas.get("review_count", 0) > 0:
+            cls.recount(business_user_id)
+        elif updated:
+            BusinessRanking.refresh(business_user_id, create=any(delta > 0 for delta in deltas.values()))
+
+    @classmethod
+    def count_reviews(cls, reviews):
+        """Returns {business_user_id: values} for the given reviews with a single GROUP BY query."""
+        aggregates = {"review_count": Count('id'), "rating_sum": Coalesce(Sum('rating'), 0)}
+        aggregates.update({f"rating_{rating}": Count('id', filter=Q(rating=rating)) for rating in cls.RATINGS})
+        return {row.pop('business_user'): row for row in reviews.order_by().values('business_user').annotate(**aggregates)}
+
+    @classmethod
+    def recount(cls, business_user_id):
+        values = cls.count_reviews(Review.objects.filter(business_user_id=business_user_id)).get(business_user_id, {})
+        cls.objects.update_or_create(business_user_id=business_user_id, defaults={field: values.get(field, 0) for field in cls.value_fields()})
+        BusinessRanking.refresh(business_user_id)
+
+    @classmethod
+    def rebuild(cls):
+        """Replaces all ratings with the counts of the reviews and rebuilds the rankings from them. Returns the number of business users with a rating."""
+        counts = cls.count_reviews(Review.objects.all())
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(cls(business_user_id=business_user_id, **values) for business_user_id, values in counts.items())
+            BusinessRanking.rebuild()
+        return len(counts)
+
+    @classmethod
+    def value_fields(cls):
+        return ("review_count", "rating_sum", *(f"rating_{rating}" for rating in cls.RATINGS))
+
+    @property
+    def average_rating(self):
+        return round(self.rating_sum / self.review_count, 1) if self.review_count else None
+
+    @property
+    def histogram(self):
+        return {str(rating): getattr(self, f"rating_{rating}") for rating in self.RATINGS}
+
+    def __str__(self):
+        return f"Business rating: {self.business_user_id}"
+
+class BusinessRanking(models.Model):
+    """Leaderboard score of a business profile, kept in its own table so the leaderboard is read in index order (`ranking_score_idx`) instead of aggregating all reviews and orders.
+    The score is the Bayesian average rating, which pulls the average towards `BUSINESS_RANKING_PRIOR_RATING` as if every business had `BUSINESS_RANKING_PRIOR_WEIGHT` extra reviews,
+    plus `BUSINESS_RANKING_ORDER_WEIGHT` times the natural logarithm of one plus the completed orders. The prior is a fixed setting and not the platform average,
+    so a review or order of one business user never changes the score of another one. The row is refreshed from BusinessRating and BusinessOrderCounter whenever they change
+    and can be rebuilt with `manage.py rebuild_business_rankings`. Only business profiles are ranked: the profile signals drop the row when a profile stops being a business profile,
+    so the leaderboard needs no join filter on the profile type."""
+    business_user = models.OneToOneField(UserProfile, primary_key=True, related_name="ranking", on_delete=models.CASCADE)
+    review_count = models.IntegerField(default=0)
+    bayesian_rating = models.FloatField(default=0)
+    completed_orders = models.IntegerField(default=0)
+    score = models.FloatField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score', 'business_user'], name='ranking_score_idx'),
+        ]
+
+    @classmethod
+    def compute(cls, review_count, rating_sum, completed_orders):
+        """Returns the ranking values of a business user with the given review count, rating sum and number of completed orders."""
+        prior_weight = settings.BUSINESS_RANKING_PRIOR_WEIGHT
+        prior_rating = settings.BUSINESS_RANKING_PRIOR_RATING
+        bayesian_rating = (prior_weight * prior_rating + rating_sum) / (prior_weight + review_count) if prior_weight + review_count else prior_rating
+        return {
+            "review_count": review_count,
+            "bayesian_rating": bayesian_rating,
+            "completed_orders": completed_orders,
+            "score": bayesian_rating + settings.BUSINESS_RANKING_ORDER_WEIGHT * math.log1p(max(completed_orders, 0)),
+        }
+
+    @classmethod
+    def refresh(cls, business_user_id, create=True):
+        """Recomputes the ranking of a business user from its BusinessRating and BusinessOrderCounter with two primary key lookups.
+        A missing row is only created with `create=True` for a business profile with a rating or order counters, so removals (e.g. while the business profile itself is deleted)
+        and reviews or orders of other profiles never create one."""
+        rating = BusinessRating.objects.filter(business_user_id=business_user_id).values('review_count', 'rating_sum').first()
+        completed = BusinessOrderCounter.objects.filter(business_user_id=business_user_id).values_list('completed', flat=True).first()
+        create = create and (rating is not None or completed is not None)
+        rating = rating or {"review_count": 0, "rating_sum": 0}
+        values = cls.compute(rating['review_count'], rating['rating_sum'], completed or 0)
+        if (not cls.objects.filter(business_user_id=business_user_id).update(**values) and create
+                and UserProfile.objects.filter(pk=business_user_id, type="business").exists()):
+            cls.objects.create(business_user_id=business_user_id, **values)
+
+    @classmethod
+    def rebuild(cls):
+        """Replaces all rankings with the values computed from the ratings and order counters of the business profiles. Returns the number of ranked business users."""
+        ratings = dict((row[0], row[1:]) for row in BusinessRating.objects.filter(business_user__type="business").values_list('business_user_id', 'review_count', 'rating_sum'))
+        completed = dict(BusinessOrderCounter.objects.filter(business_user__type="business").values_list('business_user_id', 'completed'))
+        business_user_ids = ratings.keys() | completed.keys()
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(cls(business_user_id=business_user_id, **cls.compute(*ratings.get(business_user_id, (0, 0)), completed.get(business_user_id, 0)))
+                                    for business_user_id in business_user_ids)
+        return len(business_user_ids)
+
+    def __str__(self):
+        return f"Business ranking: {self.business_user_id}"
+
+class PlatformStatistics(models.Model):
+    """Single row (`pk=1`) with the numbers of the public base-info endpoint. The counts and the rating sum are updated with `F()` expressions by the review,
+    offer and profile signals in `signals.py` and can be recomputed with `manage.py repair_platform_statistics`."""
+    SINGLETON_PK = 1
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.BigIntegerField(default=0)
+    business_profile_count = models.IntegerField(default=0)
+    offer_count = models.IntegerField(default=0)
+
+    @classmethod
+    def apply(cls, **deltas):
+        """Adds the given deltas to the statistics in a single UPDATE. If the row does not exist yet, it is recomputed instead."""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        if not cls.objects.filter(pk=cls.SINGLETON_PK).update(**{field: F(field) + delta for field, delta in deltas.items()}):
+            cls.recompute()
+
+    @classmethod
+    def recompute(cls):
+        """Recomputes the statistics from the reviews, business profiles and offers and stores them in the single row. Returns the row."""
+        reviews = Review.objects.aggregate(review_count=Count('id'), rating_sum=Coalesce(Sum('rating'), 0))
+        statistics, _ = cls.objects.update_or_create(pk=cls.SINGLETON_PK, defaults={
+            **reviews,
+            "business_profile_count": UserProfile.objects.filter(type="business").count(),
+            "offer_count": Offer.objects.count(),
+        })
+        return statistics
+
+    @classmethod
+    def load(cls):
+        """Returns the statistics row, read with a single primary key lookup, or recomputes it if it is missing."""
+        return cls.objects.filter(pk=cls.SINGLETON_PK).first() or cls.recompute()
+
+    @property
+    def average_rating(self):
+        return round(self.rating_sum / self.review_count, 1) if self.review_count else "--"
+
+    def as_data(self):
+        return {
+            "review_count": self.review_count,
+            "average_rating": self.average_rating,
+            "business_profile_count": self.business_profile_count,
+            "offer_count": self.offer_count,
+        }
+
+    def __str__(self):
+        return "Platform statistics"
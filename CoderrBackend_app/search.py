@@ -0,0 +1,42 @@
+import re
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+OFFER_FTS_TABLE = 'CoderrBackend_app_offer_fts'
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_fts_tables = {}
+
+
+def offer_fts_available(using='default'):
+    """Returns True if the database behind the alias `using` has the FTS5 offer index created by migration 0012.
+    The answer is looked up once per database and then kept for the lifetime of the process."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    cache_key = (using, str(connection.settings_dict['NAME']))
+    if cache_key not in _fts_tables:
+        _fts_tables[cache_key] = OFFER_FTS_TABLE in connection.introspection.table_names()
+    return _fts_tables[cache_key]
+
+
+def build_match_query(value):
+    """Turns free text from the search box into an FTS5 MATCH expression. Every word becomes a quoted prefix term and all terms must match,
+    so `log des` finds "Logo Design". Returns an empty string if the value contains no words."""
+    return ' '.join(f'"{term}"*' for term in re.findall(r'\w+', value))
+
+
+def search_offers(queryset, value):
+    """Filters the offer queryset through the FTS5 index and orders it by relevance (BM25, title matches weighted higher), best match first.
+    **Args**:
+        - queryset (QuerySet): The offers to search in.
+        - value (str): The search text, see `build_match_query`.
+    **Returns**: - QuerySet: The matching offers annotated with `search_rank` (lower is better)."""
+    match = build_match_query(value)
+    table = queryset.model._meta.db_table
+    matching_ids = RawSQL(f'SELECT rowid FROM "{OFFER_FTS_TABLE}" WHERE "{OFFER_FTS_TABLE}" MATCH %s', (match,))
+    rank = RawSQL(
+        f'SELECT bm25("{OFFER_FTS_TABLE}", {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}) FROM "{OFFER_FTS_TABLE}" '
+        f'WHERE "{OFFER_FTS_TABLE}" MATCH %s AND rowid = "{table}"."id"', (match,))
+    return queryset.filter(id__in=matching_ids).annotate(search_rank=rank).order_by('search_rank', 'id')
@@ -0,0 +1,161 @@
+from collections import Counter
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .api.authentication import token_cache
+from .cache import invalidate_offer_catalogue, invalidate_order_analytics, revoke_user_tokens
+from .models import ArchivedOrder, BusinessOrderCounter, BusinessRanking, BusinessRating, Offer, OfferDetail, Order, PlatformStatistics, Review, UserProfile
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def offer_catalogue_changed(sender, **kwargs):
+    """Invalidates the cached offer responses whenever an offer or one of its details is saved or deleted."""
+    invalidate_offer_catalogue()
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def offer_detail_changed(sender, instance, **kwargs):
+    """Keeps `min_price` and `min_delivery_time` of the offer in sync whenever one of its details is saved or deleted."""
+    Offer.objects.filter(pk=instance.offer_id).refresh_min_values()
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    """Drops a deleted token from the authentication cache of this process and revokes the cached tokens of its user in the other processes."""
+    token_cache.invalidate_key(instance.key)
+    revoke_user_tokens(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def token_user_changed(sender, instance, **kwargs):
+    """Drops all cached tokens of a user whenever the user or the profile is saved or deleted, so the next request reloads them in every process."""
+    user_id = instance.pk if sender is User else instance.user_id
+    token_cache.invalidate_user(user_id)
+    revoke_user_tokens(user_id)
+
+
+@receiver(post_save, sender=User)
+def offer_creator_changed(sender, instance, created, update_fields=None, **kwargs):
+    """Invalidates the cached offer responses and the ETags of the offer lists, which embed the creators' names, whenever a user is saved.
+    Saves that only touch other fields, e.g. `last_login` on every login, are skipped."""
+    if created or (update_fields is not None and not {'username', 'first_name', 'last_name'} & set(update_fields)):
+        return
+    invalidate_offer_catalogue()
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, created, update_fields=None, **kwargs):
+    """Counts a new order for its business user, or moves a changed order from its previous status (or business user) to the new one.
+    An order whose previous state is unknown (e.g. saved with deferred fields) makes the counters of its business user be counted again.
+    The cached order analytics of every affected business user are invalidated."""
+    if update_fields is not None and not {'status', 'business_user'} & set(update_fields):
+        return
+    current = (instance.business_user_id, instance.status)
+    previous = None if created else instance.counted_state
+    if previous != current:
+        invalidate_order_analytics(current[0])
+        if previous is not None and previous[0] != current[0]:
+            invalidate_order_analytics(previous[0])
+    if not created and previous is None:
+        BusinessOrderCounter.recount(instance.business_user_id)
+    elif previous != current:
+        if previous is not None and previous[0] == current[0]:
+            BusinessOrderCounter.apply(current[0], {previous[1]: -1, current[1]: 1})
+        else:
+            if previous is not None:
+                BusinessOrderCounter.apply(previous[0], {previous[1]: -1})
+            BusinessOrderCounter.apply(current[0], {current[1]: 1})
+    instance.counted_state = current
+
+
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    """Removes a deleted order from the counters and the cached analytics of its business user."""
+    business_user_id, status = instance.counted_state or (instance.business_user_id, instance.status)
+    invalidate_order_analytics(business_user_id)
+    BusinessOrderCounter.apply(business_user_id, {status: -1})
+
+
+@receiver(post_delete, sender=ArchivedOrder)
+def archived_order_deleted(sender, instance, **kwargs):
+    """Removes a deleted archived order, e.g. one deleted together with its customer profile, from the counters (and thereby the ranking)
+    and the cached analytics of its business user."""
+    invalidate_order_analytics(instance.business_user_id)
+    BusinessOrderCounter.apply(instance.business_user_id, {instance.status: -1})
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """Counts a new review in the platform statistics and in the BusinessRating of its business user, or moves a changed review from its previous rating
+    (or business user) to the new one. A review whose previous state is unknown (e.g. saved with deferred fields) makes both be counted again."""
+    current = (instance.business_user_id, instance.rating)
+    previous = None if created else instance.counted_state
+    if created:
+        PlatformStatistics.apply(review_count=1, rating_sum=instance.rating)
+        BusinessRating.apply(current[0], BusinessRating.review_deltas(current[1]))
+    elif previous is None:
+        PlatformStatistics.recompute()
+        BusinessRating.recount(current[0])
+    elif previous != current:
+        PlatformStatistics.apply(rating_sum=current[1] - previous[1])
+        if previous[0] == current[0]:
+            deltas = Counter(BusinessRating.review_deltas(current[1]))
+            deltas.update(BusinessRating.review_deltas(previous[1], -1))
+            BusinessRating.apply(current[0], deltas)
+        else:
+            BusinessRating.apply(previous[0], BusinessRating.review_deltas(previous[1], -1))
+            BusinessRating.apply(current[0], BusinessRating.review_deltas(current[1]))
+    instance.counted_state = current
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """Removes a deleted review, as stored in the database, from the platform statistics and the BusinessRating of its business user."""
+    business_user_id, rating = instance.counted_state or (instance.business_user_id, instance.rating)
+    PlatformStatistics.apply(review_count=-1, rating_sum=-rating)
+    BusinessRating.apply(business_user_id, BusinessRating.review_deltas(rating, -1))
+
+
+@receiver(post_save, sender=Offer)
+def offer_saved(sender, instance, created, **kwargs):
+    """Counts a new offer in the platform statistics."""
+    if created:
+        PlatformStatistics.apply(offer_count=1)
+
+
+@receiver(post_delete, sender=Offer)
+def offer_deleted(sender, instance, **kwargs):
+    """Removes a deleted offer from the platform statistics."""
+    PlatformStatistics.apply(offer_count=-1)
+
+
+@receiver(post_save, sender=UserProfile)
+def profile_saved(sender, instance, created, **kwargs):
+    """Counts a new business profile in the platform statistics, or adjusts the business profile count when the type of a profile changes from or to business.
+    A profile that stops being a business profile loses its BusinessRanking, a profile that becomes one again is ranked from its rating and order counters."""
+    previous = None if created else instance.counted_type
+    if not created and previous is None:
+        PlatformStatistics.recompute()
+    else:
+        PlatformStatistics.apply(business_profile_count=(instance.type == "business") - (previous == "business"))
+    if not created and previous != instance.type:
+        if instance.type == "business":
+            BusinessRanking.refresh(instance.pk)
+        else:
+            BusinessRanking.objects.filter(business_user_id=instance.pk).delete()
+    instance.counted_type = instance.type
+
+
+@receiver(post_delete, sender=UserProfile)
+def profile_deleted(sender, instance, **kwargs):
+    """Removes a deleted business profile from the platform statistics."""
+    if (instance.counted_type or instance.type) == "business":
+        PlatformStatistics.apply(business_profile_count=-1)
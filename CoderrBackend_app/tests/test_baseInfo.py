@@ -1,6 +1,7 @@
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.db.models import Avg
+from django.core.cache import cache
 from django.contrib.auth.models import User
 from CoderrBackend_app.models import UserProfile, Offer, Review
 
@@ -9,17 +10,20 @@ class StatisticsViewTest ( APITestCase):
     def setUp(self):        
         """ Set up test environment for StatisticsViewTest. This method creates test users and user profiles for a customer and a business. It also authenticates the API client with a test user.    
         Additionally, it creates sample reviews and offers to be used in the tests for the statistics view. The reviews are linked to the business profile and are created with varying ratings. The offers 
-        are associated with the business user.    """
+        are associated with the business user. Every review has its own reviewer, since a customer can review a business user only once. The cache is cleared, so the statistics are not served from a previous test.    """
 
+        cache.clear()
         self.customer = User.objects.create(username="customer", password="testpass", email="test@example.com")
         self.customer_profile = UserProfile.objects.get_or_create(user=self.customer, type="customer")
+        self.other_customer = User.objects.create(username="other_customer", password="testpass", email="test@example.com")
+        UserProfile.objects.get_or_create(user=self.other_customer, type="customer")
         self.business = User.objects.create(username="business", password="testpass", email="test@example.com")
         self.business_profile = UserProfile.objects.get_or_create(user=self.business , type="business")  # Otro tipo de usuario
         self.client = APIClient()
         self.client.login(username="testuser", password="testpass")               
         
         Review.objects.create(business_user=self.business.profile,rating=4, description="This is a test review", reviewer=self.customer )       
-        Review.objects.create( business_user=self.business.profile, rating=5, description="This is a test review", reviewer=self.customer)
+        Review.objects.create( business_user=self.business.profile, rating=5, description="This is a test review", reviewer=self.other_customer)
         
         Offer.objects.create( user= self.business, title="Test Offer # 1", image = None, description="This is a test offer #1", min_price=100.0 )
         Offer.objects.create( user=self.business, title="Test Offer #2", image = None, description="This is a test offer #2", min_price=100.0 )
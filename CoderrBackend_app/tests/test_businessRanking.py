@@ -0,0 +1,139 @@
+import math
+from io import StringIO
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import override_settings
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Order, Review, BusinessRanking
+from django.contrib.auth.models import User
+
+
+@override_settings(BUSINESS_RANKING_PRIOR_RATING=3.0, BUSINESS_RANKING_PRIOR_WEIGHT=5, BUSINESS_RANKING_ORDER_WEIGHT=0.5)
+class BusinessRankingTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for BusinessRankingTest. This method creates three business users and four customers with their profiles.
+        The first business user gets the ratings 5, 5 and 4 and one completed order, the second one the rating 5 and three completed orders and one order in progress,
+        the third one has no reviews and orders. The API client is not authenticated, since the leaderboard is public."""
+        self.businesses = []
+        for index in range(3):
+            business = User.objects.create_user(username=f'business_{index}', password='testpass', email="test@example.com", first_name=f"Firma{index}")
+            self.businesses.append(UserProfile.objects.create(user=business, type='business'))
+        self.customers = []
+        for index in range(4):
+            customer = User.objects.create_user(username=f'customer_{index}', password='testpass', email="test@example.com")
+            self.customers.append(UserProfile.objects.create(user=customer, type='customer'))
+        for customer, rating in zip(self.customers, (5, 5, 4)):
+            Review.objects.create(business_user=self.businesses[0], reviewer=customer.user, rating=rating, description="Gut")
+        Review.objects.create(business_user=self.businesses[1], reviewer=self.customers[3].user, rating=5, description="Gut")
+        Order.objects.create(customer_user=self.customers[0], business_user=self.businesses[0], status="completed")
+        self.orders = [Order.objects.create(customer_user=self.customers[0], business_user=self.businesses[1], status=order_status)
+                       for order_status in ["completed", "completed", "completed", "in_progress"]]
+        self.client = APIClient()
+        self.leaderboard_url = reverse('business-leaderboard')
+
+    def expected(self, review_count, rating_sum, completed_orders):
+        bayesian_rating = (5 * 3.0 + rating_sum) / (5 + review_count)
+        return {"review_count": review_count, "bayesian_rating": bayesian_rating, "completed_orders": completed_orders,
+                "score": bayesian_rating + 0.5 * math.log1p(completed_orders)}
+
+    def ranking(self, profile):
+        ranking = BusinessRanking.objects.get(pk=profile.pk)
+        return {"review_count": ranking.review_count, "bayesian_rating": ranking.bayesian_rating, "completed_orders": ranking.completed_orders, "score": ranking.score}
+
+    def test_rankings_follow_reviews_and_orders(self):
+        """Test that new reviews and orders create and update the ranking of their business user, and that a business user without reviews and orders has no ranking."""
+        self.assertEqual(self.ranking(self.businesses[0]), self.expected(3, 14, 1))
+        self.assertEqual(self.ranking(self.businesses[1]), self.expected(1, 5, 3))
+        self.assertFalse(BusinessRanking.objects.filter(pk=self.businesses[2].pk).exists())
+
+    def test_changes_refresh_only_their_business_user(self):
+        """Test that a changed rating, a completed order and a deleted review refresh the ranking of their business user, while the other rankings stay the same."""
+        other = self.ranking(self.businesses[1])
+        review = Review.objects.filter(business_user=self.businesses[0]).order_by('id').first()
+        review.rating = 1
+        review.save()
+        self.assertEqual(self.ranking(self.businesses[0]), self.expected(3, 10, 1))
+        order = Order.objects.create(customer_user=self.customers[1], business_user=self.businesses[0], status="in_progress")
+        self.assertEqual(self.ranking(self.businesses[0]), self.expected(3, 10, 1))
+        order.status = "completed"
+        order.save()
+        self.assertEqual(self.ranking(self.businesses[0]), self.expected(3, 10, 2))
+        review.delete()
+        self.assertEqual(self.ranking(self.businesses[0]), self.expected(2, 9, 2))
+        self.assertEqual(self.ranking(self.businesses[1]), other)
+
+    def test_bulk_status_refreshes_ranking(self):
+        """Test that completing orders with the bulk status endpoint refreshes the ranking of the business user."""
+        self.client.force_authenticate(user=self.businesses[1].user)
+        response = self.client.patch(reverse('order-bulk-status'), [{"id": self.orders[3].id, "status": "completed"}, {"id": self.orders[0].id, "status": "cancelled"},
+                                                                    {"id": self.orders[1].id, "status": "cancelled"}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.ranking(self.businesses[1]), self.expected(1, 5, 2))
+
+    def test_deleting_business_profile(self):
+        """Test that deleting a business profile with reviews and orders deletes its ranking without creating it again."""
+        self.businesses[0].delete()
+        self.assertFalse(BusinessRanking.objects.filter(pk=self.businesses[0].pk).exists())
+        self.assertEqual(BusinessRanking.objects.count(), 1)
+
+    def test_leaderboard(self):
+        """Test that the public leaderboard returns the business users by score, highest first, with their names, and that `limit` bounds the number of rows."""
+        response = self.client.get(self.leaderboard_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['business_user'] for row in response.data], [self.businesses[1].id, self.businesses[0].id])
+        self.assertEqual(response.data[0]['username'], 'business_1')
+        self.assertEqual(response.data[0]['first_name'], 'Firma1')
+        self.assertAlmostEqual(response.data[0]['score'], self.expected(1, 5, 3)['score'])
+        self.assertEqual(response.data[0]['completed_orders'], 3)
+        response = self.client.get(self.leaderboard_url, {"limit": 1})
+        self.assertEqual(len(response.data), 1)
+        response = self.client.get(self.leaderboard_url, {"limit": "viele"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_leaderboard_is_one_indexed_query(self):
+        """Test that the leaderboard is read with a single query that walks the score index `ranking_score_idx` without sorting."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.leaderboard_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {queries[0]['sql']}")
+                plan = [row[-1] for row in cursor.fetchall()]
+            self.assertTrue([line for line in plan if 'ranking_score_idx' in line], plan)
+            self.assertFalse([line for line in plan if 'TEMP B-TREE' in line], plan)
+
+    def test_rebuild_command(self):
+        """Test that `manage.py rebuild_business_rankings` recreates the rankings with the same values as the incremental updates."""
+        rankings = {profile.pk: self.ranking(profile) for profile in self.businesses[:2]}
+        BusinessRanking.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_business_rankings', stdout=out)
+        self.assertIn("Rebuilt the rankings of 2 business users.", out.getvalue())
+        self.assertEqual({profile.pk: self.ranking(profile) for profile in self.businesses[:2]}, rankings)
+
+    def test_only_business_profiles_are_ranked(self):
+        """Test that a review of a customer profile creates no ranking, that a business profile changed to a customer loses its ranking and leaves the leaderboard,
+        and that it is ranked again from its rating and order counters when it becomes a business profile again."""
+        Review.objects.create(business_user=self.customers[1], reviewer=self.customers[0].user, rating=5, description="Gut")
+        self.assertFalse(BusinessRanking.objects.filter(pk=self.customers[1].pk).exists())
+        profile = UserProfile.objects.get(pk=self.businesses[1].pk)
+        profile.type = "customer"
+        profile.save()
+        self.assertFalse(BusinessRanking.objects.filter(pk=profile.pk).exists())
+        self.assertEqual([row['business_user'] for row in self.client.get(self.leaderboard_url).data], [self.businesses[0].id])
+        profile.type = "business"
+        profile.save()
+        self.assertEqual(self.ranking(profile), self.expected(1, 5, 3))
+
+    def test_rating_and_counter_rebuilds_rebuild_rankings(self):
+        """Test that `manage.py rebuild_business_ratings` and `manage.py rebuild_order_counters` rebuild the rankings from the repaired values."""
+        Review.objects.filter(business_user=self.businesses[0]).update(rating=1)
+        call_command('rebuild_business_ratings', stdout=StringIO())
+        self.assertEqual(self.ranking(self.businesses[0]), self.expected(3, 3, 1))
+        Order.objects.filter(business_user=self.businesses[1]).update(status="completed")
+        call_command('rebuild_order_counters', stdout=StringIO())
+        self.assertEqual(self.ranking(self.businesses[1]), self.expected(1, 5, 4))
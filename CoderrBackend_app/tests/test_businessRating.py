@@ -0,0 +1,101 @@
+from io import StringIO
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.core.management import call_command
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Review, BusinessRating
+from django.contrib.auth.models import User
+
+
+class BusinessRatingTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for BusinessRatingTest. This method creates a customer and two business users with their profiles and three reviews
+        of three other customers with the ratings 5, 4 and 4 for the first business user. The API client is authenticated as the customer user."""
+        self.customer = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer, type='customer')
+        self.business = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business, type='business')
+        self.other_business = User.objects.create_user(username='other_business', password='testpass', email="test@example.com")
+        self.other_profile = UserProfile.objects.create(user=self.other_business, type='business')
+        self.reviewers = [User.objects.create_user(username=f'reviewer_{index}', password='testpass', email="test@example.com") for index in range(3)]
+        for reviewer in self.reviewers:
+            UserProfile.objects.create(user=reviewer, type='customer')
+        self.reviews = [Review.objects.create(business_user=self.business_profile, reviewer=reviewer, rating=rating, description="Gut") for reviewer, rating in zip(self.reviewers, (5, 4, 4))]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customer)
+
+    def rating(self, profile=None):
+        rating = BusinessRating.objects.get(pk=(profile or self.business_profile).pk)
+        return rating.review_count, rating.rating_sum, rating.histogram
+
+    def test_create_counts_reviews(self):
+        """Test that creating reviews adds them to the count, the sum and the histogram of their business user."""
+        self.assertEqual(self.rating(), (3, 13, {"1": 0, "2": 0, "3": 0, "4": 2, "5": 1}))
+
+    def test_update_moves_review(self):
+        """Test that changing the rating moves the review within the histogram, and that moving it to another business user moves it between both ratings."""
+        review = Review.objects.get(pk=self.reviews[0].pk)
+        review.rating = 2
+        review.save()
+        self.assertEqual(self.rating(), (3, 10, {"1": 0, "2": 1, "3": 0, "4": 2, "5": 0}))
+        review.business_user = self.other_profile
+        review.save()
+        self.assertEqual(self.rating(), (2, 8, {"1": 0, "2": 0, "3": 0, "4": 2, "5": 0}))
+        self.assertEqual(self.rating(self.other_profile), (1, 2, {"1": 0, "2": 1, "3": 0, "4": 0, "5": 0}))
+
+    def test_concurrent_rating_changes_keep_rating(self):
+        """Test that two updates of the same review that were both read with the rating 5 change the histogram only once away from 5:
+        the second save locks the row and moves the review from the rating the first save wrote."""
+        first = Review.objects.get(pk=self.reviews[0].pk)
+        second = Review.objects.get(pk=self.reviews[0].pk)
+        first.rating = 1
+        first.save()
+        second.rating = 2
+        second.save()
+        self.assertEqual(self.rating(), (3, 10, {"1": 0, "2": 1, "3": 0, "4": 2, "5": 0}))
+
+    def test_delete_removes_review(self):
+        """Test that deleting a review, alone or in a queryset, removes it from the rating using the rating stored in the database."""
+        review = self.reviews[0]
+        review.rating = 1
+        review.delete()
+        self.assertEqual(self.rating(), (2, 8, {"1": 0, "2": 0, "3": 0, "4": 2, "5": 0}))
+        Review.objects.all().delete()
+        self.assertEqual(self.rating(), (0, 0, {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0}))
+
+    def test_review_endpoint_updates_rating(self):
+        """Test that a PATCH of a review through the API updates the rating of its business user."""
+        self.client.force_authenticate(user=self.reviewers[1])
+        response = self.client.patch(reverse('review-detail', args=[self.reviews[1].id]), {"rating": 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.rating(), (3, 10, {"1": 1, "2": 0, "3": 0, "4": 1, "5": 1}))
+
+    def test_business_list_shows_rating_without_extra_queries(self):
+        """Test that the business list contains the rating of every business profile, with zeros for a profile without reviews, and that the number of queries does not depend on the number of profiles."""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('business-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profiles = {profile['user']: profile for profile in response.data}
+        self.assertEqual((profiles[self.business.id]['review_count'], profiles[self.business.id]['average_rating']), (3, 4.3))
+        self.assertEqual(profiles[self.business.id]['rating_histogram'], {"1": 0, "2": 0, "3": 0, "4": 2, "5": 1})
+        self.assertEqual((profiles[self.other_business.id]['review_count'], profiles[self.other_business.id]['average_rating']), (0, None))
+        for index in range(3):
+            user = User.objects.create_user(username=f'business_{index}', password='testpass', email="test@example.com")
+            UserProfile.objects.create(user=user, type='business')
+        with self.assertNumQueries(1):
+            self.client.get(reverse('business-list'))
+
+    def test_business_profile_shows_rating(self):
+        """Test that a retrieved business profile contains its rating and that a customer profile does not."""
+        response = self.client.get(f"/api/profile/{self.business_profile.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['review_count'], 3)
+        response = self.client.get(f"/api/profile/{self.customer_profile.pk}/")
+        self.assertNotIn('review_count', response.data)
+
+    def test_rebuild_command_repairs_ratings(self):
+        """Test that the rebuild command recomputes ratings that drifted, e.g. after a `QuerySet.update()` that bypassed the signals."""
+        Review.objects.filter(pk=self.reviews[0].pk).update(rating=3)
+        BusinessRating.objects.filter(pk=self.business_profile.pk).update(rating_1=4)
+        call_command('rebuild_business_ratings', stdout=StringIO())
+        self.assertEqual(self.rating(), (3, 11, {"1": 0, "2": 0, "3": 1, "4": 2, "5": 0}))
@@ -1,7 +1,10 @@
 from rest_framework.test import APITestCase, APIClient
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from django.urls import reverse
 from CoderrBackend_app.models import UserProfile, Offer, OfferDetail
+from CoderrBackend_app.api.serializers import OfferSerializer
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
 
@@ -188,11 +191,86 @@ class OfferTest(APITestCase):
         nonexistent_id = 99999  # Un ID que no existe en la base de datos
         url = reverse('offer-detail', args=[nonexistent_id])  
         data = {"title": "Updated Offer"}
-        response = self.client.patch(url, data, format='json')    
+        response = self.client.patch(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
-    
-    
-    def tearDown(self):        
+
+    def test_list_offers_query_count_independent_of_page_size(self):
+        """Test that the offer list loads a page in a fixed number of queries. The test creates additional offers with details, requests a small and a large page
+        and verifies that both responses need the same number of database queries, so the count does not grow with the page size."""
+        for index in range(10):
+            offer = Offer.objects.create(user=self.business_user, title=f"Offer {index}", description="Query budget offer", min_price=50.0)
+            OfferDetail.objects.create(offer=offer, title="Basic Design", revisions=1, delivery_time_in_days=2, price="50.00", features=[], offer_type="basic")
+            OfferDetail.objects.create(offer=offer, title="Premium Design", revisions=5, delivery_time_in_days=9, price="200.00", features=[], offer_type="premium")
+        with CaptureQueriesContext(connection) as small_page:
+            response = self.client.get(f"{self.offer_url}?page_size=2")
+        self.assertEqual(len(response.data['results']), 2)
+        with CaptureQueriesContext(connection) as large_page:
+            response = self.client.get(f"{self.offer_url}?page_size=10")
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(len(small_page.captured_queries), len(large_page.captured_queries))
+        self.assertLessEqual(len(large_page.captured_queries), 3)
+
+    def test_list_representation_matches_offer_serializer(self):
+        """Test that the lightweight list representation returns the same data as the full OfferSerializer with the details reduced to their ID and URL.
+        The test also covers an offer with an image and without a minimum price."""
+        Offer.objects.create(user=self.business_user, title="Image Offer", image="images/offer.png", description="Offer with image")
+        response = self.client.get(self.offer_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for offer_data in response.data['results']:
+            offer = Offer.objects.get(id=offer_data['id'])
+            expected = OfferSerializer(offer).data
+            expected['details'] = [{"id": detail.id, "url": f"/offerdetails/{detail.id}/"} for detail in offer.details.order_by('id')]
+            self.assertEqual(dict(offer_data), dict(expected))
+
+
+    def offer_payload(self, count):
+        """Returns offer data for a create or update request with the first `count` of the three offer details basic, standard and premium."""
+        details = [{"title": "Basic Design", "revisions": 0, "delivery_time_in_days": 4, "price": "80.00", "features": [], "offer_type": "basic"},
+                   {"title": "Standard Design", "revisions": 3, "delivery_time_in_days": 3, "price": "120.00", "features": [], "offer_type": "standard"},
+                   {"title": "Premium Design", "revisions": 5, "delivery_time_in_days": 7, "price": "30.00", "features": [], "offer_type": "premium"}]
+        return {"title": "Batched Offer", "description": "Batched write", "image": None, "details": details[:count]}
+
+    def test_create_offer_statement_count_independent_of_details(self):
+        """Test that creating an offer writes the offer with all its details in a constant number of statements. The test creates an offer with one and one with three details,
+        verifies that both requests run the same number of queries and that the minimum price and delivery time are stored from the payload. The token is authenticated once beforehand, so both requests are served from the token cache."""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.business_token.key}')
+        self.client.get(self.offer_detail_url)
+        with CaptureQueriesContext(connection) as one_detail:
+            response = self.client.post(self.offer_url, self.offer_payload(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with CaptureQueriesContext(connection) as three_details:
+            response = self.client.post(self.offer_url, self.offer_payload(3), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(one_detail.captured_queries), len(three_details.captured_queries))
+        offer = Offer.objects.get(id=response.data['id'])
+        self.assertEqual(offer.details.count(), 3)
+        self.assertEqual(float(offer.min_price), 30.0)
+        self.assertEqual(offer.min_delivery_time, 3)
+        self.assertEqual(offer.details.get(offer_type="basic").revisions, 1)
+
+    def test_update_offer_statement_count_independent_of_details(self):
+        """Test that updating an offer writes the offer with all its details in a constant number of statements. The test updates one and then all three details,
+        verifies that both requests run the same number of queries and that the minimum values are recomputed from the updated and the unchanged details. The token is authenticated once beforehand, so both requests are served from the token cache."""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.business_token.key}')
+        self.client.get(self.offer_detail_url)
+        with CaptureQueriesContext(connection) as one_detail:
+            response = self.client.patch(self.offer_detail_url, self.offer_payload(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.offer.refresh_from_db()
+        self.assertEqual(float(self.offer.min_price), 80.0)
+        self.assertEqual(self.offer.min_delivery_time, 4)
+        with CaptureQueriesContext(connection) as three_details:
+            response = self.client.patch(self.offer_detail_url, self.offer_payload(3), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(one_detail.captured_queries), len(three_details.captured_queries))
+        self.offer.refresh_from_db()
+        self.assertEqual(float(self.offer.min_price), 30.0)
+        self.assertEqual(self.offer.min_delivery_time, 3)
+        self.assertEqual(self.offer.details.count(), 3)
+        self.assertEqual(sorted(detail['price'] for detail in response.data['details']), [30.0, 80.0, 120.0])
+
+
+    def tearDown(self):      
         """Clean up the test environment after each test case. This method deletes all instances of Offer, OfferDetail, User, and UserProfile to ensure no test data persists between tests."""
         Offer.objects.all().delete()
         OfferDetail.objects.all().delete()
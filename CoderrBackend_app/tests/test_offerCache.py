@@ -0,0 +1,74 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail
+from django.contrib.auth.models import User
+
+
+class OfferResponseCacheTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OfferResponseCacheTest. This method clears the cache and creates a business user with one offer and its details.
+        The offer list is requested anonymously, the offer itself by an authenticated customer."""
+        cache.clear()
+        self.business_user = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business_user, type='business')
+        self.customer_user = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer_user, type='customer')
+        self.offer = Offer.objects.create(user=self.business_user, title="Test Offer", description="This is a test offer", min_price=50.0)
+        self.offer_detail = OfferDetail.objects.create(offer=self.offer, title="Basic Design", revisions=1, delivery_time_in_days=2, price="50.00", features=[], offer_type="basic")
+        self.client = APIClient()
+        self.offer_url = reverse('offer-list')
+        self.offer_detail_url = reverse('offer-detail', args=[self.offer.id])
+
+    def test_repeated_list_request_is_served_from_cache(self):
+        """Test that a repeated offer list request with the same, differently ordered query parameters is answered from the cache without any database query."""
+        first = self.client.get(f"{self.offer_url}?page_size=5&search=&ordering=min_price")
+        with CaptureQueriesContext(connection) as context:
+            second = self.client.get(f"{self.offer_url}?ordering=min_price&page_size=5")
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(context.captured_queries), 0)
+        self.assertEqual(second.data, first.data)
+
+    def test_offer_change_invalidates_list(self):
+        """Test that saving an offer invalidates the cached offer list, so the next request returns the new title."""
+        self.client.get(self.offer_url)
+        self.offer.title = "Updated Offer"
+        self.offer.save()
+        response = self.client.get(self.offer_url)
+        self.assertEqual(response.data['results'][0]['title'], "Updated Offer")
+
+    def test_creator_rename_invalidates_list(self):
+        """Test that renaming the creator of an offer invalidates the cached offer list, which embeds the creator's name, while a login keeps it cached."""
+        self.client.get(self.offer_url)
+        self.business_user.last_login = self.business_user.date_joined
+        self.business_user.save(update_fields=['last_login'])
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.offer_url)
+        self.assertEqual(len(context.captured_queries), 0)
+        self.business_user.last_name = "Neu"
+        self.business_user.save()
+        response = self.client.get(self.offer_url)
+        self.assertEqual(response.data['results'][0]['user_details']['last_name'], "Neu")
+
+    def test_offer_detail_change_invalidates_retrieve(self):
+        """Test that the cached offer retrieve response is served without queries and is invalidated when one of the offer details is deleted."""
+        self.client.force_authenticate(user=self.customer_user)
+        first = self.client.get(self.offer_detail_url)
+        self.assertEqual(len(first.data['details']), 1)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.offer_detail_url)
+        self.assertEqual(len(context.captured_queries), 0)
+        self.offer_detail.delete()
+        response = self.client.get(self.offer_detail_url)
+        self.assertEqual(response.data['details'], [])
+
+    def test_cached_retrieve_still_requires_authentication(self):
+        """Test that a cached offer is not returned to unauthenticated users, because the permission check runs before the cache lookup."""
+        self.client.force_authenticate(user=self.customer_user)
+        self.client.get(self.offer_detail_url)
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.offer_detail_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
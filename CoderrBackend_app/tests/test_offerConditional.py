@@ -0,0 +1,128 @@
+from unittest import mock
+from rest_framework.request import Request
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
+from rest_framework import status
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.cache import offer_response_cache_key
+from CoderrBackend_app.api.serializers import OfferListSerializer, OfferSerializer
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail
+from django.contrib.auth.models import User
+
+
+class OfferConditionalGetTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OfferConditionalGetTest. This method clears the response cache and creates a business user with one offer and its details,
+        and a customer user who is authenticated for all requests."""
+        cache.clear()
+        self.business_user = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business_user, type='business')
+        self.customer_user = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer_user, type='customer')
+        self.offer = Offer.objects.create(user=self.business_user, title="Test Offer", description="This is a test offer", min_price=50.0)
+        self.offer_detail = OfferDetail.objects.create(offer=self.offer, title="Basic Design", revisions=1, delivery_time_in_days=2, price="50.00", features=[], offer_type="basic")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customer_user)
+        self.offer_url = reverse('offer-list')
+        self.offer_retrieve_url = reverse('offer-detail', args=[self.offer.id])
+        self.offer_detail_url = reverse('offerdetail-detail', args=[self.offer_detail.id])
+
+    def drop_cached_response(self, url):
+        """Removes the cached response of the given URL, without bumping the catalogue version, so the next request is a cache miss with the same ETag."""
+        self.assertTrue(cache.delete(offer_response_cache_key(Request(APIRequestFactory().get(url)))))
+
+    def test_retrieve_returns_validators(self):
+        """Test that retrieving an offer returns an ETag and a Last-Modified header, and that the cached response carries the same validators."""
+        first = self.client.get(self.offer_retrieve_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', first)
+        self.assertIn('Last-Modified', first)
+        second = self.client.get(self.offer_retrieve_url)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_retrieve_if_none_match_returns_304_without_serialization(self):
+        """Test that a retrieve request with the current ETag returns a 304 NOT MODIFIED with an empty body after a single aggregate query, without serializing the offer."""
+        etag = self.client.get(self.offer_retrieve_url)['ETag']
+        cache.clear()
+        with mock.patch.object(OfferSerializer, 'to_representation') as to_representation, CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.offer_retrieve_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(context.captured_queries), 1)
+        to_representation.assert_not_called()
+
+    def test_retrieve_etag_changes_with_details(self):
+        """Test that updating or deleting an offer detail changes the ETag of the offer, so the stale ETag gets a full 200 OK response again."""
+        etag = self.client.get(self.offer_retrieve_url)['ETag']
+        self.offer_detail.price = "40.00"
+        self.offer_detail.save()
+        response = self.client.get(self.offer_retrieve_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        etag = response['ETag']
+        self.offer_detail.delete()
+        response = self.client.get(self.offer_retrieve_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_retrieve_unknown_offer(self):
+        """Test that retrieving a nonexistent offer still returns a 404 NOT FOUND."""
+        response = self.client.get(reverse('offer-detail', args=[self.offer.id + 100]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_if_none_match_returns_304_without_serialization(self):
+        """Test that a list request with the current ETag returns a 304 NOT MODIFIED on a cache miss without any query, since the ETag is derived from the catalogue version."""
+        etag = self.client.get(f"{self.offer_url}?search=Test")['ETag']
+        self.drop_cached_response(f"{self.offer_url}?search=Test")
+        with mock.patch.object(OfferListSerializer, 'to_representation') as to_representation, CaptureQueriesContext(connection) as context:
+            response = self.client.get(f"{self.offer_url}?search=Test", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(context.captured_queries), 0)
+        to_representation.assert_not_called()
+
+    def test_list_etag_changes_when_offers_change(self):
+        """Test that creating a new offer changes the ETag of the offer list, so the stale ETag gets a full 200 OK response with the new offer."""
+        etag = self.client.get(self.offer_url)['ETag']
+        Offer.objects.create(user=self.business_user, title="Second Offer", description="Another offer")
+        response = self.client.get(self.offer_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_has_no_last_modified(self):
+        """Test that the offer list carries no Last-Modified header, so a request with only an If-Modified-Since header, e.g. after an offer was deleted, gets a full 200 OK."""
+        Offer.objects.create(user=self.business_user, title="Second Offer", description="Another offer")
+        first = self.client.get(self.offer_url)
+        self.assertNotIn('Last-Modified', first)
+        last_modified = self.client.get(self.offer_retrieve_url)['Last-Modified']
+        Offer.objects.filter(title="Second Offer").delete()
+        response = self.client.get(self.offer_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+    def test_list_etag_changes_when_creator_is_renamed(self):
+        """Test that renaming the creator of an offer changes the ETag of the offer list, which embeds the creator's name, while a login does not."""
+        etag = self.client.get(self.offer_url)['ETag']
+        self.business_user.last_login = self.business_user.date_joined
+        self.business_user.save(update_fields=['last_login'])
+        self.drop_cached_response(self.offer_url)
+        self.assertEqual(self.client.get(self.offer_url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.business_user.first_name = "Neuer"
+        self.business_user.save()
+        response = self.client.get(self.offer_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['user_details']['first_name'], "Neuer")
+
+    def test_offer_detail_if_none_match(self):
+        """Test that an offer detail returns an ETag, that the same ETag gets a 304 NOT MODIFIED, and that a changed offer detail gets a 200 OK again."""
+        etag = self.client.get(self.offer_detail_url)['ETag']
+        response = self.client.get(self.offer_detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.offer_detail.revisions = 3
+        self.offer_detail.save()
+        response = self.client.get(self.offer_detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['revisions'], 3)
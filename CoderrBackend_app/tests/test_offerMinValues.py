@@ -0,0 +1,69 @@
+from io import StringIO
+from decimal import Decimal
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail
+from django.contrib.auth.models import User
+
+
+class OfferMinValuesTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OfferMinValuesTest. This method creates a business user with an offer and two offer details.
+        The minimum price and delivery time of the offer are maintained from the details by the OfferDetail signals."""
+        self.business_user = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business_user, type='business')
+        self.offer = Offer.objects.create(user=self.business_user, title="Test Offer", description="This is a test offer")
+        self.basic = OfferDetail.objects.create(offer=self.offer, title="Basic Design", revisions=1, delivery_time_in_days=5, price="50.00", features=[], offer_type="basic")
+        self.premium = OfferDetail.objects.create(offer=self.offer, title="Premium Design", revisions=5, delivery_time_in_days=2, price="200.00", features=[], offer_type="premium")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.business_user)
+
+    def assert_min_values(self, min_price, min_delivery_time):
+        """Reloads the offer and asserts its minimum price and minimum delivery time."""
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, min_price)
+        self.assertEqual(self.offer.min_delivery_time, min_delivery_time)
+
+    def test_min_values_follow_detail_creation(self):
+        """Test that creating offer details sets the minimum values of the offer."""
+        self.assert_min_values(Decimal("50.00"), 2)
+
+    def test_min_values_follow_detail_update_through_offerdetails_endpoint(self):
+        """Test that changing an offer detail through the offer detail endpoint updates the minimum values of the offer, which the offer filters rely on."""
+        response = self.client.patch(reverse('offerdetail-detail', args=[self.premium.id]), {"price": "20.00", "delivery_time_in_days": 9}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assert_min_values(Decimal("20.00"), 5)
+        response = self.client.get(reverse('offer-list'), {"min_price": 30})
+        self.assertEqual(response.data['count'], 0)
+
+    def test_min_values_follow_detail_deletion(self):
+        """Test that deleting offer details updates the minimum values, and that an offer without details has a minimum price of 0 and no minimum delivery time."""
+        self.basic.delete()
+        self.assert_min_values(Decimal("200.00"), 2)
+        self.premium.delete()
+        self.assert_min_values(Decimal("0.00"), None)
+
+    def test_min_values_are_recomputed_in_one_statement(self):
+        """Test that a detail change recomputes the minimum values of the offer with a single UPDATE statement."""
+        self.basic.price = "40.00"
+        with CaptureQueriesContext(connection) as context:
+            self.basic.save()
+        offer_updates = [query for query in context.captured_queries if query['sql'].startswith(f'UPDATE "{Offer._meta.db_table}"')]
+        self.assertEqual(len(offer_updates), 1)
+        self.assert_min_values(Decimal("40.00"), 2)
+
+    def test_repair_command_fixes_stale_offers(self):
+        """Test that the repair command recomputes the minimum values of all offers in bulk."""
+        other_offer = Offer.objects.create(user=self.business_user, title="Other Offer", description="Stale offer", min_price=999, min_delivery_time=99)
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=999, min_delivery_time=99)
+        output = StringIO()
+        call_command('repair_offer_min_values', stdout=output)
+        self.assertIn("2 offers", output.getvalue())
+        self.assert_min_values(Decimal("50.00"), 2)
+        other_offer.refresh_from_db()
+        self.assertEqual(other_offer.min_price, Decimal("0.00"))
+        self.assertIsNone(other_offer.min_delivery_time)
@@ -0,0 +1,91 @@
+import base64
+import json
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail
+from django.contrib.auth.models import User
+
+
+class OfferCursorPaginationTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OfferCursorPaginationTest. This method creates a business user with fifteen offers. The offers share only a few distinct minimum prices,
+        so the cursor has to rely on the `id` tie-break to page through them without skipping or repeating offers. One offer has no minimum price at all."""
+        self.business_user = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business_user, type='business')
+        self.offers = []
+        for index in range(15):
+            price = [50, 100, 150][index % 3]
+            offer = Offer.objects.create(user=self.business_user, title=f"Offer {index}", description="Cursor offer", min_price=price, min_delivery_time=index)
+            OfferDetail.objects.create(offer=offer, title="Basic Design", revisions=1, delivery_time_in_days=index, price=price, features=[], offer_type="basic")
+            offer.refresh_from_db()
+            self.offers.append(offer)
+        self.offers.append(Offer.objects.create(user=self.business_user, title="Offer without price", description="Cursor offer"))
+        self.client = APIClient()
+        self.offer_url = reverse('offer-list')
+
+    def collect_pages(self, url):
+        """Follows the `next` links starting at the given URL and returns the offer IDs of all pages in the order they were returned."""
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids.extend(offer['id'] for offer in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_cursor_pages_follow_min_price_with_id_tie_break(self):
+        """Test that paging through the offers by ascending minimum price returns every offer exactly once, ordered by price and then by ID, with offers without a price last."""
+        ids = self.collect_pages(f"{self.offer_url}?pagination=cursor&ordering=min_price&page_size=4")
+        expected = [offer.id for offer in sorted(self.offers, key=lambda offer: (offer.min_price is None, offer.min_price or 0, offer.id))]
+        self.assertEqual(ids, expected)
+
+    def test_cursor_pages_follow_descending_updated_at(self):
+        """Test that paging through the offers with the default ordering returns every offer exactly once, the most recently updated offer first."""
+        ids = self.collect_pages(f"{self.offer_url}?pagination=cursor&page_size=4")
+        expected = [offer.id for offer in sorted(self.offers, key=lambda offer: (offer.updated_at, offer.id), reverse=True)]
+        self.assertEqual(ids, expected)
+
+    def test_deep_cursor_page_costs_the_same_as_first_page(self):
+        """Test that a deep page needs the same number of queries as the first page and that no COUNT query is run in cursor mode."""
+        with CaptureQueriesContext(connection) as first_page:
+            response = self.client.get(f"{self.offer_url}?pagination=cursor&ordering=-min_price&page_size=2")
+        url = response.data['next']
+        for _ in range(4):
+            url = self.client.get(url).data['next']
+        with CaptureQueriesContext(connection) as deep_page:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first_page.captured_queries), len(deep_page.captured_queries))
+        self.assertFalse(any('COUNT(' in query['sql'] for query in first_page.captured_queries + deep_page.captured_queries))
+
+    def test_page_number_count_without_catalogue_scan(self):
+        """Test that the page-number list of all offers takes its `count` from the platform statistics without a COUNT query, while a filtered list is still counted exactly."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.offer_url, {"page_size": 4})
+        self.assertEqual(response.data['count'], 16)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in context.captured_queries))
+        response = self.client.get(self.offer_url, {"page_size": 4, "min_price": 100})
+        self.assertEqual(response.data['count'], Offer.objects.filter(min_price__gte=100).count())
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor returns a 404 NOT FOUND."""
+        response = self.client.get(f"{self.offer_url}?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_malformed_value(self):
+        """Test that a well-formed cursor whose value does not fit the ordering field, e.g. text or an object instead of a datetime or price, returns a 404 NOT FOUND instead of a server error."""
+        for ordering, value in (('-updated_at', 'abc'), ('-updated_at', {'x': 1}), ('min_price', 'abc'), ('min_price', [1])):
+            cursor = base64.urlsafe_b64encode(json.dumps({'o': ordering, 'v': value, 'id': 1}).encode()).decode()
+            response = self.client.get(self.offer_url, {'cursor': cursor, 'ordering': ordering})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, (ordering, value))
+
+    def test_page_number_contract_is_unchanged(self):
+        """Test that requests without the cursor parameter still get the page-number response with a total count."""
+        response = self.client.get(f"{self.offer_url}?page=2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 16)
+        self.assertEqual(len(response.data['results']), 6)
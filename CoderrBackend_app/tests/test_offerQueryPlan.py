@@ -0,0 +1,79 @@
+import itertools
+import re
+from urllib.parse import parse_qs, urlparse
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Offer
+from django.contrib.auth.models import User
+
+OFFER_TABLE = Offer._meta.db_table
+OFFER_SCAN = re.compile(rf'^SCAN {OFFER_TABLE}\b')
+ORDERED_INDEX_WALK = re.compile(rf'^SCAN {OFFER_TABLE} USING INDEX \w+$')
+
+
+class OfferQueryPlanTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OfferQueryPlanTest. This method creates a business user with a few offers, so the offer list requests below return rows.
+        The query plans are checked with `EXPLAIN QUERY PLAN`, which does not depend on the number of rows."""
+        self.business_user = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business_user, type='business')
+        for index in range(8):
+            Offer.objects.create(user=self.business_user, title=f"Offer {index}", description="Plan offer", min_price=10 * index, min_delivery_time=index)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.business_user)
+        self.offer_url = reverse('offer-list')
+
+    def get_offer_plans(self, params):
+        """Sends the offer list request with the given query parameters and returns the `EXPLAIN QUERY PLAN` lines of every query that reads the offer table."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.offer_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, params)
+        plans = []
+        for query in context.captured_queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT') or f'FROM "{OFFER_TABLE}"' not in sql:
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plans.append((sql, [row[-1] for row in cursor.fetchall()]))
+        self.assertTrue(plans, params)
+        return plans
+
+    def is_bounded_index_walk(self, line, sql, plan):
+        """Returns whether a `SCAN` of the offer table walks an index in the requested order and stops after the `LIMIT` of the query.
+        A walk whose rows are sorted afterwards (`USE TEMP B-TREE FOR ORDER BY`) or a query without `LIMIT` reads the whole index, as does a plain or covering scan."""
+        return bool(ORDERED_INDEX_WALK.match(line)) and ' LIMIT ' in sql and 'USE TEMP B-TREE FOR ORDER BY' not in plan
+
+    def assert_no_full_scan(self, params):
+        """Asserts that every offer query of the request reads the offer table with an index `SEARCH` or with an index-ordered walk bounded by a `LIMIT`.
+        Any other `SCAN` of the offer table, including `SCAN ... USING COVERING INDEX`, reads every row or index entry and fails the check."""
+        for sql, plan in self.get_offer_plans(params):
+            full_scans = [line for line in plan if OFFER_SCAN.match(line) and not self.is_bounded_index_walk(line, sql, plan)]
+            self.assertEqual(full_scans, [], f"{params}\n{sql}\n{plan}")
+
+    def test_filter_and_ordering_combinations_use_indexes(self):
+        """Test every combination of the offer filters `creator_id`, `max_delivery_time` and `min_price` with every allowed ordering and the default ordering,
+        in page-number mode, and verify that the offer table is never read with a full table scan."""
+        filters = [{"creator_id": self.business_user.id}, {"max_delivery_time": 5}, {"min_price": 30}]
+        orderings = [None, "min_price", "-min_price", "updated_at", "-updated_at"]
+        for size in range(len(filters) + 1):
+            for combination in itertools.combinations(filters, size):
+                for ordering in orderings:
+                    params = {key: value for item in combination for key, value in item.items()}
+                    if ordering:
+                        params["ordering"] = ordering
+                    with self.subTest(params=params):
+                        self.assert_no_full_scan(params)
+
+    def test_cursor_pages_use_indexes(self):
+        """Test that the cursor pagination, on the first and on a following page, reads the offer table through an index for every allowed ordering."""
+        for ordering in ["min_price", "-min_price", "updated_at", "-updated_at"]:
+            with self.subTest(ordering=ordering):
+                params = {"pagination": "cursor", "ordering": ordering, "page_size": 3}
+                self.assert_no_full_scan(params)
+                next_url = self.client.get(self.offer_url, params).data['next']
+                params["cursor"] = parse_qs(urlparse(next_url).query)["cursor"][0]
+                self.assert_no_full_scan(params)
@@ -0,0 +1,51 @@
+from unittest import mock
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Offer
+from django.contrib.auth.models import User
+
+
+class OfferSearchTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OfferSearchTest. This method creates a business user and three offers. Two of them mention "logo", once in the title and once only in the description,
+        so the relevance ordering of the full-text search can be checked."""
+        self.business_user = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business_user, type='business')
+        self.description_match = Offer.objects.create(user=self.business_user, title="Website Design", description="A website, a business card and a logo", min_price=100.0)
+        self.title_match = Offer.objects.create(user=self.business_user, title="Logo Design", description="A unique logo for your brand", min_price=50.0)
+        self.no_match = Offer.objects.create(user=self.business_user, title="Flyer Printing", description="Printed leaflets", min_price=20.0)
+        self.client = APIClient()
+        self.offer_url = reverse('offer-list')
+
+    def search(self, value):
+        """Sends a search request to the offer list URL and returns the IDs of the offers found."""
+        response = self.client.get(self.offer_url, {"search": value})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [offer['id'] for offer in response.data['results']]
+
+    def test_search_is_ranked_by_relevance(self):
+        """Test that offers matching in the title are returned before offers matching only in the description, and that offers without a match are not returned."""
+        self.assertEqual(self.search("logo"), [self.title_match.id, self.description_match.id])
+
+    def test_search_matches_word_prefixes(self):
+        """Test that every word of the search text is matched as a prefix, so a partially typed query already finds the offer."""
+        self.assertEqual(self.search("log uniq"), [self.title_match.id])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """Test that the full-text index is kept in sync with the offers. After a title change the offer is found by the new title only, and a deleted offer is no longer found."""
+        self.no_match.title = "Poster Printing"
+        self.no_match.save()
+        self.assertEqual(self.search("poster"), [self.no_match.id])
+        self.assertEqual(self.search("flyer printing"), [])
+        self.title_match.delete()
+        self.assertEqual(self.search("logo"), [self.description_match.id])
+
+    def test_search_falls_back_to_icontains_without_fts(self):
+        """Test that the search still works as a substring search on databases without the full-text index."""
+        with mock.patch('CoderrBackend_app.filters.offer_fts_available', return_value=False):
+            self.assertEqual(sorted(self.search("ogo")), sorted([self.title_match.id, self.description_match.id]))
+
+    def test_search_without_words_falls_back_to_icontains(self):
+        """Test that a search text without any words is not sent to the full-text index but matched as a substring."""
+        self.assertEqual(self.search(","), [self.description_match.id])
@@ -0,0 +1,94 @@
+import datetime
+from io import StringIO
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail, Order
+from django.contrib.auth.models import User
+
+
+class OrderAnalyticsTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OrderAnalyticsTest. This method clears the cache and creates a customer and a business user with their profiles, an offer with a basic and a premium detail,
+        three orders created in January 2025 and two orders created in March 2025. The API client is authenticated as the business user."""
+        cache.clear()
+        self.customer = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer, type='customer')
+        self.business = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business, type='business')
+        self.offer = Offer.objects.create(user=self.business, title="Test Offer", description="This is a test offer")
+        self.basic = OfferDetail.objects.create(offer=self.offer, title="Basic Design", revisions=1, delivery_time_in_days=2, price="50.00", features=[], offer_type="basic")
+        self.premium = OfferDetail.objects.create(offer=self.offer, title="Premium Design", revisions=3, delivery_time_in_days=5, price="200.00", features=[], offer_type="premium")
+        january = datetime.datetime(2025, 1, 15, 12, tzinfo=datetime.timezone.utc)
+        march = datetime.datetime(2025, 3, 10, 12, tzinfo=datetime.timezone.utc)
+        self.orders = [self.create_order(offer_detail, order_status, created_at) for offer_detail, order_status, created_at in [
+            (self.basic, "completed", january), (self.basic, "completed", january), (self.premium, "cancelled", january),
+            (self.premium, "completed", march), (self.basic, "in_progress", march)]]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.business)
+        self.analytics_url = reverse('order-analytics')
+
+    def create_order(self, offer_detail, order_status, created_at):
+        order = Order.objects.create(customer_user=self.customer_profile, business_user=self.business_profile, offer_detail=offer_detail, status=order_status)
+        Order.objects.filter(pk=order.pk).update(created_at=created_at, updated_at=created_at)
+        return order
+
+    def results(self, period=None):
+        response = self.client.get(self.analytics_url, {"period": period} if period else {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(row["period"].date().isoformat(), row["offer_type"], row["status"], row["order_count"], row["revenue"]) for row in response.data["results"]]
+
+    def test_monthly_analytics(self):
+        """Test that the orders are grouped by month, offer type and status with their number and revenue."""
+        self.assertEqual(self.results(), [
+            ("2025-01-01", "basic", "completed", 2, 100.0), ("2025-01-01", "premium", "cancelled", 1, 200.0),
+            ("2025-03-01", "basic", "in_progress", 1, 50.0), ("2025-03-01", "premium", "completed", 1, 200.0)])
+
+    def test_weekly_analytics(self):
+        """Test that `period=week` groups the orders by the Monday of their week."""
+        self.assertEqual([row[:4] for row in self.results("week")], [
+            ("2025-01-13", "basic", "completed", 2), ("2025-01-13", "premium", "cancelled", 1),
+            ("2025-03-10", "basic", "in_progress", 1), ("2025-03-10", "premium", "completed", 1)])
+
+    def test_archived_orders_are_included(self):
+        """Test that archiving old orders does not change the analytics."""
+        before = self.results()
+        call_command('archive_orders', '--older-than-days', '30', stdout=StringIO())
+        cache.clear()
+        self.assertEqual(self.results(), before)
+
+    def test_analytics_are_aggregated_in_the_database_and_cached(self):
+        """Test that the analytics are computed with one aggregate query per order table and that a second request is served from the cache without reading the orders."""
+        with CaptureQueriesContext(connection) as context:
+            self.results()
+        order_queries = [query['sql'] for query in context.captured_queries if 'order"' in query['sql']]
+        self.assertEqual(len(order_queries), 2)
+        self.assertTrue(all('GROUP BY' in sql for sql in order_queries))
+        with CaptureQueriesContext(connection) as context:
+            self.results()
+        self.assertFalse([query for query in context.captured_queries if 'order"' in query['sql']])
+
+    def test_order_changes_invalidate_the_cache(self):
+        """Test that creating an order, changing an order status and the bulk status endpoint invalidate the cached analytics of the business user."""
+        self.results()
+        order = Order.objects.get(pk=self.orders[4].pk)
+        order.status = "completed"
+        order.save()
+        self.assertIn(("2025-03-01", "basic", "completed", 1, 50.0), self.results())
+        self.client.patch(reverse('order-bulk-status'), [{"id": order.id, "status": "cancelled"}], format='json')
+        self.assertIn(("2025-03-01", "basic", "cancelled", 1, 50.0), self.results())
+        Order.objects.create(customer_user=self.customer_profile, business_user=self.business_profile, offer_detail=self.premium, status="in_progress")
+        self.assertIn("premium", [row[1] for row in self.results() if row[2] == "in_progress"])
+
+    def test_only_business_users(self):
+        """Test that a customer user gets a 403 FORBIDDEN, an unknown period a 400 BAD REQUEST and an unauthenticated user a 401 UNAUTHORIZED."""
+        self.assertEqual(self.client.get(self.analytics_url, {"period": "year"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=self.customer)
+        self.assertEqual(self.client.get(self.analytics_url).status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.analytics_url).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,133 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail, Order, ArchivedOrder, BusinessOrderCounter, BusinessRanking
+from django.contrib.auth.models import User
+
+
+class OrderArchiveTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OrderArchiveTest. This method creates a customer and a business user with their profiles, an offer with one detail,
+        two completed and one cancelled order last updated a year ago, one recent completed order and one old order still in progress.
+        The API client is authenticated as the customer user."""
+        self.customer = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer, type='customer')
+        self.business = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business, type='business')
+        self.offer = Offer.objects.create(user=self.business, title="Test Offer", description="This is a test offer")
+        self.offer_detail = OfferDetail.objects.create(offer=self.offer, title="Basic Design", revisions=1, delivery_time_in_days=2, price="50.00", features=["Logo"], offer_type="basic")
+        self.old_orders = [self.create_order(order_status) for order_status in ["completed", "completed", "cancelled"]]
+        self.recent_order = self.create_order("completed")
+        self.open_order = self.create_order("in_progress")
+        Order.objects.filter(pk__in=[order.pk for order in self.old_orders + [self.open_order]]).update(updated_at=timezone.now() - datetime.timedelta(days=365))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customer)
+        self.archive_url = reverse('archivedorder-list')
+
+    def create_order(self, order_status):
+        return Order.objects.create(customer_user=self.customer_profile, business_user=self.business_profile, offer_detail=self.offer_detail, status=order_status)
+
+    def archive(self, *args):
+        call_command('archive_orders', '--older-than-days', '30', *args, stdout=StringIO())
+
+    def test_archive_moves_old_closed_orders(self):
+        """Test that only the completed and cancelled orders older than the given age are moved into the archive, keeping their ID and offer detail values."""
+        self.archive()
+        self.assertEqual(sorted(ArchivedOrder.objects.values_list('id', flat=True)), sorted(order.id for order in self.old_orders))
+        self.assertEqual(sorted(Order.objects.values_list('id', flat=True)), sorted([self.recent_order.id, self.open_order.id]))
+        archived = ArchivedOrder.objects.get(pk=self.old_orders[0].id)
+        self.assertEqual((archived.title, archived.price, archived.status, archived.created_at), ("Basic Design", Decimal("50.00"), "completed", self.old_orders[0].created_at))
+
+    def test_archive_keeps_counters(self):
+        """Test that the order counters are unchanged by archiving and that rebuilding them afterwards still counts the archived orders."""
+        before = BusinessOrderCounter.get_counts(self.business_profile.id)
+        self.archive()
+        self.assertEqual(BusinessOrderCounter.get_counts(self.business_profile.id), before)
+        call_command('rebuild_order_counters', stdout=StringIO())
+        self.assertEqual(BusinessOrderCounter.get_counts(self.business_profile.id), {"in_progress": 1, "completed": 3, "cancelled": 1})
+        response = self.client.get(reverse('_completed_order_count_business_user', args=[self.business_profile.id]))
+        self.assertEqual(response.data, {"completed_order_count": 3})
+
+    def test_deleted_archived_orders_leave_counters_and_ranking(self):
+        """Test that archived orders deleted together with their customer profile are removed from the order counters and the ranking of the business user,
+        which then match a full rebuild."""
+        self.archive()
+        self.assertEqual(BusinessRanking.objects.get(business_user=self.business_profile).completed_orders, 3)
+        self.customer_profile.delete()
+        self.assertFalse(ArchivedOrder.objects.exists())
+        self.assertEqual(BusinessOrderCounter.get_counts(self.business_profile.id), {"in_progress": 0, "completed": 0, "cancelled": 0})
+        self.assertEqual(BusinessRanking.objects.get(business_user=self.business_profile).completed_orders, 0)
+        call_command('rebuild_order_counters', stdout=StringIO())
+        self.assertEqual(BusinessOrderCounter.get_counts(self.business_profile.id), {"in_progress": 0, "completed": 0, "cancelled": 0})
+
+    def test_archive_runs_in_batches(self):
+        """Test that the orders are moved in batches of the given size, with one INSERT and one DELETE per batch."""
+        with CaptureQueriesContext(connection) as context:
+            self.archive('--batch-size', '2')
+        inserts = [query for query in context.captured_queries if query['sql'].startswith('INSERT INTO "CoderrBackend_app_archivedorder"')]
+        deletes = [query for query in context.captured_queries if query['sql'].startswith('DELETE FROM "CoderrBackend_app_order"')]
+        self.assertEqual((len(inserts), len(deletes)), (2, 2))
+        self.assertEqual(ArchivedOrder.objects.count(), 3)
+
+    def test_archive_sends_no_delete_signal_and_keeps_large_ids(self):
+        """Test that archiving deletes the orders without sending `post_delete`, and that order IDs beyond the 32-bit range are kept in the archive."""
+        large = self.create_order("completed")
+        Order.objects.filter(pk=large.pk).update(id=2 ** 31 + 5, updated_at=timezone.now() - datetime.timedelta(days=365))
+        receiver = mock.Mock()
+        post_delete.connect(receiver, sender=Order)
+        try:
+            self.archive()
+        finally:
+            post_delete.disconnect(receiver, sender=Order)
+        receiver.assert_not_called()
+        self.assertTrue(ArchivedOrder.objects.filter(pk=2 ** 31 + 5).exists())
+        self.assertFalse(Order.objects.filter(pk=2 ** 31 + 5).exists())
+
+    def test_interval_repeats_until_stopped(self):
+        """Test that with `--interval` the archival is repeated after the given number of seconds until the command is interrupted."""
+        with mock.patch('CoderrBackend_app.management.commands.archive_orders.time.sleep', side_effect=[None, KeyboardInterrupt]) as sleep:
+            self.archive('--interval', '60')
+        self.assertEqual(sleep.call_count, 2)
+        sleep.assert_called_with(60)
+        self.assertEqual(ArchivedOrder.objects.count(), 3)
+
+    def test_invalid_batch_size(self):
+        """Test that a batch size below 1 is rejected."""
+        with self.assertRaises(CommandError):
+            self.archive('--batch-size', '0')
+
+    def test_archived_orders_endpoint(self):
+        """Test that the customer and the business user can list and retrieve their archived orders, filtered by status, and that another user sees none of them."""
+        self.archive()
+        response = self.client.get(self.archive_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(order['id'] for order in response.data), sorted(order.id for order in self.old_orders))
+        self.assertNotIn('offer_detail_id', response.data[0])
+        self.assertEqual(response.data[0]['price'], 50.0)
+        self.client.force_authenticate(user=self.business)
+        self.assertEqual(len(self.client.get(f"{self.archive_url}?status=cancelled").data), 1)
+        self.assertEqual(self.client.get(reverse('archivedorder-detail', args=[self.old_orders[0].id])).status_code, status.HTTP_200_OK)
+        other = User.objects.create_user(username='other_user', password='testpass', email="test@example.com")
+        UserProfile.objects.create(user=other, type='customer')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(self.archive_url).data, [])
+        self.assertEqual(self.client.get(reverse('archivedorder-detail', args=[self.old_orders[0].id])).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_archived_orders_are_read_only(self):
+        """Test that archived orders cannot be changed or deleted through the endpoint and that unauthenticated users get a 401 UNAUTHORIZED."""
+        self.archive()
+        detail_url = reverse('archivedorder-detail', args=[self.old_orders[0].id])
+        self.assertEqual(self.client.patch(detail_url, {"status": "in_progress"}, format='json').status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertEqual(self.client.delete(detail_url).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get(self.archive_url).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,73 @@
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Order, BusinessOrderCounter
+from django.contrib.auth.models import User
+
+
+class OrderBulkStatusTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OrderBulkStatusTest. This method creates a customer user and two business users with their profiles,
+        four orders in progress of the first business user and one order of the second business user. The API client is authenticated as the first business user."""
+        self.customer = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer, type='customer')
+        self.business = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business, type='business')
+        self.other_business = User.objects.create_user(username='other_business', password='testpass', email="test@example.com")
+        self.other_profile = UserProfile.objects.create(user=self.other_business, type='business')
+        self.orders = [Order.objects.create(customer_user=self.customer_profile, business_user=self.business_profile, status="in_progress") for _ in range(4)]
+        self.other_order = Order.objects.create(customer_user=self.customer_profile, business_user=self.other_profile, status="in_progress")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.business)
+        self.bulk_url = reverse('order-bulk-status')
+
+    def test_bulk_update_reports_results_per_item(self):
+        """Test that the bulk endpoint updates the own orders, leaves an order that already has the status unchanged and reports every item in the order of the request."""
+        payload = [{"id": self.orders[0].id, "status": "completed"}, {"id": self.orders[1].id, "status": "cancelled"},
+                   {"id": self.orders[2].id, "status": "in_progress"}, {"id": self.orders[3].id, "status": "completed"}]
+        response = self.client.patch(self.bulk_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result["result"] for result in response.data["results"]], ["updated", "updated", "unchanged", "updated"])
+        self.assertEqual([order.status for order in Order.objects.filter(pk__in=[order.id for order in self.orders]).order_by('id')],
+                         ["completed", "cancelled", "in_progress", "completed"])
+
+    def test_bulk_update_adjusts_counters(self):
+        """Test that the order counters of the business user follow the bulk status changes."""
+        payload = [{"id": self.orders[0].id, "status": "completed"}, {"id": self.orders[1].id, "status": "cancelled"}]
+        self.client.patch(self.bulk_url, payload, format='json')
+        self.assertEqual(BusinessOrderCounter.get_counts(self.business_profile.id), {"in_progress": 2, "completed": 1, "cancelled": 1})
+
+    def test_bulk_update_runs_one_update_per_target_status(self):
+        """Test that the ownership of all orders is checked with one query and that one UPDATE per target status is run, however many orders are changed."""
+        payload = [{"id": order.id, "status": "completed" if index % 2 else "cancelled"} for index, order in enumerate(self.orders)]
+        with CaptureQueriesContext(connection) as context:
+            self.client.patch(self.bulk_url, payload, format='json')
+        order_updates = [query for query in context.captured_queries if query['sql'].startswith('UPDATE "CoderrBackend_app_order"')]
+        order_selects = [query for query in context.captured_queries if query['sql'].startswith('SELECT') and 'CoderrBackend_app_order' in query['sql']]
+        self.assertEqual(len(order_updates), 2)
+        self.assertEqual(len(order_selects), 1)
+
+    def test_foreign_and_invalid_items_are_reported(self):
+        """Test that orders of another business user, unknown orders, invalid statuses and duplicate IDs are reported as errors and leave the orders unchanged."""
+        payload = [{"id": self.other_order.id, "status": "completed"}, {"id": 9999, "status": "completed"},
+                   {"id": self.orders[0].id, "status": "done"}, {"id": self.orders[1].id, "status": "completed"},
+                   {"id": self.orders[1].id, "status": "cancelled"}, {"status": "completed"}]
+        response = self.client.patch(self.bulk_url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([result["result"] for result in response.data["results"]], ["error", "error", "error", "updated", "error", "error"])
+        self.other_order.refresh_from_db()
+        self.assertEqual(self.other_order.status, "in_progress")
+        self.assertEqual(Order.objects.get(pk=self.orders[1].id).status, "completed")
+
+    def test_invalid_payload(self):
+        """Test that a payload that is not a non-empty list returns a 400 BAD REQUEST."""
+        self.assertEqual(self.client.patch(self.bulk_url, {"id": self.orders[0].id}, format='json').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.patch(self.bulk_url, [], format='json').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_customer_cannot_bulk_update(self):
+        """Test that a customer user gets a 403 FORBIDDEN from the bulk endpoint."""
+        self.client.force_authenticate(user=self.customer)
+        response = self.client.patch(self.bulk_url, [{"id": self.orders[0].id, "status": "completed"}], format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
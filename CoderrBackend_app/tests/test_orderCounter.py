@@ -0,0 +1,115 @@
+from io import StringIO
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Order, BusinessOrderCounter
+from django.contrib.auth.models import User
+
+
+class BusinessOrderCounterTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for BusinessOrderCounterTest. This method creates a customer user and two business users with their profiles,
+        and two orders in progress and one completed order of the first business user. The API client is authenticated as the customer user."""
+        self.customer_user = User.objects.create_user(username="testuser", password="testpassword", email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer_user, type='customer')
+        self.business_user = User.objects.create_user(username="businessuser", password="businesspassword", email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business_user, type='business')
+        self.other_business_user = User.objects.create_user(username="otherbusiness", password="businesspassword", email="test@example.com")
+        self.other_business_profile = UserProfile.objects.create(user=self.other_business_user, type='business')
+        self.orders = [Order.objects.create(customer_user=self.customer_profile, business_user=self.business_profile, status=order_status)
+                       for order_status in ["in_progress", "in_progress", "completed"]]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customer_user)
+        self.counts_url = reverse('_order_counts_business_user', args=[self.business_profile.id])
+
+    def counts(self, profile=None):
+        return BusinessOrderCounter.get_counts((profile or self.business_profile).id)
+
+    def test_create_counts_orders(self):
+        """Test that creating orders increments the counter of the order status of their business user."""
+        self.assertEqual(self.counts(), {"in_progress": 2, "completed": 1, "cancelled": 0})
+
+    def test_status_change_moves_order(self):
+        """Test that changing the status of an order moves it from the counter of the previous status to the counter of the new status with a single UPDATE."""
+        order = Order.objects.get(pk=self.orders[0].pk)
+        order.status = "cancelled"
+        with CaptureQueriesContext(connection) as context:
+            order.save()
+        self.assertEqual(len([query for query in context.captured_queries if 'businessordercounter' in query['sql']]), 1)
+        self.assertEqual(self.counts(), {"in_progress": 1, "completed": 1, "cancelled": 1})
+        order.save()
+        self.assertEqual(self.counts(), {"in_progress": 1, "completed": 1, "cancelled": 1})
+
+    def test_concurrent_status_changes_keep_counters(self):
+        """Test that two updates of the same order that were both read while it was in progress, e.g. two concurrent status PATCHes, move the order only once away from
+        in progress: the second save locks the row and moves the order from the status the first save wrote."""
+        first = Order.objects.get(pk=self.orders[0].pk)
+        second = Order.objects.get(pk=self.orders[0].pk)
+        first.status = "completed"
+        first.save()
+        second.status = "cancelled"
+        with CaptureQueriesContext(connection) as context:
+            second.save()
+        self.assertTrue([query for query in context.captured_queries if query['sql'].startswith('SELECT') and 'FROM "CoderrBackend_app_order"' in query['sql']])
+        self.assertEqual(self.counts(), {"in_progress": 1, "completed": 1, "cancelled": 1})
+
+    def test_business_user_change_moves_order(self):
+        """Test that moving an order to another business user decrements the previous and increments the new business user's counters."""
+        order = self.orders[2]
+        order.business_user = self.other_business_profile
+        order.save()
+        self.assertEqual(self.counts(), {"in_progress": 2, "completed": 0, "cancelled": 0})
+        self.assertEqual(self.counts(self.other_business_profile), {"in_progress": 0, "completed": 1, "cancelled": 0})
+
+    def test_delete_decrements_counter(self):
+        """Test that deleting an order, alone or in a queryset, decrements the counter of its status, using the status stored in the database."""
+        order = self.orders[0]
+        order.status = "completed"
+        order.delete()
+        self.assertEqual(self.counts(), {"in_progress": 1, "completed": 1, "cancelled": 0})
+        Order.objects.filter(status="completed").delete()
+        self.assertEqual(self.counts(), {"in_progress": 1, "completed": 0, "cancelled": 0})
+
+    def test_deleting_business_profile_removes_counters(self):
+        """Test that deleting a business profile deletes its orders and counters without recreating the counters."""
+        self.business_profile.delete()
+        self.assertFalse(BusinessOrderCounter.objects.exists())
+
+    def test_combined_endpoint_reads_counters_in_one_query(self):
+        """Test that the combined endpoint returns all counters of a business user with a single query."""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.counts_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"in_progress": 2, "completed": 1, "cancelled": 0})
+
+    def test_existing_endpoints_read_counters(self):
+        """Test that the order count and completed order count endpoints return the counters with a single query each."""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('_order_count_business_user', args=[self.business_profile.id]))
+        self.assertEqual(response.data, {"order_count": 2})
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('_completed_order_count_business_user', args=[self.business_profile.id]))
+        self.assertEqual(response.data, {"completed_order_count": 1})
+
+    def test_business_without_orders(self):
+        """Test that a business user without orders gets zero counters and that an unknown profile returns a 404 NOT FOUND."""
+        response = self.client.get(reverse('_order_counts_business_user', args=[self.other_business_profile.id]))
+        self.assertEqual(response.data, {"in_progress": 0, "completed": 0, "cancelled": 0})
+        response = self.client.get(reverse('_order_counts_business_user', args=[self.other_business_profile.id + 100]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_combined_endpoint_requires_authentication(self):
+        """Test that an unauthenticated user gets a 401 UNAUTHORIZED from the combined endpoint."""
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.counts_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rebuild_command_repairs_counters(self):
+        """Test that the rebuild command recomputes counters that drifted, e.g. after a `QuerySet.update()` that bypassed the signals."""
+        Order.objects.filter(pk=self.orders[0].pk).update(status="completed")
+        BusinessOrderCounter.objects.filter(pk=self.business_profile.id).update(cancelled=5)
+        call_command('rebuild_order_counters', stdout=StringIO())
+        self.assertEqual(self.counts(), {"in_progress": 1, "completed": 2, "cancelled": 0})
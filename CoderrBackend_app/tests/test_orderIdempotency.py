@@ -0,0 +1,120 @@
+import datetime
+from unittest import mock
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail, Order, OrderIdempotencyKey, BusinessOrderCounter
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+
+
+class OrderIdempotencyTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OrderIdempotencyTest. This method clears the cache and creates a customer and a business user with their profiles,
+        an offer of the business user with two details, and authenticates the API client with the customer's token."""
+        cache.clear()
+        self.business = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business, type='business')
+        self.customer = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer, type='customer')
+        self.customer_token = Token.objects.create(user=self.customer)
+        self.offer = Offer.objects.create(user=self.business, title="Test Offer", description="This is a test offer")
+        self.offer_details = [OfferDetail.objects.create(offer=self.offer, title=title, revisions=1, delivery_time_in_days=2, price=price, features=[], offer_type=offer_type)
+                              for title, price, offer_type in [("Basic Design", "50.00", "basic"), ("Premium Design", "200.00", "premium")]]
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.customer_token.key}')
+        self.order_url = reverse('order-list')
+
+    def post_order(self, offer_detail, key=None):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key else {}
+        return self.client.post(self.order_url, {"offer_detail_id": offer_detail.id}, format='json', **headers)
+
+    def test_retry_replays_created_order_with_one_query(self):
+        """Test that retrying an order creation with the same Idempotency-Key returns the stored 201 CREATED response with a single query and without a second order."""
+        first = self.post_order(self.offer_details[0], key="checkout-1")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        with CaptureQueriesContext(connection) as context:
+            second = self.post_order(self.offer_details[0], key="checkout-1")
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_created_order_uses_profiles(self):
+        """Test that the created order belongs to the customer's and the business user's profiles and copies the offer detail."""
+        response = self.post_order(self.offer_details[1])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(pk=response.data['id'])
+        self.assertEqual(order.customer_user, self.customer_profile)
+        self.assertEqual(order.business_user, self.business_profile)
+        self.assertEqual(response.data['title'], "Premium Design")
+        self.assertEqual(response.data['price'], 200.0)
+        self.assertEqual(response.data['status'], "in_progress")
+
+    def test_create_loads_offer_detail_in_one_query(self):
+        """Test that the create path reads the offer detail, the offer and the owner's profile with a single SELECT. A first order is created beforehand,
+        so the token is cached and the business user's order counters exist."""
+        self.post_order(self.offer_details[1])
+        with CaptureQueriesContext(connection) as context:
+            response = self.post_order(self.offer_details[0])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        selects = [query['sql'] for query in context.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 1)
+
+    def test_requests_without_key_are_not_deduplicated(self):
+        """Test that two order creations without an Idempotency-Key create two orders."""
+        self.post_order(self.offer_details[0])
+        self.post_order(self.offer_details[0])
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_key_reused_for_other_offer_detail(self):
+        """Test that reusing an Idempotency-Key for another offer detail returns a 422 UNPROCESSABLE ENTITY and creates no order."""
+        self.post_order(self.offer_details[0], key="checkout-1")
+        response = self.post_order(self.offer_details[1], key="checkout-1")
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_concurrent_request_replays_first_order(self):
+        """Test that a request whose key was stored by a concurrent request after its own lookup (e.g. in another worker process) hits the unique constraint,
+        rolls back its order and replays the order of the first request."""
+        first = self.post_order(self.offer_details[0], key="checkout-1")
+        lookup = OrderIdempotencyKey.lookup
+        with mock.patch.object(OrderIdempotencyKey, 'lookup', side_effect=[None, lookup(self.customer, "checkout-1")]):
+            second = self.post_order(self.offer_details[0], key="checkout-1")
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(OrderIdempotencyKey.objects.count(), 1)
+        self.assertEqual(BusinessOrderCounter.get_counts(self.business_profile.id)["in_progress"], 1)
+
+    def test_expired_key_creates_new_order(self):
+        """Test that a key older than ORDER_IDEMPOTENCY_TIMEOUT is treated as unused: the request creates a new order and replaces the expired key."""
+        first = self.post_order(self.offer_details[0], key="checkout-1")
+        OrderIdempotencyKey.objects.update(created_at=timezone.now() - datetime.timedelta(days=1))
+        second = self.post_order(self.offer_details[1], key="checkout-1")
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(second.data['id'], first.data['id'])
+        self.assertEqual(Order.objects.count(), 2)
+        self.assertEqual(OrderIdempotencyKey.objects.get().fingerprint, str(self.offer_details[1].id))
+
+    def test_failed_request_releases_key(self):
+        """Test that a failed order creation is not stored, so a retry with the same Idempotency-Key is processed again."""
+        missing = OfferDetail(id=self.offer_details[1].id + 100)
+        self.assertEqual(self.post_order(missing, key="checkout-1").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.post_order(missing, key="checkout-1").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(Order.objects.count(), 0)
+        self.assertFalse(OrderIdempotencyKey.objects.exists())
+
+    def test_keys_are_scoped_to_the_user(self):
+        """Test that the same Idempotency-Key of another customer creates a separate order."""
+        other = User.objects.create_user(username='other_customer', password='testpass', email="test@example.com")
+        UserProfile.objects.create(user=other, type='customer')
+        self.post_order(self.offer_details[0], key="checkout-1")
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=other).key}')
+        response = self.post_order(self.offer_details[0], key="checkout-1")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 2)
@@ -0,0 +1,94 @@
+import datetime
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail, Order
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+
+
+class OrderListTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OrderListTest. This method creates a customer, a business and a second business user, an offer with one detail,
+        ten orders between the customer and the business user with one day between their creation dates, and one order of the second business user that must never be listed.
+        The API client is authenticated as the business user."""
+        self.customer = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer, type='customer')
+        self.business = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business, type='business')
+        self.business_token = Token.objects.create(user=self.business)
+        self.other_business = User.objects.create_user(username='other_business', password='testpass', email="test@example.com")
+        self.other_profile = UserProfile.objects.create(user=self.other_business, type='business')
+        self.offer = Offer.objects.create(user=self.business, title="Test Offer", description="This is a test offer")
+        self.offer_detail = OfferDetail.objects.create(offer=self.offer, title="Basic Design", revisions=1, delivery_time_in_days=2, price="50.00", features=[], offer_type="basic")
+        self.start = timezone.now() - datetime.timedelta(days=30)
+        self.orders = []
+        for index in range(10):
+            order = Order.objects.create(customer_user=self.customer_profile, business_user=self.business_profile, offer_detail=self.offer_detail,
+                                         status="completed" if index % 3 == 0 else "in_progress")
+            Order.objects.filter(pk=order.pk).update(created_at=self.start + datetime.timedelta(days=index))
+            order.refresh_from_db()
+            self.orders.append(order)
+        Order.objects.create(customer_user=self.customer_profile, business_user=self.other_profile, offer_detail=self.offer_detail, status="in_progress")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.business_token.key}')
+        self.order_url = reverse('order-list')
+
+    def collect_pages(self, url):
+        """Follows the `next` links starting at the given URL and returns the order IDs of all pages in the order they were returned."""
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(order['id'] for order in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_plain_list_is_unchanged(self):
+        """Test that a request without the pagination parameter still returns a plain list with the own orders only, without the `offer_detail` field."""
+        response = self.client.get(self.order_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(order['id'] for order in response.data), sorted(order.id for order in self.orders))
+        self.assertNotIn('offer_detail', response.data[0])
+        self.assertEqual(response.data[0]['title'], "Basic Design")
+
+    def test_cursor_pages_follow_created_at(self):
+        """Test that paging through the orders returns every own order exactly once, the most recent first, and in ascending order with `ordering=created_at`."""
+        expected = [order.id for order in sorted(self.orders, key=lambda order: order.created_at, reverse=True)]
+        self.assertEqual(self.collect_pages(f"{self.order_url}?pagination=cursor&page_size=3"), expected)
+        self.assertEqual(self.collect_pages(f"{self.order_url}?pagination=cursor&page_size=4&ordering=created_at"), expected[::-1])
+
+    def test_page_query_count_is_fixed(self):
+        """Test that a small and a large order page need the same single query once the token is cached, and that the query reads the order table alone, without a JOIN."""
+        self.client.get(self.order_url)
+        with CaptureQueriesContext(connection) as small_page:
+            response = self.client.get(f"{self.order_url}?pagination=cursor&page_size=2")
+        self.assertEqual(len(response.data['results']), 2)
+        with CaptureQueriesContext(connection) as large_page:
+            response = self.client.get(f"{self.order_url}?pagination=cursor&page_size=10")
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(len(small_page.captured_queries), len(large_page.captured_queries))
+        self.assertEqual(len(large_page.captured_queries), 1)
+        self.assertNotIn('JOIN', large_page.captured_queries[0]['sql'])
+
+    def test_filter_by_status(self):
+        """Test that the `status` filter returns only the own orders with the given status."""
+        response = self.client.get(f"{self.order_url}?status=completed")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(order['id'] for order in response.data), sorted(order.id for order in self.orders if order.status == "completed"))
+
+    def test_filter_by_created_range(self):
+        """Test that the `created_at_after` and `created_at_before` filters return only the orders created within the inclusive range."""
+        after = (self.start + datetime.timedelta(days=2)).isoformat()
+        before = (self.start + datetime.timedelta(days=5)).isoformat()
+        response = self.client.get(self.order_url, {'created_at_after': after, 'created_at_before': before})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(order['id'] for order in response.data), [order.id for order in self.orders[2:6]])
+
+    def test_invalid_filter(self):
+        """Test that an unknown status or an invalid datetime returns a 400 BAD REQUEST."""
+        self.assertEqual(self.client.get(f"{self.order_url}?status=unknown").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(f"{self.order_url}?updated_at_after=yesterday").status_code, status.HTTP_400_BAD_REQUEST)
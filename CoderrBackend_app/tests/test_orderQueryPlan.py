@@ -0,0 +1,84 @@
+import re
+from urllib.parse import parse_qs, urlparse
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Order, BusinessOrderCounter
+from django.contrib.auth.models import User
+
+ORDER_TABLE = Order._meta.db_table
+FULL_SCAN = re.compile(rf'^SCAN {ORDER_TABLE}\b')
+ORDER_SEARCH = re.compile(rf'^SEARCH {ORDER_TABLE} USING (COVERING )?INDEX (\w+)')
+DASHBOARD_INDEXES = {'order_business_status_idx', 'order_business_created_idx', 'order_customer_created_idx'}
+
+
+class OrderQueryPlanTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OrderQueryPlanTest. This method creates a customer and a business user with a few orders in every status, so the dashboard queries below return rows.
+        The query plans are checked with `EXPLAIN QUERY PLAN`, which does not depend on the number of rows."""
+        self.customer = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer, type='customer')
+        self.business = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business, type='business')
+        for order_status in ["in_progress", "completed", "cancelled"] * 3:
+            Order.objects.create(customer_user=self.customer_profile, business_user=self.business_profile, status=order_status)
+        self.client = APIClient()
+        self.order_url = reverse('order-list')
+
+    def explain(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assert_dashboard_indexes(self, plan, context):
+        """Asserts that the order table is never read with a full table scan and that every search on it uses one of the composite dashboard indexes."""
+        self.assertEqual([line for line in plan if FULL_SCAN.match(line)], [], context)
+        searches = [ORDER_SEARCH.match(line) for line in plan if line.startswith(f'SEARCH {ORDER_TABLE} ')]
+        self.assertTrue(searches, context)
+        self.assertTrue(all(search and search.group(2) in DASHBOARD_INDEXES for search in searches), context)
+
+    def get_order_plans(self, user, url, params=None):
+        """Sends the order list request as the given user and returns the `EXPLAIN QUERY PLAN` lines of every query that reads the order table."""
+        self.client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, params)
+        plans = [(query['sql'], self.explain(query['sql'])) for query in context.captured_queries
+                 if query['sql'].startswith('SELECT') and f'FROM "{ORDER_TABLE}"' in query['sql']]
+        self.assertTrue(plans, params)
+        return response, plans
+
+    def test_order_list_uses_composite_indexes(self):
+        """Test that the order list of the customer and of the business user, with and without the status and date filters and on the first and a following cursor page,
+        reads the order table through the composite indexes only."""
+        for user in [self.customer, self.business]:
+            for params in [{}, {"status": "completed"}, {"created_at_after": "2020-01-01T00:00:00Z"}, {"pagination": "cursor", "page_size": 2},
+                           {"pagination": "cursor", "page_size": 2, "ordering": "created_at"}]:
+                with self.subTest(user=user.username, params=params):
+                    response, plans = self.get_order_plans(user, self.order_url, params)
+                    for sql, plan in plans:
+                        self.assert_dashboard_indexes(plan, f"{sql}\n{plan}")
+                    if params.get("pagination") == "cursor":
+                        cursor = parse_qs(urlparse(response.data['next']).query)["cursor"][0]
+                        for sql, plan in self.get_order_plans(user, self.order_url, {**params, "cursor": cursor})[1]:
+                            self.assert_dashboard_indexes(plan, f"{sql}\n{plan}")
+
+    def test_cursor_page_reads_an_index_range(self):
+        """Test that a following cursor page bounds `created_at` inside both index searches, so only the rows after the cursor are read."""
+        response, _ = self.get_order_plans(self.business, self.order_url, {"pagination": "cursor", "page_size": 2})
+        cursor = parse_qs(urlparse(response.data['next']).query)["cursor"][0]
+        _, plans = self.get_order_plans(self.business, self.order_url, {"pagination": "cursor", "page_size": 2, "cursor": cursor})
+        searches = [line for sql, plan in plans for line in plan if line.startswith(f'SEARCH {ORDER_TABLE} ')]
+        self.assertEqual(len(searches), 2)
+        self.assertTrue(all('created_at<?' in line for line in searches), searches)
+
+    def test_status_counts_use_covering_index(self):
+        """Test that counting the orders of a business user by status, as the counter recount does, and the former per-status count are answered from the `(business_user, status)` index alone."""
+        with CaptureQueriesContext(connection) as context:
+            BusinessOrderCounter.recount(self.business_profile.id)
+        sql = next(query['sql'] for query in context.captured_queries if f'FROM "{ORDER_TABLE}"' in query['sql'])
+        count_sql, count_params = Order.objects.filter(business_user=self.business_profile, status="in_progress").values('id').query.sql_with_params()
+        for plan in [self.explain(sql), self.explain(count_sql, count_params)]:
+            self.assertEqual(plan, [f'SEARCH {ORDER_TABLE} USING COVERING INDEX order_business_status_idx (business_user_id=? AND status=?)'])
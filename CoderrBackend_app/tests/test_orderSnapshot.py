@@ -0,0 +1,65 @@
+from decimal import Decimal
+from importlib import import_module
+from django.apps import apps
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail, Order
+from django.contrib.auth.models import User
+
+snapshot_migration = import_module('CoderrBackend_app.migrations.0017_order_snapshot')
+
+
+class OrderSnapshotTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for OrderSnapshotTest. This method creates a customer and a business user with their profiles, an offer with one detail
+        and authenticates the API client as the customer user."""
+        self.customer = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer, type='customer')
+        self.business = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business, type='business')
+        self.offer = Offer.objects.create(user=self.business, title="Test Offer", description="This is a test offer")
+        self.offer_detail = OfferDetail.objects.create(offer=self.offer, title="Basic Design", revisions=2, delivery_time_in_days=5, price="50.00", features=["Logo"], offer_type="basic")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customer)
+        self.order_url = reverse('order-list')
+
+    def test_created_order_copies_offer_detail(self):
+        """Test that creating an order stores the title, revisions, delivery time, price, features and offer type of the offer detail on the order."""
+        response = self.client.post(self.order_url, {"offer_detail_id": self.offer_detail.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(pk=response.data['id'])
+        self.assertEqual([getattr(order, field) for field in Order.SNAPSHOT_FIELDS], ["Basic Design", 2, 5, Decimal("50.00"), ["Logo"], "basic"])
+
+    def test_editing_offer_detail_keeps_order(self):
+        """Test that editing the offer detail after the order was placed does not change the title and price returned for the order."""
+        order = Order.objects.create(customer_user=self.customer_profile, business_user=self.business_profile, offer_detail=self.offer_detail, status="in_progress")
+        OfferDetail.objects.filter(pk=self.offer_detail.pk).update(title="Renamed Design", price="80.00")
+        response = self.client.get(reverse('order-detail', args=[order.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], "Basic Design")
+        self.assertEqual(response.data['price'], 50.0)
+
+    def test_snapshot_fields_are_read_only(self):
+        """Test that a PATCH of the order cannot overwrite the copied offer detail values."""
+        order = Order.objects.create(customer_user=self.customer_profile, business_user=self.business_profile, offer_detail=self.offer_detail, status="in_progress")
+        self.client.force_authenticate(user=self.business)
+        response = self.client.patch(reverse('order-detail', args=[order.id]), {"status": "completed", "title": "Changed", "price": "1.00"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.title, order.price), ("completed", "Basic Design", Decimal("50.00")))
+
+    def test_backfill_fills_existing_orders(self):
+        """Test that the backfill of the snapshot migration copies the offer detail onto orders without a snapshot, across several batches, and skips orders without an offer detail."""
+        orders = [Order.objects.create(customer_user=self.customer_profile, business_user=self.business_profile, offer_detail=self.offer_detail, status="in_progress") for _ in range(3)]
+        without_detail = Order.objects.create(customer_user=self.customer_profile, business_user=self.business_profile, status="in_progress")
+        Order.objects.update(**dict.fromkeys(Order.SNAPSHOT_FIELDS))
+        original_batch_size = snapshot_migration.BATCH_SIZE
+        snapshot_migration.BATCH_SIZE = 2
+        try:
+            snapshot_migration.copy_offer_details(apps, None)
+        finally:
+            snapshot_migration.BATCH_SIZE = original_batch_size
+        self.assertEqual([order.title for order in Order.objects.filter(pk__in=[order.id for order in orders])], ["Basic Design"] * 3)
+        without_detail.refresh_from_db()
+        self.assertIsNone(without_detail.title)
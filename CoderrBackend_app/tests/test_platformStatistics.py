@@ -0,0 +1,86 @@
+from io import StringIO
+from unittest import mock
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from CoderrBackend_app.cache import PLATFORM_STATISTICS_CACHE_KEY, get_or_refresh
+from CoderrBackend_app.models import UserProfile, Offer, Review, PlatformStatistics
+from django.contrib.auth.models import User
+
+
+class PlatformStatisticsTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for PlatformStatisticsTest. This method clears the cache and creates a customer and two business users with their profiles,
+        a review of the customer with the rating 4 for the first and 5 for the second business user, and one offer."""
+        cache.clear()
+        self.customer = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer, type='customer')
+        self.business = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business, type='business')
+        self.other_business = User.objects.create_user(username='other_business', password='testpass', email="test@example.com")
+        self.other_profile = UserProfile.objects.create(user=self.other_business, type='business')
+        self.reviews = [Review.objects.create(business_user=profile, reviewer=self.customer, rating=rating, description="Gut") for profile, rating in [(self.business_profile, 4), (self.other_profile, 5)]]
+        self.offer = Offer.objects.create(user=self.business, title="Test Offer", description="This is a test offer")
+        self.client = APIClient()
+        self.base_info_url = reverse('base-info')
+
+    def statistics(self):
+        return PlatformStatistics.load().as_data()
+
+    def test_signals_maintain_statistics(self):
+        """Test that creating, changing and deleting reviews, offers and profiles keeps the statistics equal to the counts of the tables."""
+        self.assertEqual(self.statistics(), {"review_count": 2, "average_rating": 4.5, "business_profile_count": 2, "offer_count": 1})
+        review = Review.objects.get(pk=self.reviews[0].pk)
+        review.rating = 1
+        review.save()
+        self.reviews[1].delete()
+        Offer.objects.filter(pk=self.offer.pk).delete()
+        profile = UserProfile.objects.get(pk=self.customer_profile.pk)
+        profile.type = "business"
+        profile.save()
+        self.other_profile.delete()
+        self.assertEqual(self.statistics(), {"review_count": 1, "average_rating": 1.0, "business_profile_count": 2, "offer_count": 0})
+        self.assertEqual(self.statistics(), PlatformStatistics.recompute().as_data())
+
+    def test_base_info_reads_one_row(self):
+        """Test that the base-info endpoint answers with a single query on a cache miss and without any query while the statistics are cached."""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.base_info_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"review_count": 2, "average_rating": 4.5, "business_profile_count": 2, "offer_count": 1})
+        with self.assertNumQueries(0):
+            self.client.get(self.base_info_url)
+
+    def test_no_reviews(self):
+        """Test that the average rating is "--" without reviews."""
+        Review.objects.all().delete()
+        self.assertEqual(self.client.get(self.base_info_url).data["average_rating"], "--")
+
+    def test_expired_value_is_reloaded_once(self):
+        """Test that while one request reloads expired statistics, concurrent requests get the stale value instead of reloading them as well."""
+        load = mock.Mock(side_effect=[1, 2, 3])
+        with mock.patch('CoderrBackend_app.cache.time.time', return_value=1000):
+            self.assertEqual(get_or_refresh('test:value', load, timeout=30), 1)
+        with mock.patch('CoderrBackend_app.cache.time.time', return_value=1100):
+            cache.add('test:value:lock', True)
+            self.assertEqual(get_or_refresh('test:value', load, timeout=30), 1)
+            self.assertEqual(load.call_count, 1)
+            cache.delete('test:value:lock')
+            self.assertEqual(get_or_refresh('test:value', load, timeout=30), 2)
+
+    def test_database_errors_are_not_hidden(self):
+        """Test that a failing statistics query raises instead of returning "--" values."""
+        with mock.patch.object(PlatformStatistics, 'load', side_effect=RuntimeError("database unavailable")):
+            with self.assertRaises(RuntimeError):
+                self.client.get(self.base_info_url)
+
+    def test_repair_command(self):
+        """Test that the repair command recomputes statistics that drifted, e.g. after a `QuerySet.update()` that bypassed the signals, and drops the cached value."""
+        self.client.get(self.base_info_url)
+        Review.objects.filter(pk=self.reviews[0].pk).update(rating=1)
+        PlatformStatistics.objects.update(offer_count=7)
+        call_command('repair_platform_statistics', stdout=StringIO())
+        self.assertEqual(cache.get(PLATFORM_STATISTICS_CACHE_KEY), None)
+        self.assertEqual(self.client.get(self.base_info_url).data, {"review_count": 2, "average_rating": 3.0, "business_profile_count": 2, "offer_count": 1})
@@ -0,0 +1,78 @@
+import json
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Review
+from django.contrib.auth.models import User
+
+
+class ReviewExpandTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for ReviewExpandTest. This method creates two business users and six customers with first and last names.
+        Every customer reviews the first business user and the first customer also reviews the second business user. The API client is authenticated as the first customer."""
+        self.business_profiles = []
+        for index in range(2):
+            business = User.objects.create_user(username=f'business_{index}', password='testpass', email="test@example.com", first_name=f"Firma{index}", last_name="GmbH")
+            self.business_profiles.append(UserProfile.objects.create(user=business, type='business'))
+        self.customers = []
+        for index in range(6):
+            customer = User.objects.create_user(username=f'customer_{index}', password='testpass', email="test@example.com", first_name=f"Kunde{index}", last_name="Muster")
+            UserProfile.objects.create(user=customer, type='customer')
+            self.customers.append(customer)
+        self.reviews = [Review.objects.create(business_user=self.business_profiles[0], reviewer=customer, rating=index % 5 + 1, description="Gut")
+                        for index, customer in enumerate(self.customers)]
+        Review.objects.create(business_user=self.business_profiles[1], reviewer=self.customers[0], rating=3, description="Gut")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customers[0])
+        self.review_url = reverse('review-list')
+
+    def assert_names(self, review):
+        """Checks the embedded names of a serialized review against the reviewer and the business user stored in the database."""
+        instance = Review.objects.select_related('reviewer', 'business_user__user').get(pk=review['id'])
+        self.assertEqual(review['reviewer'], instance.reviewer_id)
+        self.assertEqual(review['reviewer_details'], {"first_name": instance.reviewer.first_name, "last_name": instance.reviewer.last_name,
+                                                      "username": instance.reviewer.username})
+        business = instance.business_user.user
+        self.assertEqual(review['business_user_details'], {"first_name": business.first_name, "last_name": business.last_name, "username": business.username})
+
+    def test_expanded_list_embeds_names(self):
+        """Test that `?expand=names` embeds the first name, last name and username of the reviewer and of the business user in every review."""
+        response = self.client.get(self.review_url, {"expand": "names"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 7)
+        for review in response.data:
+            self.assert_names(review)
+
+    def test_default_representation_is_unchanged(self):
+        """Test that requests without the parameter, or with an unknown value, return the reviews without the embedded names."""
+        for params in ({}, {"expand": "other"}):
+            response = self.client.get(self.review_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('reviewer_details', response.data[0])
+            self.assertNotIn('business_user_details', response.data[0])
+        response = self.client.get(reverse('review-detail', args=[self.reviews[0].id]))
+        self.assertNotIn('reviewer_details', response.data)
+
+    def test_expanded_list_costs_one_query(self):
+        """Test that the expanded list reads the reviews and both users in a single query, whatever the number of reviews,
+        for the plain list as well as for cursor pages of different sizes."""
+        for params in ({"expand": "names"}, {"expand": "names", "business_user_id": self.business_profiles[1].id},
+                       {"expand": "1", "pagination": "cursor", "page_size": 2}, {"expand": "1", "pagination": "cursor", "page_size": 6}):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.review_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(queries), 1, params)
+            reviews = response.data['results'] if 'results' in response.data else response.data
+            for review in reviews:
+                self.assertIn('reviewer_details', review)
+
+    def test_expanded_retrieve_and_stream(self):
+        """Test that a single review and the streamed list can be expanded as well, and that the streamed list contains the same rows as the regular one."""
+        response = self.client.get(reverse('review-detail', args=[self.reviews[1].id]), {"expand": "names"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assert_names(response.data)
+        regular = self.client.get(self.review_url, {"expand": "names"})
+        streamed = self.client.get(self.review_url, {"expand": "names", "stream": "1"})
+        self.assertEqual(json.loads(b''.join(streamed.streaming_content).decode()), json.loads(json.dumps(regular.data)))
@@ -0,0 +1,88 @@
+import re
+from urllib.parse import parse_qs, urlparse
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Review
+from django.contrib.auth.models import User
+
+REVIEW_TABLE = Review._meta.db_table
+REVIEW_SEARCH = re.compile(rf'^SEARCH {REVIEW_TABLE} USING (COVERING )?INDEX (\w+)')
+
+
+class ReviewListTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for ReviewListTest. This method creates two business users and seven customers. Every customer reviews the first business user,
+        with ratings from 1 to 5 so that some ratings occur twice, and the first customer also reviews the second business user. The API client is authenticated as the first customer."""
+        self.business_profiles = []
+        for index in range(2):
+            business = User.objects.create_user(username=f'business_{index}', password='testpass', email="test@example.com")
+            self.business_profiles.append(UserProfile.objects.create(user=business, type='business'))
+        self.customers = []
+        for index in range(7):
+            customer = User.objects.create_user(username=f'customer_{index}', password='testpass', email="test@example.com")
+            UserProfile.objects.create(user=customer, type='customer')
+            self.customers.append(customer)
+        self.reviews = [Review.objects.create(business_user=self.business_profiles[0], reviewer=customer, rating=index % 5 + 1, description="Gut")
+                        for index, customer in enumerate(self.customers)]
+        self.other_review = Review.objects.create(business_user=self.business_profiles[1], reviewer=self.customers[0], rating=3, description="Gut")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.customers[0])
+        self.review_url = reverse('review-list')
+
+    def collect_pages(self, url):
+        """Follows the `next` links starting at the given URL and returns the review IDs of all pages in the order they were returned."""
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 3)
+            ids.extend(review['id'] for review in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_plain_list_is_unchanged(self):
+        """Test that a request without the pagination parameter still returns a plain list of all matching reviews."""
+        response = self.client.get(self.review_url, {"business_user_id": self.business_profiles[0].id})
+        self.assertEqual(sorted(review['id'] for review in response.data), sorted(review.id for review in self.reviews))
+
+    def test_cursor_pages_follow_ordering(self):
+        """Test that paging through the reviews of a business user returns every review exactly once, by `updated_at` (newest first) and by `rating` with the ID as tie-break."""
+        business_id = self.business_profiles[0].id
+        by_update = [review.id for review in sorted(self.reviews, key=lambda review: (review.updated_at, review.id), reverse=True)]
+        self.assertEqual(self.collect_pages(f"{self.review_url}?pagination=cursor&page_size=3&business_user_id={business_id}"), by_update)
+        by_rating = [review.id for review in sorted(self.reviews, key=lambda review: (review.rating, review.id))]
+        self.assertEqual(self.collect_pages(f"{self.review_url}?pagination=cursor&page_size=3&business_user_id={business_id}&ordering=rating"), by_rating)
+        self.assertEqual(self.collect_pages(f"{self.review_url}?pagination=cursor&page_size=3&business_user_id={business_id}&ordering=-rating"),
+                         [review.id for review in sorted(self.reviews, key=lambda review: (-review.rating, -review.id))])
+
+    def test_reviewer_filter(self):
+        """Test that the cursor pages of a reviewer contain only the reviews of that reviewer."""
+        ids = self.collect_pages(f"{self.review_url}?pagination=cursor&page_size=3&reviewer_id={self.customers[0].id}")
+        self.assertEqual(sorted(ids), sorted([self.reviews[0].id, self.other_review.id]))
+
+    def test_pages_are_read_through_composite_indexes(self):
+        """Test that the first and a following cursor page of a business user's or reviewer's reviews are read through the matching composite index without sorting."""
+        cases = [({"business_user_id": self.business_profiles[0].id}, 'review_business_updated_idx'),
+                 ({"business_user_id": self.business_profiles[0].id, "ordering": "rating"}, 'review_business_rating_idx'),
+                 ({"business_user_id": self.business_profiles[0].id, "ordering": "-rating"}, 'review_business_rating_idx'),
+                 ({"reviewer_id": self.customers[0].id}, 'review_reviewer_updated_idx')]
+        for params, index in cases:
+            with self.subTest(params=params):
+                params = {**params, "pagination": "cursor", "page_size": 1}
+                response = None
+                for _ in range(2):
+                    if response is not None:
+                        params["cursor"] = parse_qs(urlparse(response.data['next']).query)["cursor"][0]
+                    with CaptureQueriesContext(connection) as context:
+                        response = self.client.get(self.review_url, params)
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    sql = next(query['sql'] for query in context.captured_queries if f'FROM "{REVIEW_TABLE}"' in query['sql'])
+                    with connection.cursor() as cursor:
+                        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                        plan = [row[-1] for row in cursor.fetchall()]
+                    searches = [REVIEW_SEARCH.match(line) for line in plan if line.startswith(f'SEARCH {REVIEW_TABLE} ')]
+                    self.assertEqual([search.group(2) for search in searches if search], [index], plan)
+                    self.assertFalse([line for line in plan if 'TEMP B-TREE' in line], plan)
@@ -0,0 +1,76 @@
+from unittest import mock
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Review, BusinessRating
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+
+
+class ReviewUniqueTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for ReviewUniqueTest. This method creates a customer and two business users with their profiles
+        and authenticates the API client with the customer's token."""
+        self.customer = User.objects.create_user(username='customer_user', password='testpass', email="test@example.com")
+        self.customer_profile = UserProfile.objects.create(user=self.customer, type='customer')
+        self.business = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business, type='business')
+        self.other_business = User.objects.create_user(username='other_business', password='testpass', email="test@example.com")
+        self.other_profile = UserProfile.objects.create(user=self.other_business, type='business')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.customer).key}')
+        self.review_url = reverse('review-list')
+
+    def post_review(self, profile, rating=5):
+        return self.client.post(self.review_url, {"business_user": profile.id, "rating": rating, "description": "Gut"}, format='json')
+
+    def test_create_does_not_look_for_existing_review(self):
+        """Test that creating a review does not read the review table before the INSERT. A first review is posted beforehand, so the token is cached,
+        and the rating row of the business user is created, so it is updated instead of being counted from the reviews."""
+        self.post_review(self.other_profile)
+        BusinessRating.objects.create(business_user=self.business_profile)
+        with CaptureQueriesContext(connection) as context:
+            response = self.post_review(self.business_profile)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        review_selects = [query['sql'] for query in context.captured_queries if query['sql'].startswith('SELECT') and 'FROM "CoderrBackend_app_review"' in query['sql']]
+        self.assertEqual(review_selects, [])
+
+    def test_duplicate_is_rejected_by_the_constraint(self):
+        """Test that a second review for the same business user returns a 403 FORBIDDEN, leaves the first review and the rating unchanged,
+        and that the customer can still review another business user."""
+        self.post_review(self.business_profile, rating=5)
+        response = self.post_review(self.business_profile, rating=1)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data["detail"], "Du hast bereit eine Bewertung für den Profil abgegeben.")
+        self.assertEqual(list(Review.objects.filter(business_user=self.business_profile).values_list('rating', flat=True)), [5])
+        self.assertEqual(BusinessRating.objects.get(pk=self.business_profile.pk).review_count, 1)
+        self.assertEqual(self.post_review(self.other_profile).status_code, status.HTTP_201_CREATED)
+
+    def test_database_enforces_one_review_per_business_user(self):
+        """Test that the database itself rejects a second review of the same reviewer for the same business user, e.g. from a concurrent request."""
+        Review.objects.create(business_user=self.business_profile, reviewer=self.customer, rating=4, description="Gut")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Review.objects.create(business_user=self.business_profile, reviewer=self.customer, rating=2, description="Schlecht")
+
+    def test_moving_review_to_reviewed_business_is_rejected(self):
+        """Test that a PATCH moving a review to a business user the reviewer has already reviewed returns a 403 FORBIDDEN and leaves both reviews unchanged,
+        while moving it to a business user without a review of the reviewer succeeds."""
+        first = self.post_review(self.business_profile, rating=5).data
+        second = self.post_review(self.other_profile, rating=2).data
+        response = self.client.patch(reverse('review-detail', args=[second['id']]), {"business_user": self.business_profile.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data["detail"], "Du hast bereit eine Bewertung für den Profil abgegeben.")
+        self.assertEqual(Review.objects.get(pk=second['id']).business_user_id, self.other_profile.id)
+        self.assertEqual(BusinessRating.objects.get(pk=self.business_profile.pk).review_count, 1)
+        Review.objects.filter(pk=first['id']).delete()
+        response = self.client.patch(reverse('review-detail', args=[second['id']]), {"business_user": self.business_profile.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        """Test that an `IntegrityError` that is not caused by a second review of the same business user, e.g. from a signal writing the rating row, is raised again instead of a 403."""
+        with mock.patch.object(BusinessRating, 'apply', side_effect=IntegrityError("rating")):
+            with self.assertRaises(IntegrityError):
+                self.post_review(self.business_profile)
+        self.assertFalse(Review.objects.exists())
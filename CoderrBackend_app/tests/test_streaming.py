@@ -0,0 +1,58 @@
+import json
+from unittest import mock
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.db.models.query import QuerySet
+from django.urls import reverse
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail, Order, Review
+from django.contrib.auth.models import User
+
+
+class StreamingListTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for StreamingListTest. This method creates a business user and five customer users, an offer with one detail,
+        one order and one review of every customer for the business user. The API client is authenticated as the business user."""
+        self.business = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.business_profile = UserProfile.objects.create(user=self.business, type='business')
+        self.offer = Offer.objects.create(user=self.business, title="Test Offer", description="This is a test offer")
+        self.offer_detail = OfferDetail.objects.create(offer=self.offer, title="Basic Design", revisions=1, delivery_time_in_days=2, price="50.00", features=["Logo"], offer_type="basic")
+        for index in range(5):
+            customer = User.objects.create_user(username=f'customer_{index}', password='testpass', email="test@example.com")
+            customer_profile = UserProfile.objects.create(user=customer, type='customer')
+            Order.objects.create(customer_user=customer_profile, business_user=self.business_profile, offer_detail=self.offer_detail, status="in_progress")
+            Review.objects.create(business_user=self.business_profile, reviewer=customer, rating=index + 1, description="Große Arbeit")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.business)
+
+    def streamed(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_streamed_lists_match_regular_lists(self):
+        """Test that the streamed JSON array of the order, review, customer and business lists contains exactly the rows of the regular list response."""
+        for url in [reverse('order-list'), reverse('review-list'), reverse('customer-list'), reverse('business-list')]:
+            regular = self.client.get(url)
+            streamed = self.client.get(f"{url}?stream=1")
+            self.assertEqual(streamed['Content-Type'], 'application/json')
+            self.assertEqual(json.loads(self.streamed(streamed)), json.loads(json.dumps(regular.data)))
+
+    def test_ndjson_stream(self):
+        """Test that `?stream=ndjson` returns one JSON object per line and that the list filters still apply."""
+        response = self.client.get(f"{reverse('review-list')}?stream=ndjson&ordering=-rating")
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = self.streamed(response).splitlines()
+        self.assertEqual([json.loads(line)['rating'] for line in lines], [5, 4, 3, 2, 1])
+
+    def test_stream_reads_queryset_in_chunks(self):
+        """Test that the streamed response reads the queryset with `.iterator(chunk_size=...)` instead of loading all rows at once."""
+        with mock.patch.object(QuerySet, 'iterator', autospec=True, side_effect=QuerySet.iterator) as iterator:
+            self.streamed(self.client.get(f"{reverse('order-list')}?stream=1"))
+        iterator.assert_called_once()
+        self.assertEqual(iterator.call_args.kwargs['chunk_size'], 500)
+
+    def test_stream_requires_authentication(self):
+        """Test that the streamed order list is not returned to unauthenticated users."""
+        self.client.force_authenticate(user=None)
+        response = self.client.get(f"{reverse('order-list')}?stream=1")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
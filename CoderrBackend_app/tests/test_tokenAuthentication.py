@@ -0,0 +1,121 @@
+from unittest.mock import patch
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from CoderrBackend_app.api.authentication import CachedTokenAuthentication, token_cache
+from CoderrBackend_app.models import UserProfile, Offer, OfferDetail
+from django.contrib.auth.models import User
+
+
+class CachedTokenAuthenticationTest(APITestCase):
+    def setUp(self):
+        """Set up test environment for CachedTokenAuthenticationTest. This method clears the token cache and creates a business user with a profile, a token and one offer detail."""
+        token_cache.clear()
+        self.user = User.objects.create_user(username='business_user', password='testpass', email="test@example.com")
+        self.profile = UserProfile.objects.create(user=self.user, type='business')
+        self.token = Token.objects.create(user=self.user)
+        self.offer = Offer.objects.create(user=self.user, title="Test Offer", description="This is a test offer")
+        self.offer_detail = OfferDetail.objects.create(offer=self.offer, title="Basic Design", revisions=1, delivery_time_in_days=2, price="50.00", features=[], offer_type="basic")
+        self.factory = APIRequestFactory()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def authenticate(self, key=None):
+        request = self.factory.get('/', HTTP_AUTHORIZATION=f"Token {key or self.token.key}")
+        return CachedTokenAuthentication().authenticate(request)
+
+    def test_cached_token_needs_no_queries(self):
+        """Test that a cached token is authenticated without any query and that the profile of the user is available without a further query."""
+        self.authenticate()
+        with self.assertNumQueries(0):
+            user, token = self.authenticate()
+            self.assertEqual(user.profile.type, 'business')
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+
+    def test_first_authentication_loads_profile_in_one_query(self):
+        """Test that an uncached token is loaded together with its user and profile in a single query."""
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate()
+            self.assertEqual(user.profile.type, 'business')
+
+    def test_request_needs_no_authentication_queries(self):
+        """Test that a repeated authenticated request only runs the queries of the view itself, not the token lookup or the profile lookup."""
+        url = reverse('offerdetail-detail', args=[self.offer_detail.id])
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_deleted_token_is_rejected(self):
+        """Test that a deleted token is dropped from the cache and rejected with 401 UNAUTHORIZED on the next request."""
+        url = reverse('offerdetail-detail', args=[self.offer_detail.id])
+        self.client.get(url)
+        self.token.delete()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_revoked_in_other_process_is_rejected(self):
+        """Test that a cached token is rejected once the token revocation version of its user changes, even if the token was deleted by another process
+        whose local token cache is not this one."""
+        key = self.token.key
+        self.authenticate(key)
+        with patch.object(token_cache, 'invalidate_key'), patch.object(token_cache, 'invalidate_user'):
+            self.token.delete()
+        self.assertEqual(len(token_cache), 1)
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(key)
+        self.assertEqual(len(token_cache), 0)
+
+    def test_saved_user_is_reloaded(self):
+        """Test that deactivating a user drops the cached token, so the next authentication fails."""
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_saved_profile_is_reloaded(self):
+        """Test that saving the profile drops the cached token, so the next authentication returns the changed profile type."""
+        self.authenticate()
+        self.profile.type = 'customer'
+        self.profile.save()
+        user, _ = self.authenticate()
+        self.assertEqual(user.profile.type, 'customer')
+
+    def test_cached_user_is_not_shared_between_requests(self):
+        """Test that a change to the user of one request that is never saved does not leak into the user of the next request."""
+        user, _ = self.authenticate()
+        user.first_name = "Changed"
+        user, _ = self.authenticate()
+        self.assertEqual(user.first_name, "")
+
+    @override_settings(TOKEN_CACHE_MAX_SIZE=2)
+    def test_least_recently_used_token_is_evicted(self):
+        """Test that the cache holds at most TOKEN_CACHE_MAX_SIZE tokens and evicts the least recently used one first."""
+        tokens = [self.token.key]
+        for index in range(2):
+            user = User.objects.create_user(username=f'user_{index}', password='testpass', email="test@example.com")
+            tokens.append(Token.objects.create(user=user).key)
+        self.authenticate(tokens[0])
+        self.authenticate(tokens[1])
+        self.authenticate(tokens[0])
+        self.authenticate(tokens[2])
+        self.assertEqual(len(token_cache), 2)
+        with self.assertNumQueries(0):
+            self.authenticate(tokens[0])
+        with self.assertNumQueries(1):
+            self.authenticate(tokens[1])
+
+    @override_settings(TOKEN_CACHE_TTL=0)
+    def test_expired_token_is_reloaded(self):
+        """Test that a cached token older than TOKEN_CACHE_TTL is loaded from the database again."""
+        self.authenticate()
+        with self.assertNumQueries(1):
+            self.authenticate()